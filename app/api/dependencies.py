@@ -2,17 +2,23 @@ from __future__ import annotations
 
 from typing import Optional
 
-from fastapi import Depends, Header, HTTPException, status
+from fastapi import Depends, Header, HTTPException, Request, status
 
 from app.core.config import settings
 from app.core.database import db
 from app.core.auth import AuthError, get_org_from_claims, get_roles_from_claims, verify_jwt
+from app.services.llm_orchestrator import LLMOrchestrator
 
 
 def get_database():
     return db
 
 
+def get_llm_orchestrator(request: Request) -> LLMOrchestrator:
+    """The process-wide orchestrator created at startup."""
+    return request.app.state.llm_orchestrator
+
+
 def _extract_bearer_token(authorization: Optional[str]) -> Optional[str]:
     if not authorization:
         return None
@@ -40,6 +46,13 @@ async def require_user(authorization: Optional[str] = Header(default=None, alias
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail=str(exc)) from exc
 
 
+async def optional_user(authorization: Optional[str] = Header(default=None, alias="Authorization")) -> Optional[dict]:
+    """The caller's claims when a bearer token is sent, None for anonymous calls; an invalid token is still a 401."""
+    if not authorization:
+        return None
+    return await require_user(authorization)
+
+
 async def require_admin(
     authorization: Optional[str] = Header(default=None, alias="Authorization"),
     x_admin_token: str = Header(default="", alias="X-Admin-Token"),
@@ -67,4 +80,6 @@ async def require_admin(
 
 
 AdminDependency = Depends(require_admin)
-UserDependency = Depends(require_user)
\ No newline at end of file
+UserDependency = Depends(require_user)
+OptionalUserDependency = Depends(optional_user)
+LLMOrchestratorDependency = Depends(get_llm_orchestrator)
\ No newline at end of file
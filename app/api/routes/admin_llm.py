@@ -1,12 +1,23 @@
 from __future__ import annotations
 
+from datetime import datetime, timedelta
 from typing import Optional
 
 from fastapi import APIRouter, HTTPException, Query, status
 
 from app.api.dependencies import AdminDependency
 from app.models.llm_model import LLMSettingsUpdatePayload
-from app.services import llm_settings_service
+from app.services import (
+    llm_cache,
+    llm_metrics,
+    llm_rate_limiter,
+    llm_resilience,
+    llm_settings_service,
+    llm_singleflight,
+    llm_telemetry,
+)
+from app.services.llm_providers import capabilities, http_clients
+from app.services.llm_providers.bedrock_provider import get_client_cache_metrics
 
 router = APIRouter(prefix="/api/admin/llm", tags=["admin-llm"], dependencies=[AdminDependency])
 
@@ -45,10 +56,89 @@ def list_providers() -> dict:
                 "supports_json_mode": True,
                 "notes": "Supports Claude on Bedrock. Provide region and AWS credentials.",
             },
+            {
+                "id": "fake",
+                "label": "Fake (offline)",
+                "supports_json_mode": True,
+                "notes": "No API calls or cost. Synthetic workflow JSON with fake_* extra_payload options for latency, "
+                "streaming pace, error injection and record/replay cassettes.",
+            },
         ]
     }
 
 
+@router.get("/connections")
+def connection_stats() -> dict:
+    """Pooled HTTP client settings and per-client connection reuse counters."""
+    return {**http_clients.get_metrics(), "bedrock": get_client_cache_metrics()}
+
+
+@router.get("/latency")
+def latency_stats() -> dict:
+    """Rolling p50/p95 time-to-first-token and total latency per provider and model, plus hedge and failover counts."""
+    return llm_metrics.get_metrics()
+
+
+@router.get("/capabilities")
+def capability_cache() -> dict:
+    """JSON-mode support learned per (provider, model, base URL), and how often text mode was used directly."""
+    return capabilities.get_metrics()
+
+
+@router.delete("/capabilities")
+def reset_capabilities(provider: Optional[str] = Query(default=None)) -> dict:
+    return {"deleted": capabilities.reset(provider)}
+
+
+@router.get("/cache")
+def cache_stats() -> dict:
+    """Response cache hit rate and estimated tokens saved since startup."""
+    return llm_cache.get_metrics()
+
+
+@router.delete("/cache")
+async def clear_cache() -> dict:
+    return {"deleted": await llm_cache.clear()}
+
+
+@router.get("/inflight")
+def inflight_stats() -> dict:
+    """Calls and streams currently shared between identical concurrent requests, and how often callers joined one."""
+    return llm_singleflight.get_metrics()
+
+
+@router.get("/limits")
+def limiter_stats() -> dict:
+    """Queue depth, in-flight calls, wait times and 429 backoff per (provider, model, org)."""
+    return llm_rate_limiter.get_metrics()
+
+
+@router.get("/circuits")
+def circuit_state() -> dict:
+    """Circuit breaker state and retry budget usage per provider."""
+    return llm_resilience.get_metrics()
+
+
+@router.post("/circuits/{provider}/reset")
+def reset_circuit(provider: str) -> dict:
+    llm_resilience.reset(provider)
+    return {"provider": provider, "state": "closed"}
+
+
+@router.get("/telemetry")
+async def telemetry_summary(
+    group_by: str = Query(default="provider,model", description="Comma-separated: provider, model, step, org_id"),
+    hours: int = Query(default=24, ge=1, le=24 * 90),
+) -> dict:
+    """p50/p95 latency and TTFB, tokens, cost, cache hit and error rates per dimension over the last ``hours``."""
+    dimensions = [name.strip() for name in group_by.split(",") if name.strip()]
+    try:
+        rows = await llm_telemetry.aggregate(group_by=dimensions, since=datetime.utcnow() - timedelta(hours=hours))
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+    return {"group_by": dimensions, "hours": hours, "rows": rows, "writer": llm_telemetry.get_metrics()}
+
+
 @router.get("/settings")
 async def get_settings(org_id: Optional[str] = Query(default=None)) -> dict:
     settings_doc = await llm_settings_service.get_settings(org_id=org_id)
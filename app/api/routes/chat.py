@@ -7,6 +7,7 @@ from typing import AsyncGenerator
 from fastapi import APIRouter
 from fastapi.responses import StreamingResponse
 
+from app.api.dependencies import LLMOrchestratorDependency
 from app.models.chat_model import ChatRequest
 from app.services import chat_service, llm_settings_service
 from app.services.llm_orchestrator import LLMOrchestrator
@@ -30,7 +31,7 @@ def load_system_prompt() -> str:
 
 
 @router.post("/stream")
-async def chat_stream(payload: ChatRequest) -> StreamingResponse:
+async def chat_stream(payload: ChatRequest, orchestrator: LLMOrchestrator = LLMOrchestratorDependency) -> StreamingResponse:
     async def event_generator() -> AsyncGenerator[str, None]:
         try:
             # Get or create session
@@ -75,7 +76,6 @@ async def chat_stream(payload: ChatRequest) -> StreamingResponse:
             config = llm_settings.default
             
             # Stream response
-            orchestrator = LLMOrchestrator()
             accumulated = ""
             
             async for chunk in orchestrator.generate_stream(messages, config, response_format="text"):
@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+from typing import Optional, Tuple
+from urllib.parse import quote
+
+from fastapi import APIRouter, Header, HTTPException
+from fastapi.responses import StreamingResponse
+
+from app.api.dependencies import UserDependency
+from app.services import file_storage_service
+
+router = APIRouter(prefix="/files", tags=["files"])
+
+
+def _parse_range(range_header: str, length: int) -> Tuple[int, int]:
+    """Parse a single ``bytes=start-end`` range into inclusive offsets."""
+    unit, _, spec = range_header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        raise ValueError("Only single byte ranges are supported")
+
+    start_text, _, end_text = spec.strip().partition("-")
+    if not start_text:
+        # Suffix range: the last N bytes of the file.
+        suffix = int(end_text)
+        if suffix <= 0:
+            raise ValueError("Invalid suffix range")
+        return max(length - suffix, 0), length - 1
+
+    start = int(start_text)
+    end = int(end_text) if end_text else length - 1
+    if start >= length or end < start:
+        raise ValueError("Range not satisfiable")
+    return start, min(end, length - 1)
+
+
+def _content_disposition(filename: Optional[str]) -> str:
+    """``attachment`` header with an ASCII fallback name and the exact name RFC 5987-encoded."""
+    name = filename or "download"
+    fallback = "".join(char if 32 <= ord(char) < 127 and char not in '"\\' else "_" for char in name)
+    return f"attachment; filename=\"{fallback}\"; filename*=UTF-8''{quote(name, safe='')}"
+
+
+@router.get("/{file_id}")
+async def download_file(
+    file_id: str,
+    range_header: Optional[str] = Header(default=None, alias="Range"),
+    user: dict = UserDependency,
+):
+    """Stream a stored upload, honouring single-range ``Range`` requests.
+
+    Only the file's uploaders, their orgs and admins may read it; everyone else gets a 404 so file ids
+    cannot be probed.
+    """
+    stored = await file_storage_service.get_file(file_id)
+    if not stored or not file_storage_service.can_access(stored, user):
+        raise HTTPException(status_code=404, detail="File not found")
+
+    length = stored["length"]
+    headers = {
+        "Accept-Ranges": "bytes",
+        "Content-Disposition": _content_disposition(stored["filename"]),
+        "ETag": f'"{stored["sha256"]}"',
+    }
+    media_type = stored["content_type"] or "application/octet-stream"
+
+    if not range_header or length == 0:
+        headers["Content-Length"] = str(length)
+        return StreamingResponse(file_storage_service.iter_file(file_id), media_type=media_type, headers=headers)
+
+    try:
+        start, end = _parse_range(range_header, length)
+    except ValueError as exc:
+        raise HTTPException(
+            status_code=416,
+            detail=str(exc),
+            headers={"Content-Range": f"bytes */{length}"},
+        ) from exc
+
+    headers["Content-Range"] = f"bytes {start}-{end}/{length}"
+    headers["Content-Length"] = str(end - start + 1)
+    return StreamingResponse(
+        file_storage_service.iter_file(file_id, start, end),
+        status_code=206,
+        media_type=media_type,
+        headers=headers,
+    )
@@ -1,7 +1,16 @@
 from fastapi import APIRouter
 
+from app.services import extraction_pool
+from app.services.documents import cache as extraction_cache
+
 router = APIRouter()
 
 @router.get("/")
 async def health_check():
-    return {"status": "ok", "message": "API is healthy"}
\ No newline at end of file
+    return {"status": "ok", "message": "API is healthy"}
+
+
+@router.get("/extraction")
+async def extraction_health():
+    """Queue depth and throughput of the extraction process pool, plus extraction cache hit rates."""
+    return {"pool": extraction_pool.get_metrics(), "cache": extraction_cache.get_metrics()}
@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+import json
+from typing import AsyncGenerator
+
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
+
+from app.api.dependencies import UserDependency
+from app.services import ingestion_service
+
+router = APIRouter(prefix="/ingestions", tags=["ingestions"])
+
+_POLL_INTERVAL_SECONDS = 1.0
+
+
+@router.get("/{ingestion_id}")
+async def get_ingestion(ingestion_id: str, user: dict = UserDependency):
+    """Current status and stage of an upload being processed in the background.
+
+    Only the uploader, their org and admins may read it; everyone else gets a 404.
+    """
+    ingestion = await ingestion_service.get_ingestion_for(ingestion_id, user)
+    if not ingestion:
+        raise HTTPException(status_code=404, detail="Ingestion not found")
+    return ingestion
+
+
+@router.get("/{ingestion_id}/events")
+async def ingestion_events(ingestion_id: str, user: dict = UserDependency) -> StreamingResponse:
+    """Server-sent events for each status/stage change, ending with a ``completed`` or ``failed`` event."""
+    ingestion = await ingestion_service.get_ingestion_for(ingestion_id, user)
+    if not ingestion:
+        raise HTTPException(status_code=404, detail="Ingestion not found")
+
+    async def event_generator() -> AsyncGenerator[str, None]:
+        current = ingestion
+        last_sent = None
+        while True:
+            state = (current["status"], current["stage"])
+            if state != last_sent:
+                yield f"event: {current['status']}\ndata: {json.dumps(current)}\n\n"
+                last_sent = state
+            if current["status"] in ingestion_service.TERMINAL_STATUSES:
+                return
+            await ingestion_service.wait_for_update(ingestion_id, timeout=_POLL_INTERVAL_SECONDS)
+            current = await ingestion_service.get_ingestion(ingestion_id) or current
+
+    return StreamingResponse(
+        event_generator(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "Connection": "keep-alive",
+            "X-Accel-Buffering": "no",
+        },
+    )
@@ -6,7 +6,7 @@ from fastapi import APIRouter, File, Form, Header, HTTPException, Query, UploadF
 from pydantic import BaseModel, Field
 
 from app.api.dependencies import UserDependency
-from app.services import job_service
+from app.services import file_storage_service, ingestion_service, job_service
 
 router = APIRouter()
 
@@ -79,7 +79,7 @@ async def create_job(job: JobCreate):
     return {"job_id": job_id}
 
 
-@router.post("/upload-jd", status_code=201)
+@router.post("/upload-jd", status_code=202)
 async def upload_job_description(
     authorization: Optional[str] = Header(default=None, alias="Authorization"),
     x_admin_token: str = Header(default="", alias="X-Admin-Token"),
@@ -90,7 +90,7 @@ async def upload_job_description(
     job_brief: Optional[str] = Form(default=None),
     additional_details: Optional[str] = Form(default=None, description="JSON-encoded additional details"),
 ):
-    """Upload a job description file and create a job entry."""
+    """Store a job description upload and queue it for background extraction into a job entry."""
     from app.core.config import settings
     from app.api.dependencies import _extract_bearer_token
     from app.core.auth import verify_jwt, get_roles_from_claims, get_org_from_claims, AuthError
@@ -126,8 +126,6 @@ async def upload_job_description(
     # Get recruiter_id from authenticated user
     recruiter_id = user["sub"]
 
-    file_bytes = await file.read()
-
     # Parse additional details if provided
     parsed_details = None
     if additional_details:
@@ -136,21 +134,35 @@ async def upload_job_description(
         except json.JSONDecodeError:
             raise HTTPException(status_code=400, detail="Invalid additional_details JSON")
 
-    job_id = await job_service.upload_job_description(
-        recruiter_id=recruiter_id,
-        title=title,
-        file_bytes=file_bytes,
-        content_type=file.content_type or "application/octet-stream",
-        original_filename=file.filename or title,
-        company=company,
-        budget=budget,
-        job_brief=job_brief,
-        additional_details=parsed_details,
+    try:
+        file_ref = await file_storage_service.store_upload(
+            file, kind="job_description", owner=recruiter_id, org_id=user.get("org_id")
+        )
+    except file_storage_service.UploadTooLargeError as exc:
+        raise HTTPException(status_code=413, detail=str(exc)) from exc
+    ingestion_id = await ingestion_service.create_ingestion(
+        kind="job_description",
+        file_ref=file_ref,
+        owner=recruiter_id,
+        org_id=user.get("org_id"),
+        params={
+            "recruiter_id": recruiter_id,
+            "title": title,
+            "filename": file.filename or title,
+            "content_type": file.content_type or "application/octet-stream",
+            "company": company,
+            "budget": budget,
+            "job_brief": job_brief,
+            "additional_details": parsed_details,
+        },
     )
 
     return {
-        "job_id": job_id,
-        "message": "Job description uploaded and processed successfully"
+        "ingestion_id": ingestion_id,
+        "status": "queued",
+        "status_url": f"/ingestions/{ingestion_id}",
+        "events_url": f"/ingestions/{ingestion_id}/events",
+        "message": "Job description uploaded; processing in the background",
     }
 
 
@@ -1,24 +1,54 @@
 from __future__ import annotations
 
 import json
-from typing import AsyncGenerator
+from typing import AsyncGenerator, Optional
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Header, HTTPException
 from fastapi.responses import StreamingResponse
 
+from app.api.dependencies import LLMOrchestratorDependency, OptionalUserDependency
 from app.models.recruiter_workflow import RecruiterWorkflowRequest, RecruiterWorkflowResponse
 from app.services import recruiter_workflow_service
+from app.services.llm_orchestrator import LLMOrchestrator
 from app.services.llm_providers.base import ProviderNotConfiguredError
+from app.services.llm_rate_limiter import RateLimitTimeoutError
+from app.services.llm_resilience import CircuitOpenError
 
 router = APIRouter(prefix="/recruiter-workflow", tags=["recruiter-workflow"])
 
 
+def _bypass_cache(x_llm_cache: Optional[str]) -> bool:
+    """``X-LLM-Cache: bypass`` skips cached LLM responses (fresh ones are still stored)."""
+    return (x_llm_cache or "").strip().lower() == "bypass"
+
+
+def _org_id(user: Optional[dict]) -> Optional[str]:
+    """Org whose LLM settings, limits and telemetry apply: only ever the authenticated caller's org.
+
+    Anonymous callers get the default settings, as before orgs existed.
+    """
+    return user.get("org_id") if user else None
+
+
 @router.post("/generate", response_model=RecruiterWorkflowResponse)
-async def generate_workflow(payload: RecruiterWorkflowRequest) -> RecruiterWorkflowResponse:
+async def generate_workflow(
+    payload: RecruiterWorkflowRequest,
+    x_llm_cache: Optional[str] = Header(default=None),
+    user: Optional[dict] = OptionalUserDependency,
+    orchestrator: LLMOrchestrator = LLMOrchestratorDependency,
+) -> RecruiterWorkflowResponse:
     try:
-        return await recruiter_workflow_service.generate_workflow(payload)
+        return await recruiter_workflow_service.generate_workflow(
+            payload,
+            orchestrator=orchestrator,
+            bypass_cache=_bypass_cache(x_llm_cache),
+            org_id=_org_id(user),
+            authenticated=user is not None,
+        )
     except ProviderNotConfiguredError as exc:  # type: ignore[misc]
         raise HTTPException(status_code=400, detail=str(exc)) from exc
+    except (RateLimitTimeoutError, CircuitOpenError) as exc:
+        raise HTTPException(status_code=503, detail=str(exc)) from exc
     except ValueError as exc:
         raise HTTPException(status_code=400, detail=str(exc)) from exc
     except RuntimeError as exc:
@@ -26,10 +56,20 @@ async def generate_workflow(payload: RecruiterWorkflowRequest) -> RecruiterWorkf
 
 
 @router.post("/generate-stream")
-async def generate_workflow_stream(payload: RecruiterWorkflowRequest) -> StreamingResponse:
+async def generate_workflow_stream(
+    payload: RecruiterWorkflowRequest,
+    x_llm_cache: Optional[str] = Header(default=None),
+    user: Optional[dict] = OptionalUserDependency,
+    orchestrator: LLMOrchestrator = LLMOrchestratorDependency,
+) -> StreamingResponse:
+    bypass_cache = _bypass_cache(x_llm_cache)
+    org_id = _org_id(user)
+
     async def event_generator() -> AsyncGenerator[str, None]:
         try:
-            async for event in recruiter_workflow_service.generate_workflow_stream(payload):
+            async for event in recruiter_workflow_service.generate_workflow_stream(
+                payload, orchestrator=orchestrator, bypass_cache=bypass_cache, org_id=org_id, authenticated=user is not None
+            ):
                 event_data = f"data: {json.dumps(event)}\n\n"
                 print(f"[SSE] Sending event: {event.get('type')} - {event.get('step', '')}")  # Debug logging
                 yield event_data
@@ -1,12 +1,14 @@
 from __future__ import annotations
 
 import json
-from typing import Optional
+from typing import AsyncGenerator, List, Optional
 
-from fastapi import APIRouter, File, Form, HTTPException, UploadFile
+from fastapi import APIRouter, File, Form, Header, HTTPException, Query, UploadFile
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 
-from app.services import resume_service
+from app.core.config import settings
+from app.services import bulk_resume_service, file_storage_service, ingestion_service, resume_service
 
 router = APIRouter()
 
@@ -40,7 +42,7 @@ async def get_resume(resume_id: str):
     return {"resume": resume}
 
 
-@router.post("/", status_code=201)
+@router.post("/", status_code=202)
 async def upload_resume(
     user_id: str = Form(...),
     name: str = Form(...),
@@ -50,9 +52,10 @@ async def upload_resume(
     summary: Optional[str] = Form(default=None),
     skills: Optional[str] = Form(default=None),
 ):
-    """Upload a resume and extract text content."""
-    file_bytes = await file.read()
+    """Store a resume upload and queue it for background extraction.
 
+    Poll ``status_url`` (or stream ``events_url``) for the resulting ``resume_id``.
+    """
     # Parse skills if provided
     parsed_skills = None
     if skills:
@@ -61,19 +64,80 @@ async def upload_resume(
         except json.JSONDecodeError:
             parsed_skills = []
 
-    resume_id = await resume_service.upload_resume(
-        user_id=user_id,
-        name=name,
-        file_bytes=file_bytes,
-        content_type=file.content_type or "application/octet-stream",
-        original_filename=file.filename or name,
+    try:
+        file_ref = await file_storage_service.store_upload(file, kind="resume", owner=user_id)
+    except file_storage_service.UploadTooLargeError as exc:
+        raise HTTPException(status_code=413, detail=str(exc)) from exc
+    ingestion_id = await ingestion_service.create_ingestion(
+        kind="resume",
+        file_ref=file_ref,
+        owner=user_id,
+        params={
+            "candidate_id": user_id,
+            "name": name,
+            "filename": file.filename or name,
+            "content_type": file.content_type or "application/octet-stream",
+            "resume_type": resume_type,
+            "version": version,
+            "summary": summary,
+            "skills": parsed_skills,
+        },
+    )
+
+    return {
+        "ingestion_id": ingestion_id,
+        "status": "queued",
+        "status_url": f"/ingestions/{ingestion_id}",
+        "events_url": f"/ingestions/{ingestion_id}/events",
+        "message": "Resume uploaded; processing in the background",
+    }
+
+
+@router.post("/bulk")
+async def bulk_upload_resumes(
+    user_id: str = Form(...),
+    files: List[UploadFile] = File(...),
+    resume_type: str = Form(default="general"),
+    stream_format: Optional[str] = Query(default=None, alias="format", regex="^(ndjson|sse)$"),
+    accept: Optional[str] = Header(default=None),
+) -> StreamingResponse:
+    """Upload many resumes at once, as individual files and/or zip archives.
+
+    Results are streamed per file as NDJSON (default) or server-sent events (``?format=sse`` or
+    ``Accept: text/event-stream``), followed by a ``summary`` event.
+    """
+    try:
+        bulk_files = bulk_resume_service.expand_uploads(
+            files,
+            max_files=settings.BULK_UPLOAD_MAX_FILES,
+            max_uncompressed_bytes=settings.BULK_UPLOAD_MAX_UNCOMPRESSED_MB * 1024 * 1024,
+        )
+    except bulk_resume_service.BulkUploadTooLargeError as exc:
+        raise HTTPException(status_code=413, detail=str(exc)) from exc
+    except bulk_resume_service.BulkUploadError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+
+    use_sse = stream_format == "sse" or (stream_format is None and "text/event-stream" in (accept or ""))
+    results = bulk_resume_service.bulk_upload_resumes(
+        bulk_files,
+        candidate_id=user_id,
         resume_type=resume_type,
-        version=version,
-        summary=summary,
-        skills=parsed_skills,
+        concurrency=settings.BULK_UPLOAD_CONCURRENCY,
+        batch_size=settings.BULK_INSERT_BATCH_SIZE,
     )
 
-    return {"resume_id": resume_id, "message": "Resume uploaded and processed successfully"}
+    async def event_generator() -> AsyncGenerator[str, None]:
+        async for result in results:
+            if use_sse:
+                yield f"event: {result['event']}\ndata: {json.dumps(result)}\n\n"
+            else:
+                yield json.dumps(result) + "\n"
+
+    return StreamingResponse(
+        event_generator(),
+        media_type="text/event-stream" if use_sse else "application/x-ndjson",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 
 @router.patch("/{resume_id}")
@@ -48,7 +48,10 @@ def _jwks() -> Dict[str, Any]:
 
 
 def _get_key(token: str) -> Dict[str, Any]:
-    headers = jwt.get_unverified_header(token)
+    try:
+        headers = jwt.get_unverified_header(token)
+    except JWTError as exc:
+        raise AuthError(f"Invalid token: {exc}") from exc
     kid = headers.get("kid")
     if not kid:
         raise AuthError("Missing kid in token header")
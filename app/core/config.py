@@ -8,6 +8,7 @@ class Settings(BaseSettings):
     APP_NAME: str = "AI Matching Job API"
     DEBUG: bool = True
     RUN_STARTUP_SEED: bool = True
+    RUN_STARTUP_MIGRATIONS: bool = True
     CORS_ALLOW_ORIGINS: str = "*"
     CORS_ALLOW_CREDENTIALS: bool = False
     # Auth0 / OIDC
@@ -16,7 +17,94 @@ class Settings(BaseSettings):
     AUTH0_ISSUER: Optional[str] = None
     AUTH0_ALGORITHMS: str = "RS256"
 
+    # Document extraction runs in a bounded process pool to keep parsing off the event loop
+    EXTRACTION_POOL_WORKERS: int = 2
+    EXTRACTION_MAX_QUEUE: int = 32
+    EXTRACTION_TIMEOUT_SECONDS: float = 30.0
+    EXTRACTION_MAX_PAGES: int = 50
+    EXTRACTION_MAX_CHARS: int = 200_000
+    EXTRACTION_MEMORY_LIMIT_MB: int = 256
+    EXTRACTION_CACHE_LRU_SIZE: int = 256
+    EXTRACTION_CACHE_TTL_DAYS: int = 90
+    INGESTION_WORKERS: int = 4
+    # Bounded resume preview and per-section digest sent to the LLM instead of full text
+    RESUME_PREVIEW_MAX_CHARS: int = 500
+    RESUME_SECTION_MAX_CHARS: int = 600
+    # Upload size limits; requests over UPLOAD_MAX_REQUEST_MB are rejected before the body is read
+    UPLOAD_MAX_FILE_MB: int = 20
+    UPLOAD_MAX_REQUEST_MB: int = 512
+    UPLOAD_SPOOL_DIR: Optional[str] = None
+    # POST /resumes/bulk limits
+    BULK_UPLOAD_MAX_FILES: int = 500
+    BULK_UPLOAD_MAX_UNCOMPRESSED_MB: int = 500
+    BULK_UPLOAD_CONCURRENCY: int = 4
+    BULK_INSERT_BATCH_SIZE: int = 50
+
     LLM_DEFAULT_PROVIDER: str = "openai"
+    # Shared, pooled HTTP clients for the LLM providers (one per provider and base URL)
+    LLM_HTTP2: bool = True
+    LLM_HTTP_CONNECT_TIMEOUT_SECONDS: float = 5.0
+    LLM_HTTP_READ_TIMEOUT_SECONDS: float = 60.0
+    LLM_HTTP_MAX_CONNECTIONS: int = 50
+    LLM_HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    LLM_HTTP_KEEPALIVE_EXPIRY_SECONDS: float = 60.0
+    # Response cache for steps with cache_enabled (in-process LRU in front of a Mongo TTL collection)
+    LLM_CACHE_LRU_SIZE: int = 512
+    LLM_CACHE_TTL_SECONDS: int = 24 * 3600
+    # Limits per (provider, model, org); RPM/TPM of 0 disables that budget. LLM_RATE_LIMITS is a JSON object of
+    # overrides keyed by provider or provider:model, e.g. {"openai": {"requests_per_minute": 500}}
+    LLM_MAX_CONCURRENCY: int = 8
+    LLM_REQUESTS_PER_MINUTE: int = 0
+    LLM_TOKENS_PER_MINUTE: int = 0
+    LLM_QUEUE_TIMEOUT_SECONDS: float = 30.0
+    LLM_RATE_LIMITS: Optional[str] = None
+    LLM_RATE_LIMIT_RETRIES: int = 2
+    LLM_RETRY_AFTER_DEFAULT_SECONDS: float = 2.0
+    # Retries for timeouts, connection errors and 5xx (full-jitter backoff), capped by a per-provider budget of
+    # LLM_RETRY_BUDGET_MIN + LLM_RETRY_BUDGET_RATIO * calls per minute
+    LLM_RETRY_MAX_ATTEMPTS: int = 3
+    LLM_RETRY_BASE_DELAY_SECONDS: float = 0.5
+    LLM_RETRY_MAX_DELAY_SECONDS: float = 8.0
+    LLM_RETRY_BUDGET_RATIO: float = 0.2
+    LLM_RETRY_BUDGET_MIN: int = 5
+    # Circuit breaker per provider: open after N consecutive transient failures, probe again after the reset window
+    LLM_CIRCUIT_FAILURE_THRESHOLD: int = 5
+    LLM_CIRCUIT_RESET_SECONDS: float = 30.0
+    # Steps with fallbacks hedge to the first one once the primary exceeds its rolling p95 latency
+    # (needs LLM_HEDGE_MIN_SAMPLES samples first) or the step's hedge_after_ms
+    LLM_HEDGE_ENABLED: bool = True
+    LLM_HEDGE_MIN_SAMPLES: int = 20
+    # Concurrent identical LLM calls (same org, prompt and sampling) share one provider call or token stream
+    LLM_COALESCE_ENABLED: bool = True
+    # Prompt budgeting: completion room reserved when a step sets no max_tokens, the smallest completion a call may
+    # be squeezed to, room kept for step instructions beside the shared context, and a JSON object of context window
+    # overrides keyed by provider or provider:model
+    LLM_COMPLETION_RESERVE_TOKENS: int = 2048
+    LLM_MIN_COMPLETION_TOKENS: int = 256
+    LLM_INSTRUCTION_RESERVE_TOKENS: int = 1500
+    LLM_CONTEXT_WINDOWS: Optional[str] = None
+    # Per-call LLM telemetry, buffered in memory and written in batches to time buckets in llm_telemetry. LLM_PRICES is
+    # a JSON object of USD per million [input, output] tokens keyed by provider or provider:model
+    LLM_TELEMETRY_ENABLED: bool = True
+    LLM_TELEMETRY_BUFFER_SIZE: int = 10000
+    LLM_TELEMETRY_BATCH_SIZE: int = 200
+    LLM_TELEMETRY_FLUSH_SECONDS: float = 5.0
+    LLM_TELEMETRY_BUCKET_MINUTES: int = 60
+    LLM_TELEMETRY_MAX_SAMPLES_PER_BUCKET: int = 1000
+    LLM_TELEMETRY_RETENTION_DAYS: int = 30
+    LLM_PRICES: Optional[str] = None
+    # Offline "fake" provider for load tests: off unless enabled, since its configs can inject errors and delays and
+    # write cassettes. Default model name, where record/replay cassettes are kept, and caps on the requested delays
+    LLM_FAKE_ENABLED: bool = False
+    LLM_FAKE_MODEL: str = "fake-recruiter-1"
+    LLM_FAKE_CASSETTE_DIR: str = "cassettes"
+    LLM_FAKE_MAX_LATENCY_MS: int = 10000
+    LLM_FAKE_MIN_TOKENS_PER_SECOND: float = 10.0
+    # Send one tiny JSON-mode request per env-configured OpenAI/DeepSeek model at startup, so its JSON-mode support is
+    # known before the first workflow call (otherwise it is learned from the first call's 400)
+    LLM_CAPABILITY_PROBE: bool = False
+    # How long a learned "no JSON mode" is trusted before JSON mode is tried again for that model
+    LLM_JSON_MODE_NEGATIVE_TTL_SECONDS: int = 3600
     LLM_SETTINGS_SECRET_KEY: Optional[str] = None
     ADMIN_API_KEY: Optional[str] = None
     # When true, ignore env var provider keys and require admin- or user-provided keys
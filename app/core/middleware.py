@@ -0,0 +1,31 @@
+from __future__ import annotations
+
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+
+class UploadSizeLimitMiddleware:
+    """Reject multipart requests whose declared ``Content-Length`` exceeds ``max_bytes``.
+
+    Runs before the body is read, so oversized uploads are refused without being spooled. Per-file
+    limits are enforced separately while each file is streamed (see ``file_storage_service``).
+    """
+
+    def __init__(self, app: ASGIApp, *, max_bytes: int) -> None:
+        self.app = app
+        self.max_bytes = max_bytes
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http":
+            headers = dict(scope["headers"])
+            content_type = headers.get(b"content-type", b"")
+            content_length = headers.get(b"content-length", b"")
+            if content_type.startswith(b"multipart/form-data") and content_length.isdigit():
+                if int(content_length) > self.max_bytes:
+                    response = JSONResponse(
+                        {"detail": f"Request exceeds the {self.max_bytes // (1024 * 1024)} MB upload limit"},
+                        status_code=413,
+                    )
+                    await response(scope, receive, send)
+                    return
+        await self.app(scope, receive, send)
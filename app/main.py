@@ -2,11 +2,15 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from pymongo import MongoClient
 
+from app.core import database
 from app.core.config import settings
+from app.core.middleware import UploadSizeLimitMiddleware
 from app.api.routes import (
     applications,
     candidates,
+    files,
     health,
+    ingestions,
     jobs,
     ranking,
     recruiters,
@@ -19,6 +23,21 @@ from app.api.routes import (
     chat,
     prompts,
 )
+from app.migrations import MIGRATIONS, run_migrations
+from app.services import (
+    extraction_pool,
+    file_storage_service,
+    ingestion_service,
+    llm_cache,
+    llm_rate_limiter,
+    llm_resilience,
+    llm_telemetry,
+)
+from app.services.documents import cache as extraction_cache
+from app.services.llm_orchestrator import LLMOrchestrator
+from app.services.llm_providers import bedrock_provider
+from app.services.llm_providers import capabilities as llm_capabilities
+from app.services.llm_providers import http_clients as llm_http_clients
 from scripts.seed_candidate_workflow import seed_candidate_workflow
 from scripts.seed_jobs import seed_jobs
 from scripts.seed_recruiters import seed_recruiters
@@ -37,6 +56,7 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(UploadSizeLimitMiddleware, max_bytes=settings.UPLOAD_MAX_REQUEST_MB * 1024 * 1024)
 
 # Configure MongoDB client
 client = MongoClient(settings.MONGO_URI)
@@ -56,6 +76,38 @@ async def startup_event():
     except Exception as e:
         print(f"Database connection failed: {e}")
 
+    try:
+        await file_storage_service.ensure_indexes()
+        await extraction_cache.ensure_indexes()
+        await llm_cache.ensure_indexes()
+        await llm_telemetry.ensure_indexes()
+    except Exception as e:
+        print(f"Failed to create storage indexes: {e}")
+
+    app.state.llm_orchestrator = LLMOrchestrator()
+    try:
+        llm_http_clients.start(app.state.llm_orchestrator.http_endpoints())
+    except Exception as e:
+        print(f"Failed to open LLM HTTP clients: {e}")
+    llm_telemetry.start()
+    if settings.LLM_CAPABILITY_PROBE:
+        llm_capabilities.start_probe(app.state.llm_orchestrator.capability_probes())
+
+    # Migrations run before seeding so seed data lands on the current schema
+    if settings.RUN_STARTUP_MIGRATIONS:
+        try:
+            reports = await run_migrations(database.db, MIGRATIONS)
+            for report in reports:
+                print(f"Applied migration {report['version']} ({report['name']}): {report['modified']} documents modified")
+        except Exception as e:
+            print(f"Data migrations failed: {e}")
+
+    # Workers start after migrations so they never index documents on the old schema
+    try:
+        await ingestion_service.start_workers(settings.INGESTION_WORKERS)
+    except Exception as e:
+        print(f"Failed to start ingestion workers: {e}")
+
     if not settings.RUN_STARTUP_SEED:
         print("Skipping all seeding (RUN_STARTUP_SEED=false)")
         return
@@ -82,11 +134,26 @@ async def startup_event():
     seed_recruiters()
     print("All seeding completed")
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    await ingestion_service.stop_workers()
+    extraction_pool.shutdown()
+    await llm_capabilities.stop()
+    await llm_http_clients.aclose()
+    bedrock_provider.shutdown_stream_readers()
+    await llm_telemetry.stop()
+    llm_rate_limiter.reset()
+    llm_resilience.reset()
+    llm_capabilities.reset()
+
+
 # Include your routers
 app.include_router(health.router, prefix="/health")
 app.include_router(users.router, prefix="/users")
 app.include_router(jobs.router, prefix="/jobs")
 app.include_router(resumes.router, prefix="/resumes")
+app.include_router(files.router)
+app.include_router(ingestions.router)
 app.include_router(candidates.router)
 app.include_router(applications.router)
 app.include_router(ranking.router, prefix="/ranking")
@@ -0,0 +1,17 @@
+from app.migrations.base import Migration
+from app.migrations.m0001_backfill_resume_is_active import BackfillResumeIsActive
+from app.migrations.m0002_unify_resume_owner_key import UnifyResumeOwnerKey
+from app.migrations.m0003_resume_owner_indexes import ResumeOwnerIndexes
+from app.migrations.m0004_backfill_resume_previews import BackfillResumePreviews
+from app.migrations.m0005_unique_upload_hashes import UniqueUploadHashes
+from app.migrations.runner import MigrationLockTimeoutError, run_migrations
+
+MIGRATIONS = [
+    BackfillResumeIsActive(),
+    UnifyResumeOwnerKey(),
+    ResumeOwnerIndexes(),
+    BackfillResumePreviews(),
+    UniqueUploadHashes(),
+]
+
+__all__ = ["MIGRATIONS", "Migration", "MigrationLockTimeoutError", "run_migrations"]
@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+import abc
+from typing import Any, Dict, List, Optional
+
+from motor.motor_asyncio import AsyncIOMotorCollection, AsyncIOMotorDatabase
+
+
+class Migration(abc.ABC):
+    """A versioned, idempotent data migration.
+
+    Migrations with a ``collection`` are applied in ``_id``-ordered batches of documents matching
+    :meth:`pending_filter`; the runner checkpoints the last processed ``_id`` after every batch so an
+    interrupted run resumes where it stopped. Because the filter only matches documents that still
+    need work, re-running a completed batch is a no-op.
+    """
+
+    version: int
+    name: str
+    collection: Optional[str] = None
+    batch_size: int = 500
+
+    def pending_filter(self) -> Dict[str, Any]:
+        """Query matching documents that still need to be migrated."""
+        return {}
+
+    async def migrate_batch(self, collection: AsyncIOMotorCollection, documents: List[Dict[str, Any]]) -> int:
+        """Migrate one batch of documents and return the number modified."""
+        return 0
+
+    async def finalize(self, database: AsyncIOMotorDatabase) -> None:
+        """Run once after all batches complete (e.g. to build indexes)."""
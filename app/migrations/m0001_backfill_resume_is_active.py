@@ -0,0 +1,30 @@
+from __future__ import annotations
+
+from typing import Any, Dict, List
+
+from motor.motor_asyncio import AsyncIOMotorCollection
+
+from app.migrations.base import Migration
+
+
+class BackfillResumeIsActive(Migration):
+    """Give every resume an explicit ``is_active`` flag.
+
+    Seeded resumes were written without the field, which forced ``$or``/``$exists`` filters on the
+    hot resume queries. Missing flags are backfilled as ``True``, matching how they were read.
+    """
+
+    version = 1
+    name = "backfill_resume_is_active"
+    collection = "resumes"
+
+    def pending_filter(self) -> Dict[str, Any]:
+        return {"is_active": {"$exists": False}}
+
+    async def migrate_batch(self, collection: AsyncIOMotorCollection, documents: List[Dict[str, Any]]) -> int:
+        ids = [document["_id"] for document in documents]
+        result = await collection.update_many(
+            {"_id": {"$in": ids}, "is_active": {"$exists": False}},
+            {"$set": {"is_active": True}},
+        )
+        return result.modified_count
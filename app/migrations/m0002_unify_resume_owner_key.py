@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+from typing import Any, Dict, List
+
+from motor.motor_asyncio import AsyncIOMotorCollection
+from pymongo import UpdateOne
+
+from app.migrations.base import Migration
+
+
+class UnifyResumeOwnerKey(Migration):
+    """Move uploaded resumes from ``user_id`` to ``candidate_id``.
+
+    Uploads stored the owner as ``user_id`` while every reader queries ``candidate_id``, so uploaded
+    resumes never showed up in candidate listings.
+    """
+
+    version = 2
+    name = "unify_resume_owner_key"
+    collection = "resumes"
+
+    def pending_filter(self) -> Dict[str, Any]:
+        return {"user_id": {"$exists": True}, "candidate_id": {"$exists": False}}
+
+    async def migrate_batch(self, collection: AsyncIOMotorCollection, documents: List[Dict[str, Any]]) -> int:
+        operations = [
+            UpdateOne(
+                {"_id": document["_id"], "candidate_id": {"$exists": False}},
+                {"$set": {"candidate_id": document["user_id"]}, "$unset": {"user_id": ""}},
+            )
+            for document in documents
+        ]
+        if not operations:
+            return 0
+        result = await collection.bulk_write(operations, ordered=False)
+        return result.modified_count
@@ -0,0 +1,28 @@
+from __future__ import annotations
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ASCENDING, DESCENDING
+
+from app.migrations.base import Migration
+
+
+class ResumeOwnerIndexes(Migration):
+    """Index the single-equality resume lookups enabled by migrations 1 and 2."""
+
+    version = 3
+    name = "resume_owner_indexes"
+
+    async def finalize(self, database: AsyncIOMotorDatabase) -> None:
+        await database.resumes.create_index(
+            [("candidate_id", ASCENDING), ("is_active", ASCENDING), ("last_updated", DESCENDING)],
+            name="candidate_active_last_updated",
+        )
+        await database.resumes.create_index(
+            [
+                ("candidate_id", ASCENDING),
+                ("resume_type", ASCENDING),
+                ("is_active", ASCENDING),
+                ("version", DESCENDING),
+            ],
+            name="candidate_type_active_version",
+        )
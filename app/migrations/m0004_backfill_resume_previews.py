@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+from typing import Any, Dict, List
+
+from motor.motor_asyncio import AsyncIOMotorCollection
+from pymongo import UpdateOne
+
+from app.core.config import settings
+from app.migrations.base import Migration
+from app.services.documents import summarise_resume
+
+
+class BackfillResumePreviews(Migration):
+    """Compute ``preview`` and ``sections`` for uploaded resumes that only have raw ``content``.
+
+    Resumes ingested before segmentation existed sent a null preview to the recruiter workflow.
+    Seeded resumes already carry a hand-written preview and have no ``content``, so they never match.
+    """
+
+    version = 4
+    name = "backfill_resume_previews"
+    collection = "resumes"
+    # Resume text can be large; keep each batch's documents modest.
+    batch_size = 100
+
+    def pending_filter(self) -> Dict[str, Any]:
+        return {"preview": {"$exists": False}, "content": {"$type": "string"}}
+
+    async def migrate_batch(self, collection: AsyncIOMotorCollection, documents: List[Dict[str, Any]]) -> int:
+        operations = []
+        for document in documents:
+            digest = summarise_resume(
+                document["content"],
+                preview_chars=settings.RESUME_PREVIEW_MAX_CHARS,
+                section_chars=settings.RESUME_SECTION_MAX_CHARS,
+            )
+            operations.append(
+                UpdateOne(
+                    {"_id": document["_id"], "preview": {"$exists": False}},
+                    {"$set": {"preview": digest["preview"], "sections": digest["sections"]}},
+                )
+            )
+        if not operations:
+            return 0
+        result = await collection.bulk_write(operations, ordered=False)
+        return result.modified_count
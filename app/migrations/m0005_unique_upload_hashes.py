@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+from typing import Any, Dict, List
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import UpdateMany, UpdateOne
+
+from app.migrations.base import Migration
+from app.services.file_storage_service import SHA256_INDEX
+
+
+def _flatten(lists: List[List[Any]]) -> List[Any]:
+    return sorted({value for values in lists for value in values or []})
+
+
+class UniqueUploadHashes(Migration):
+    """Replace the non-unique ``metadata.sha256`` upload index with a unique one.
+
+    Concurrent uploads of the same content could both be stored. The oldest copy keeps the hash and gains
+    every copy's owners; the others keep their bytes (jobs and resumes still reference them) but move the
+    hash to ``content_sha256`` so it no longer collides.
+    """
+
+    version = 5
+    name = "unique_upload_hashes"
+
+    async def finalize(self, database: AsyncIOMotorDatabase) -> None:
+        files = database["uploads.files"]
+        groups: List[Dict[str, Any]] = await files.aggregate(
+            [
+                {"$match": {"metadata.sha256": {"$type": "string"}}},
+                {"$sort": {"_id": 1}},
+                {
+                    "$group": {
+                        "_id": "$metadata.sha256",
+                        "ids": {"$push": "$_id"},
+                        "owners": {"$push": "$metadata.owners"},
+                        "org_ids": {"$push": "$metadata.org_ids"},
+                    }
+                },
+                {"$match": {"ids.1": {"$exists": True}}},
+            ]
+        ).to_list(length=None)
+
+        operations = []
+        for group in groups:
+            keep, *duplicates = group["ids"]
+            operations.append(
+                UpdateOne(
+                    {"_id": keep},
+                    {
+                        "$addToSet": {
+                            "metadata.owners": {"$each": _flatten(group["owners"])},
+                            "metadata.org_ids": {"$each": _flatten(group["org_ids"])},
+                        }
+                    },
+                )
+            )
+            operations.append(
+                UpdateMany(
+                    {"_id": {"$in": duplicates}},
+                    {"$rename": {"metadata.sha256": "metadata.content_sha256"}, "$set": {"metadata.duplicate_of": keep}},
+                )
+            )
+        if operations:
+            await files.bulk_write(operations, ordered=False)
+
+        if "metadata.sha256_1" in await files.index_information():
+            await files.drop_index("metadata.sha256_1")
+        await files.create_index("metadata.sha256", unique=True, name=SHA256_INDEX)
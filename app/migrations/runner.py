@@ -0,0 +1,188 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import socket
+import time
+import uuid
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo.errors import DuplicateKeyError
+
+from app.migrations.base import Migration
+
+logger = logging.getLogger(__name__)
+
+_STATE_COLLECTION = "schema_migrations"
+_LOCK_COLLECTION = "migrations_lock"
+_LOCK_ID = "migrations"
+# The holder renews the lock well within its TTL; a lock that outlives the TTL belongs to a dead instance.
+_LOCK_TTL = timedelta(minutes=5)
+_LOCK_RENEW_SECONDS = 60.0
+_LOCK_POLL_SECONDS = 2.0
+
+
+class MigrationLockTimeoutError(RuntimeError):
+    """Raised when another instance kept the migrations lock for longer than the caller would wait."""
+
+
+async def run_migrations(
+    database: AsyncIOMotorDatabase,
+    migrations: Iterable[Migration],
+    *,
+    target_version: Optional[int] = None,
+    dry_run: bool = False,
+    lock_timeout: Optional[float] = None,
+) -> List[Dict[str, Any]]:
+    """Apply pending migrations in version order and return a report per migration.
+
+    Progress is checkpointed in ``schema_migrations`` after every batch, so re-running after an
+    interruption continues from the last processed document. With ``dry_run`` nothing is written;
+    the report lists how many documents each pending migration would touch.
+
+    Only one instance applies migrations at a time: the others wait for the ``migrations_lock``
+    document (at most ``lock_timeout`` seconds, if given) and then skip what it completed.
+    """
+    if dry_run:
+        return await _run(database, migrations, target_version=target_version, dry_run=True)
+
+    owner = f"{socket.gethostname()}:{uuid.uuid4().hex}"
+    await _acquire_lock(database, owner, lock_timeout)
+    renewal = asyncio.create_task(_renew_lock(database, owner))
+    try:
+        return await _run(database, migrations, target_version=target_version, dry_run=False)
+    finally:
+        renewal.cancel()
+        await asyncio.gather(renewal, return_exceptions=True)
+        await database[_LOCK_COLLECTION].delete_one({"_id": _LOCK_ID, "owner": owner})
+
+
+async def _try_lock(database: AsyncIOMotorDatabase, owner: str) -> bool:
+    now = datetime.utcnow()
+    try:
+        # Matches only a free (expired) lock; when it is held, the upsert collides with the holder's document.
+        await database[_LOCK_COLLECTION].find_one_and_update(
+            {"_id": _LOCK_ID, "expires_at": {"$lt": now}},
+            {"$set": {"owner": owner, "acquired_at": now, "expires_at": now + _LOCK_TTL}},
+            upsert=True,
+        )
+    except DuplicateKeyError:
+        return False
+    return True
+
+
+async def _acquire_lock(database: AsyncIOMotorDatabase, owner: str, timeout: Optional[float]) -> None:
+    deadline = None if timeout is None else time.monotonic() + timeout
+    waiting = False
+    while not await _try_lock(database, owner):
+        if deadline is not None and time.monotonic() >= deadline:
+            raise MigrationLockTimeoutError("Another instance is still applying migrations")
+        if not waiting:
+            logger.info("Waiting for another instance to finish applying migrations")
+            waiting = True
+        await asyncio.sleep(_LOCK_POLL_SECONDS)
+
+
+async def _renew_lock(database: AsyncIOMotorDatabase, owner: str) -> None:
+    while True:
+        await asyncio.sleep(_LOCK_RENEW_SECONDS)
+        await database[_LOCK_COLLECTION].update_one(
+            {"_id": _LOCK_ID, "owner": owner}, {"$set": {"expires_at": datetime.utcnow() + _LOCK_TTL}}
+        )
+
+
+async def _run(
+    database: AsyncIOMotorDatabase,
+    migrations: Iterable[Migration],
+    *,
+    target_version: Optional[int],
+    dry_run: bool,
+) -> List[Dict[str, Any]]:
+    state_collection = database[_STATE_COLLECTION]
+    reports: List[Dict[str, Any]] = []
+
+    for migration in sorted(migrations, key=lambda item: item.version):
+        if target_version is not None and migration.version > target_version:
+            break
+
+        state = await state_collection.find_one({"_id": migration.version}) or {}
+        if state.get("status") == "completed":
+            continue
+
+        pending = 0
+        if migration.collection:
+            pending = await database[migration.collection].count_documents(migration.pending_filter())
+
+        if dry_run:
+            reports.append({"version": migration.version, "name": migration.name, "status": "pending", "pending": pending})
+            logger.info("Migration %s (%s): %s documents pending", migration.version, migration.name, pending)
+            continue
+
+        reports.append(await _apply(database, migration, state, pending))
+
+    return reports
+
+
+async def _apply(
+    database: AsyncIOMotorDatabase,
+    migration: Migration,
+    state: Dict[str, Any],
+    pending: int,
+) -> Dict[str, Any]:
+    state_collection = database[_STATE_COLLECTION]
+    processed = state.get("processed", 0)
+    modified = state.get("modified", 0)
+    last_id = state.get("last_id")
+
+    await state_collection.update_one(
+        {"_id": migration.version},
+        {
+            "$set": {"name": migration.name, "status": "running"},
+            "$setOnInsert": {"started_at": datetime.utcnow()},
+        },
+        upsert=True,
+    )
+    logger.info("Migration %s (%s) starting: %s documents pending", migration.version, migration.name, pending)
+
+    if migration.collection:
+        collection = database[migration.collection]
+        while True:
+            query = dict(migration.pending_filter())
+            if last_id is not None:
+                query["_id"] = {"$gt": last_id}
+            documents = await collection.find(query).sort("_id", 1).limit(migration.batch_size).to_list(
+                length=migration.batch_size
+            )
+            if not documents:
+                break
+
+            modified += await migration.migrate_batch(collection, documents)
+            processed += len(documents)
+            last_id = documents[-1]["_id"]
+            await state_collection.update_one(
+                {"_id": migration.version},
+                {"$set": {"last_id": last_id, "processed": processed, "modified": modified}},
+            )
+            logger.info(
+                "Migration %s (%s): %s/%s documents processed",
+                migration.version,
+                migration.name,
+                processed,
+                max(pending, processed),
+            )
+
+    await migration.finalize(database)
+    await state_collection.update_one(
+        {"_id": migration.version},
+        {"$set": {"status": "completed", "completed_at": datetime.utcnow(), "processed": processed, "modified": modified}},
+    )
+    logger.info("Migration %s (%s) completed: %s modified", migration.version, migration.name, modified)
+    return {
+        "version": migration.version,
+        "name": migration.name,
+        "status": "completed",
+        "processed": processed,
+        "modified": modified,
+    }
@@ -1,11 +1,11 @@
 from __future__ import annotations
 
 from datetime import datetime
-from typing import Any, Dict, Literal, Optional
+from typing import Any, Dict, List, Literal, Optional
 
 from pydantic import BaseModel, Field
 
-LLMProviderName = Literal["openai", "anthropic", "google", "deepseek", "bedrock"]
+LLMProviderName = Literal["openai", "anthropic", "google", "deepseek", "bedrock", "fake"]
 
 WORKFLOW_STEP_NAMES = {
     "core_skills",
@@ -18,6 +18,11 @@ WORKFLOW_STEP_NAMES = {
 }
 
 
+class LLMFallbackTarget(BaseModel):
+    provider: LLMProviderName
+    model: Optional[str] = Field(default=None, description="Model to use; defaults to the provider's configured model")
+
+
 class LLMProviderConfig(BaseModel):
     provider: LLMProviderName
     model: str
@@ -27,6 +32,14 @@ class LLMProviderConfig(BaseModel):
     max_tokens: Optional[int] = Field(default=None, gt=0)
     extra_headers: Dict[str, str] = Field(default_factory=dict)
     extra_payload: Dict[str, Any] = Field(default_factory=dict)
+    cache_enabled: bool = Field(default=False, description="Serve repeated identical calls from the response cache")
+    cache_ttl_seconds: Optional[int] = Field(default=None, gt=0, description="Cache lifetime; defaults to LLM_CACHE_TTL_SECONDS")
+    fallbacks: List[LLMFallbackTarget] = Field(
+        default_factory=list, description="Providers to fail over to, in order; credentials come from the other configs or env"
+    )
+    hedge_after_ms: Optional[int] = Field(
+        default=None, ge=0, description="Hedge to the first fallback after this long; defaults to the primary's rolling p95"
+    )
 
 
 class LLMWorkflowStepConfig(BaseModel):
@@ -70,6 +83,10 @@ def _mask_config(config: LLMProviderConfig) -> LLMProviderConfig:
         max_tokens=config.max_tokens,
         extra_headers=config.extra_headers,
         extra_payload=config.extra_payload,
+        cache_enabled=config.cache_enabled,
+        cache_ttl_seconds=config.cache_ttl_seconds,
+        fallbacks=config.fallbacks,
+        hedge_after_ms=config.hedge_after_ms,
     )
 
 
@@ -4,7 +4,7 @@ from datetime import datetime
 
 class Resume(BaseModel):
     id: Optional[str]
-    user_id: str  # Link to user
+    candidate_id: str  # Owning candidate
     name: str
     email: EmailStr
     skills: list[str]
@@ -1,6 +1,10 @@
 from . import (
     application_service,
+    bulk_resume_service,
     candidate_service,
+    extraction_pool,
+    file_storage_service,
+    ingestion_service,
     job_service,
     ranking_service,
     recruiter_service,
@@ -13,7 +17,11 @@ from . import (
 
 __all__ = [
     "application_service",
+    "bulk_resume_service",
     "candidate_service",
+    "extraction_pool",
+    "file_storage_service",
+    "ingestion_service",
     "job_service",
     "ranking_service",
     "recruiter_service",
@@ -0,0 +1,273 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import mimetypes
+import os
+import zipfile
+from contextlib import nullcontext
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, BinaryIO, Callable, ContextManager, Dict, List, Optional, Tuple, Union
+
+from fastapi import UploadFile
+
+from app.services import file_storage_service, resume_service
+from app.services.documents import DocumentExtractionError, ExtractionResult, extract_cached
+from app.services.extraction_pool import ExtractionPoolBusyError, ExtractionTimeoutError
+
+logger = logging.getLogger(__name__)
+
+_ZIP_CONTENT_TYPES = {"application/zip", "application/x-zip-compressed"}
+_BUSY_RETRIES = 3
+_BUSY_RETRY_DELAY_SECONDS = 1.0
+
+
+class BulkUploadError(ValueError):
+    """Raised when a bulk upload request is malformed (e.g. an unreadable archive)."""
+
+
+class BulkUploadTooLargeError(BulkUploadError):
+    """Raised when a bulk upload exceeds the file-count or archive-size limits."""
+
+
+@dataclass
+class BulkFile:
+    filename: str
+    content_type: str
+    open: Callable[[], ContextManager[BinaryIO]]
+
+
+def _is_zip(upload: UploadFile) -> bool:
+    return upload.content_type in _ZIP_CONTENT_TYPES or (upload.filename or "").lower().endswith(".zip")
+
+
+def _guess_content_type(filename: str) -> str:
+    return mimetypes.guess_type(filename)[0] or "application/octet-stream"
+
+
+def _zip_members(upload: UploadFile, max_uncompressed_bytes: int) -> List[BulkFile]:
+    upload.file.seek(0)
+    try:
+        archive = zipfile.ZipFile(upload.file)
+    except zipfile.BadZipFile as exc:
+        raise BulkUploadError(f"'{upload.filename}' is not a valid zip archive") from exc
+
+    members = [
+        info
+        for info in archive.infolist()
+        if not info.is_dir()
+        and not info.filename.startswith("__MACOSX/")
+        and not os.path.basename(info.filename).startswith(".")
+    ]
+    # Declared sizes guard against zip bombs before anything is decompressed.
+    if sum(info.file_size for info in members) > max_uncompressed_bytes:
+        raise BulkUploadTooLargeError(f"'{upload.filename}' expands beyond the bulk upload size limit")
+
+    def opener(info: zipfile.ZipInfo) -> Callable[[], ContextManager[BinaryIO]]:
+        return lambda: archive.open(info)  # type: ignore[return-value]
+
+    return [
+        BulkFile(
+            filename=os.path.basename(info.filename),
+            content_type=_guess_content_type(info.filename),
+            open=opener(info),
+        )
+        for info in members
+    ]
+
+
+def _upload_opener(upload: UploadFile) -> Callable[[], ContextManager[BinaryIO]]:
+    def open_upload() -> ContextManager[BinaryIO]:
+        upload.file.seek(0)
+        # The request owns the upload's spooled file; leave it open.
+        return nullcontext(upload.file)  # type: ignore[arg-type]
+
+    return open_upload
+
+
+def _spool(item: BulkFile, max_bytes: Optional[int]) -> file_storage_service.SpooledFile:
+    with item.open() as stream:
+        return file_storage_service.spool_stream(stream, max_bytes=max_bytes)
+
+
+def _discard_spooled(spool: "asyncio.Future[file_storage_service.SpooledFile]") -> None:
+    if not spool.cancelled() and spool.exception() is None:
+        spool.result().discard()
+
+
+async def _spool_async(item: BulkFile, max_bytes: Optional[int]) -> file_storage_service.SpooledFile:
+    """Spool off the event loop; if the caller is cancelled, the temp file is discarded once the thread finishes."""
+    # Cancelling a to_thread await does not stop the thread, so its result is only dropped, never cleaned up.
+    spool = asyncio.ensure_future(asyncio.to_thread(_spool, item, max_bytes))
+    try:
+        return await asyncio.shield(spool)
+    except asyncio.CancelledError:
+        spool.add_done_callback(_discard_spooled)
+        raise
+
+
+def expand_uploads(uploads: List[UploadFile], *, max_files: int, max_uncompressed_bytes: int) -> List[BulkFile]:
+    """Flatten uploaded files and zip archives into the list of documents to ingest."""
+    files: List[BulkFile] = []
+    for upload in uploads:
+        if _is_zip(upload):
+            files.extend(_zip_members(upload, max_uncompressed_bytes))
+        else:
+            filename = upload.filename or "resume"
+            files.append(
+                BulkFile(
+                    filename=filename,
+                    content_type=upload.content_type or _guess_content_type(filename),
+                    open=_upload_opener(upload),
+                )
+            )
+        if len(files) > max_files:
+            raise BulkUploadTooLargeError(f"Bulk uploads are limited to {max_files} files")
+    if not files:
+        raise BulkUploadError("No files to upload")
+    return files
+
+
+def _failure(index: int, filename: str, code: str, message: str) -> Dict[str, Any]:
+    return {
+        "event": "file",
+        "index": index,
+        "filename": filename,
+        "status": "failed",
+        "error": {"code": code, "message": message},
+    }
+
+
+async def _extract(path: str, item: BulkFile, sha256: str) -> ExtractionResult:
+    for attempt in range(_BUSY_RETRIES):
+        try:
+            return await extract_cached(path, item.content_type, item.filename, sha256=sha256)
+        except ExtractionPoolBusyError:
+            # Other traffic shares the pool; back off briefly rather than failing the file.
+            if attempt == _BUSY_RETRIES - 1:
+                raise
+            await asyncio.sleep(_BUSY_RETRY_DELAY_SECONDS * (attempt + 1))
+    raise AssertionError("unreachable")
+
+
+Prepared = Tuple[int, BulkFile, Dict[str, Any], ExtractionResult]
+
+
+async def _prepare(
+    index: int,
+    item: BulkFile,
+    slots: asyncio.Semaphore,
+    max_file_bytes: Optional[int],
+    owner: str,
+) -> Union[Prepared, Dict[str, Any]]:
+    async with slots:
+        spooled = None
+        try:
+            # Decompression and disk writes are blocking, so spool off the event loop.
+            spooled = await _spool_async(item, max_file_bytes)
+            if not spooled.length:
+                return _failure(index, item.filename, "empty_file", "File is empty")
+            # Extract before storing, so a file that fails extraction never leaves an orphan in GridFS.
+            extraction = await _extract(spooled.path, item, spooled.sha256)
+            file_ref = await file_storage_service.store_spooled(
+                spooled, filename=item.filename, content_type=item.content_type, kind="resume", owner=owner
+            )
+        except file_storage_service.UploadTooLargeError as exc:
+            return _failure(index, item.filename, "file_too_large", str(exc))
+        except DocumentExtractionError as exc:
+            return _failure(index, item.filename, exc.code, str(exc))
+        except ExtractionTimeoutError as exc:
+            return _failure(index, item.filename, "extraction_timeout", str(exc))
+        except ExtractionPoolBusyError as exc:
+            return _failure(index, item.filename, "busy", str(exc))
+        except Exception as exc:  # noqa: BLE001 - one bad file must not abort the batch
+            logger.exception("Bulk upload of %s failed", item.filename)
+            return _failure(index, item.filename, "internal_error", str(exc))
+        finally:
+            if spooled is not None:
+                spooled.discard()
+    return index, item, file_ref, extraction
+
+
+async def _flush(pending: List[Tuple[int, str, Dict[str, Any]]]) -> List[Dict[str, Any]]:
+    try:
+        resume_ids = await resume_service.insert_resumes([document for _, _, document in pending])
+    except Exception as exc:  # noqa: BLE001
+        logger.exception("Bulk insert of %s resumes failed", len(pending))
+        return [_failure(index, filename, "insert_failed", str(exc)) for index, filename, _ in pending]
+
+    return [
+        {
+            "event": "file",
+            "index": index,
+            "filename": filename,
+            "status": "created",
+            "resume_id": resume_id,
+            "extraction": document["extraction"],
+        }
+        for (index, filename, document), resume_id in zip(pending, resume_ids)
+    ]
+
+
+async def bulk_upload_resumes(
+    files: List[BulkFile],
+    *,
+    candidate_id: str,
+    resume_type: str = "general",
+    concurrency: int,
+    batch_size: int,
+    max_file_bytes: Optional[int] = None,
+) -> AsyncIterator[Dict[str, Any]]:
+    """Extract and store ``files`` as resumes, yielding one result per file as it finishes.
+
+    At most ``concurrency`` files are spooled to disk and extracted at once, so memory and the
+    extraction pool see bounded pressure however large the batch is. Files larger than
+    ``max_file_bytes`` fail individually without being read to the end. Successful documents are inserted ``batch_size``
+    at a time with ``insert_many``; their results are yielded after each insert. The final item is
+    a ``summary`` event with the overall counts.
+    """
+    slots = asyncio.Semaphore(max(concurrency, 1))
+    tasks = [asyncio.create_task(_prepare(index, item, slots, max_file_bytes, candidate_id)) for index, item in enumerate(files)]
+    pending: List[Tuple[int, str, Dict[str, Any]]] = []
+    counts = {"created": 0, "failed": 0}
+
+    def record(results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        for result in results:
+            counts[result["status"]] += 1
+        return results
+
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            outcome = await next_done
+            if isinstance(outcome, dict):
+                for result in record([outcome]):
+                    yield result
+                continue
+
+            index, item, file_ref, extraction = outcome
+            document = await resume_service.build_resume_document(
+                candidate_id=candidate_id,
+                name=os.path.splitext(item.filename)[0] or item.filename,
+                extraction=extraction,
+                content_type=item.content_type,
+                original_filename=item.filename,
+                resume_type=resume_type,
+                # Reserved per document, so concurrent uploads for the same candidate never share a version.
+                version=await resume_service.reserve_resume_versions(candidate_id, resume_type),
+                skills=list(extraction.skills),
+                file_ref=file_ref,
+            )
+            pending.append((index, item.filename, document))
+            if len(pending) >= batch_size:
+                for result in record(await _flush(pending)):
+                    yield result
+                pending = []
+
+        for result in record(await _flush(pending)):
+            yield result
+    finally:
+        # Stop outstanding work if the client disconnects mid-stream.
+        for task in tasks:
+            task.cancel()
+
+    yield {"event": "summary", "total": len(files), **counts}
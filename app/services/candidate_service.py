@@ -52,7 +52,7 @@ async def get_candidate_resumes(candidate_id: str) -> List[Dict[str, Any]]:
 
 async def get_resume_health(candidate_id: str) -> Optional[Dict[str, Any]]:
     resume = await db.resumes.find_one(
-        {"candidate_id": candidate_id},
+        {"candidate_id": candidate_id, "is_active": True},
         sort=[("last_updated", -1)],
     )
     if not resume:
@@ -0,0 +1,29 @@
+from app.services.documents.base import (
+    CorruptDocumentError,
+    DocumentExtractionError,
+    DocumentExtractor,
+    DocumentSource,
+    DocumentTooLargeError,
+    ExtractionResult,
+    UnsupportedDocumentError,
+)
+from app.services.documents.extraction import extract_cached, extract_document, extract_in_pool
+from app.services.documents.registry import get_extractor, register_extractor
+from app.services.documents.sections import segment_resume, summarise_resume
+
+__all__ = [
+    "CorruptDocumentError",
+    "DocumentExtractionError",
+    "DocumentExtractor",
+    "DocumentSource",
+    "DocumentTooLargeError",
+    "ExtractionResult",
+    "UnsupportedDocumentError",
+    "extract_cached",
+    "extract_document",
+    "extract_in_pool",
+    "get_extractor",
+    "register_extractor",
+    "segment_resume",
+    "summarise_resume",
+]
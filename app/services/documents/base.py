@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import abc
+import io
+import mmap
+from dataclasses import asdict, dataclass, field
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Tuple, Union
+
+# Document content: raw bytes, or the path of a file on local disk. Paths are preferred for uploads
+# so the payload is neither held on the heap nor pickled into extraction workers.
+DocumentSource = Union[bytes, str]
+
+
+class DocumentExtractionError(RuntimeError):
+    """Base class for extraction failures; ``code`` is a stable machine-readable identifier."""
+
+    code = "extraction_failed"
+
+
+class UnsupportedDocumentError(DocumentExtractionError):
+    """Raised when no extractor can handle the uploaded file type."""
+
+    code = "unsupported_document"
+
+
+class CorruptDocumentError(DocumentExtractionError):
+    """Raised when a document cannot be parsed by its extractor."""
+
+    code = "corrupt_document"
+
+
+class DocumentTooLargeError(DocumentExtractionError):
+    """Raised when parsing a document exhausts the worker's memory budget."""
+
+    code = "document_too_large"
+
+
+def open_binary(source: DocumentSource) -> BinaryIO:
+    """Open ``source`` for random-access reading.
+
+    Files are memory-mapped read-only, so pages are loaded from the OS page cache on demand instead
+    of being copied into the process.
+    """
+    if isinstance(source, bytes):
+        return io.BytesIO(source)
+    with open(source, "rb") as handle:
+        try:
+            return mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)  # type: ignore[return-value]
+        except ValueError:
+            # Empty files cannot be mapped.
+            return io.BytesIO(b"")
+
+
+def read_bytes(source: DocumentSource) -> bytes:
+    if isinstance(source, bytes):
+        return source
+    with open(source, "rb") as handle:
+        return handle.read()
+
+
+@dataclass
+class ExtractionResult:
+    text: str
+    extractor: str
+    page_count: int
+    pages_read: int
+    char_count: int
+    truncated: bool
+    elapsed_ms: float
+    skills: List[str] = field(default_factory=list)
+    cache_hit: bool = False
+
+    def stats(self) -> Dict[str, Any]:
+        """Extraction statistics without the text or derived data, for storing alongside the document."""
+        data = asdict(self)
+        data.pop("text")
+        data.pop("skills")
+        return data
+
+
+class DocumentExtractor(abc.ABC):
+    """Contract for a pluggable text extractor.
+
+    Extractors yield text segments (pages, paragraphs) lazily so the caller can stop as soon as its
+    character budget is spent, and raise :class:`DocumentExtractionError` subclasses on failure.
+    """
+
+    name: str
+    content_types: Tuple[str, ...] = ()
+    extensions: Tuple[str, ...] = ()
+    paginated: bool = False
+
+    def matches(self, content_type: str, filename: str) -> bool:
+        return content_type in self.content_types or filename.lower().endswith(self.extensions)
+
+    @abc.abstractmethod
+    def open(self, source: DocumentSource, *, max_pages: Optional[int] = None) -> Tuple[int, Iterator[str]]:
+        """Return ``(page_count, segments)`` for the document in ``source`` (bytes or a file path).
+
+        ``page_count`` is the total number of pages (or 1 for unpaginated formats); ``segments``
+        yields at most ``max_pages`` pages of text.
+        """
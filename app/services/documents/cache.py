@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import hashlib
+from collections import OrderedDict
+from dataclasses import asdict, replace
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from pymongo import ASCENDING
+
+from app.core.config import settings
+from app.core.database import db
+from app.services.documents.base import DocumentSource, ExtractionResult
+from app.services.skills import taxonomy_version
+
+# Bump when extractor output changes so stale cached text is not served.
+_CACHE_VERSION = 2
+
+_lru: "OrderedDict[str, ExtractionResult]" = OrderedDict()
+_metrics: Dict[str, int] = {"memory_hits": 0, "mongo_hits": 0, "misses": 0}
+
+
+def _collection():
+    return db.extraction_cache
+
+
+def content_hash(source: DocumentSource) -> str:
+    if isinstance(source, bytes):
+        return hashlib.sha256(source).hexdigest()
+    hasher = hashlib.sha256()
+    with open(source, "rb") as handle:
+        while chunk := handle.read(1024 * 1024):
+            hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+def _cache_key(sha256: str) -> str:
+    # Limits are part of the key: a result truncated under a smaller budget must not be reused.
+    # So is the skill taxonomy version, since cached results carry the matched skills.
+    return (
+        f"{sha256}:v{_CACHE_VERSION}:t{taxonomy_version()}"
+        f":p{settings.EXTRACTION_MAX_PAGES}:c{settings.EXTRACTION_MAX_CHARS}"
+    )
+
+
+def _remember(key: str, result: ExtractionResult) -> None:
+    _lru[key] = result
+    _lru.move_to_end(key)
+    while len(_lru) > settings.EXTRACTION_CACHE_LRU_SIZE:
+        _lru.popitem(last=False)
+
+
+async def ensure_indexes() -> None:
+    await _collection().create_index(
+        [("last_used_at", ASCENDING)],
+        expireAfterSeconds=settings.EXTRACTION_CACHE_TTL_DAYS * 24 * 3600,
+    )
+
+
+async def get(sha256: str) -> Optional[ExtractionResult]:
+    """Return the cached extraction for content ``sha256``, checking the in-process LRU first."""
+    key = _cache_key(sha256)
+    cached = _lru.get(key)
+    if cached is not None:
+        _lru.move_to_end(key)
+        _metrics["memory_hits"] += 1
+        return replace(cached, cache_hit=True)
+
+    document = await _collection().find_one_and_update(
+        {"_id": key},
+        {"$set": {"last_used_at": datetime.utcnow()}, "$inc": {"hits": 1}},
+    )
+    if not document:
+        _metrics["misses"] += 1
+        return None
+
+    result = ExtractionResult(**document["result"])
+    _remember(key, result)
+    _metrics["mongo_hits"] += 1
+    return replace(result, cache_hit=True)
+
+
+async def put(sha256: str, result: ExtractionResult) -> None:
+    key = _cache_key(sha256)
+    _remember(key, result)
+    now = datetime.utcnow()
+    await _collection().update_one(
+        {"_id": key},
+        {
+            "$set": {"sha256": sha256, "result": asdict(result), "last_used_at": now},
+            "$setOnInsert": {"created_at": now, "hits": 0},
+        },
+        upsert=True,
+    )
+
+
+def get_metrics() -> Dict[str, Any]:
+    hits = _metrics["memory_hits"] + _metrics["mongo_hits"]
+    lookups = hits + _metrics["misses"]
+    return {
+        **_metrics,
+        "lru_size": len(_lru),
+        "hit_rate": round(hits / lookups, 3) if lookups else 0.0,
+    }
@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import logging
+import time
+from typing import List, Optional
+
+from app.core.config import settings
+from app.services import extraction_pool
+from app.services.documents import cache
+from app.services.documents.base import DocumentSource, DocumentTooLargeError, ExtractionResult
+from app.services.documents.registry import get_extractor
+from app.services.skills import extract_skills
+
+logger = logging.getLogger(__name__)
+
+
+def extract_document(
+    source: DocumentSource,
+    content_type: str,
+    filename: str,
+    max_pages: Optional[int] = None,
+    max_chars: Optional[int] = None,
+) -> ExtractionResult:
+    """Extract text from ``source``, stopping once ``max_pages`` or ``max_chars`` is reached.
+
+    Segments are collected and joined once at the end, then scanned for taxonomy skills. Runs inside extraction pool workers, so it
+    must remain a module-level function with picklable arguments; pass a file path rather than bytes
+    for large documents so the payload is not copied into the worker.
+    """
+    started = time.perf_counter()
+    extractor = get_extractor(content_type or "", filename or "")
+
+    parts: List[str] = []
+    budget = max_chars if max_chars is not None else -1
+    used = 0
+    pages_read = 0
+    truncated = False
+    try:
+        page_count, segments = extractor.open(source, max_pages=max_pages)
+        for segment in segments:
+            pages_read += 1
+            if budget >= 0 and used + len(segment) > budget:
+                parts.append(segment[: max(budget - used, 0)])
+                truncated = True
+                break
+            parts.append(segment)
+            used += len(segment) + 1
+    except MemoryError as exc:
+        raise DocumentTooLargeError("Document exceeded the extraction memory limit") from exc
+
+    if max_pages is not None and page_count > max_pages:
+        truncated = True
+
+    text = "\n".join(parts).strip()
+    # Skill matching is CPU-bound too, so it runs here in the worker alongside parsing.
+    skills = extract_skills(text)
+    return ExtractionResult(
+        text=text,
+        extractor=extractor.name,
+        page_count=page_count,
+        pages_read=pages_read if extractor.paginated else page_count,
+        char_count=len(text),
+        truncated=truncated,
+        elapsed_ms=round((time.perf_counter() - started) * 1000, 2),
+        skills=skills,
+    )
+
+
+async def extract_in_pool(source: DocumentSource, content_type: str, filename: str) -> ExtractionResult:
+    """Run :func:`extract_document` in the extraction process pool with the configured limits."""
+    result = await extraction_pool.run(
+        extract_document,
+        source,
+        content_type,
+        filename,
+        settings.EXTRACTION_MAX_PAGES,
+        settings.EXTRACTION_MAX_CHARS,
+    )
+    logger.info(
+        "Extracted %s (%s): %s chars from %s/%s pages in %.1fms%s",
+        filename,
+        result.extractor,
+        result.char_count,
+        result.pages_read,
+        result.page_count,
+        result.elapsed_ms,
+        " (truncated)" if result.truncated else "",
+    )
+    return result
+
+
+async def extract_cached(
+    source: DocumentSource,
+    content_type: str,
+    filename: str,
+    *,
+    sha256: Optional[str] = None,
+) -> ExtractionResult:
+    """Return the extraction for ``source``, reusing a cached result for identical content.
+
+    ``sha256`` may be passed when the caller already hashed the upload (e.g. while storing it).
+    """
+    digest = sha256 or cache.content_hash(source)
+    cached = await cache.get(digest)
+    if cached is not None:
+        logger.info("Extraction cache hit for %s (%s)", filename, digest[:12])
+        return cached
+
+    result = await extract_in_pool(source, content_type, filename)
+    await cache.put(digest, result)
+    return result
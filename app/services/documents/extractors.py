@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import io
+from typing import Iterator, Optional, Tuple
+
+import docx
+from PyPDF2 import PdfReader
+
+from app.services.documents.base import (
+    CorruptDocumentError,
+    DocumentExtractor,
+    DocumentSource,
+    UnsupportedDocumentError,
+    open_binary,
+    read_bytes,
+)
+
+
+class PdfExtractor(DocumentExtractor):
+    name = "pdf"
+    content_types = ("application/pdf",)
+    extensions = (".pdf",)
+    paginated = True
+
+    def open(self, source: DocumentSource, *, max_pages: Optional[int] = None) -> Tuple[int, Iterator[str]]:
+        stream = open_binary(source)
+        try:
+            reader = PdfReader(stream)
+            page_count = len(reader.pages)
+        except Exception as exc:
+            stream.close()
+            raise CorruptDocumentError(f"Unable to read PDF: {exc}") from exc
+
+        def _pages() -> Iterator[str]:
+            limit = page_count if max_pages is None else min(page_count, max_pages)
+            try:
+                for index in range(limit):
+                    try:
+                        yield reader.pages[index].extract_text() or ""
+                    except Exception as exc:
+                        raise CorruptDocumentError(f"Unable to read PDF page {index + 1}: {exc}") from exc
+            finally:
+                stream.close()
+
+        return page_count, _pages()
+
+
+class DocxExtractor(DocumentExtractor):
+    name = "docx"
+    content_types = ("application/vnd.openxmlformats-officedocument.wordprocessingml.document",)
+    extensions = (".docx",)
+
+    def open(self, source: DocumentSource, *, max_pages: Optional[int] = None) -> Tuple[int, Iterator[str]]:
+        try:
+            # python-docx opens paths itself (it needs a seekable zip stream, which mmap is not).
+            document = docx.Document(source if isinstance(source, str) else io.BytesIO(source))
+        except Exception as exc:
+            raise CorruptDocumentError(f"Unable to read DOCX: {exc}") from exc
+
+        # DOCX has no fixed pagination; paragraphs are streamed and the whole file counts as one page.
+        return 1, (paragraph.text for paragraph in document.paragraphs)
+
+
+class TextExtractor(DocumentExtractor):
+    name = "text"
+    content_types = ("text/plain", "text/markdown")
+    extensions = (".txt", ".md")
+
+    def open(self, source: DocumentSource, *, max_pages: Optional[int] = None) -> Tuple[int, Iterator[str]]:
+        try:
+            text = read_bytes(source).decode("utf-8")
+        except UnicodeDecodeError as exc:
+            raise UnsupportedDocumentError("Unsupported file type; upload a PDF, DOCX or UTF-8 text file") from exc
+        return 1, iter(text.splitlines())
@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+from typing import List
+
+from app.services.documents.base import DocumentExtractor
+from app.services.documents.extractors import DocxExtractor, PdfExtractor, TextExtractor
+
+_EXTRACTORS: List[DocumentExtractor] = [PdfExtractor(), DocxExtractor(), TextExtractor()]
+# Unknown types are attempted as UTF-8 text; the text extractor raises if that fails.
+_FALLBACK = TextExtractor()
+
+
+def register_extractor(extractor: DocumentExtractor) -> None:
+    """Register an extractor; later registrations take precedence over earlier ones.
+
+    Extractors run inside extraction pool workers, so register them at import time of a module the
+    workers also import (e.g. this package) rather than at request time.
+    """
+    _EXTRACTORS.insert(0, extractor)
+
+
+def get_extractor(content_type: str, filename: str) -> DocumentExtractor:
+    for extractor in _EXTRACTORS:
+        if extractor.matches(content_type, filename):
+            return extractor
+    return _FALLBACK
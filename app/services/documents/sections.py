@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import re
+from typing import Any, Dict, List, Optional
+
+# Canonical section -> headings that introduce it (compared lowercased, without trailing colons).
+SECTION_HEADINGS: Dict[str, tuple] = {
+    "summary": (
+        "summary",
+        "professional summary",
+        "career summary",
+        "profile",
+        "professional profile",
+        "about me",
+        "objective",
+        "career objective",
+        "overview",
+    ),
+    "experience": (
+        "experience",
+        "work experience",
+        "professional experience",
+        "relevant experience",
+        "employment",
+        "employment history",
+        "work history",
+        "career history",
+    ),
+    "skills": (
+        "skills",
+        "technical skills",
+        "key skills",
+        "core skills",
+        "skills and tools",
+        "core competencies",
+        "competencies",
+        "technologies",
+        "tech stack",
+    ),
+    "education": (
+        "education",
+        "education and training",
+        "academic background",
+        "qualifications",
+        "academic qualifications",
+    ),
+    "certifications": ("certifications", "certificates", "licenses and certifications"),
+    "projects": ("projects", "key projects", "selected projects", "personal projects"),
+}
+
+# Sections included in the digest, in the order they are sent to the LLM. The summary is covered by
+# the preview, and the header (name, contact details) is deliberately left out.
+DIGEST_SECTIONS = ("experience", "skills", "education", "certifications", "projects")
+
+_HEADING_LOOKUP = {heading: section for section, headings in SECTION_HEADINGS.items() for heading in headings}
+_MAX_HEADING_LENGTH = 40
+_BULLET_RE = re.compile(r"^[\s\-\*•▪●–‣◦>]+")
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def _heading_section(line: str) -> Optional[str]:
+    candidate = line.strip().strip(":").strip()
+    if not candidate or len(candidate) > _MAX_HEADING_LENGTH:
+        return None
+    key = _WHITESPACE_RE.sub(" ", candidate.lower().replace("&", "and"))
+    return _HEADING_LOOKUP.get(key)
+
+
+def segment_resume(text: str) -> Dict[str, str]:
+    """Split resume text into canonical sections keyed by name.
+
+    Text before the first recognised heading is returned as ``header``. Repeated headings (e.g. two
+    experience blocks) are concatenated.
+    """
+    sections: Dict[str, List[str]] = {}
+    current = "header"
+    for line in text.splitlines():
+        section = _heading_section(line)
+        if section:
+            current = section
+            sections.setdefault(current, [])
+            continue
+        sections.setdefault(current, []).append(line)
+    return {name: "\n".join(lines).strip() for name, lines in sections.items() if any(line.strip() for line in lines)}
+
+
+def compact(text: str) -> str:
+    """Collapse whitespace and bullets into ``; ``-separated lines."""
+    lines = (_WHITESPACE_RE.sub(" ", _BULLET_RE.sub("", line)).strip() for line in text.splitlines())
+    return "; ".join(line for line in lines if line)
+
+
+def truncate(text: str, limit: int) -> str:
+    if len(text) <= limit:
+        return text
+    cut = text.rfind(" ", 0, limit)
+    return text[: cut if cut > limit // 2 else limit].rstrip(" ;,") + "…"
+
+
+def summarise_resume(text: str, *, preview_chars: int, section_chars: int) -> Dict[str, Any]:
+    """Return a bounded ``preview`` and per-section ``sections`` digest for resume ``text``."""
+    sections = segment_resume(text or "")
+    preview_source = sections.get("summary") or sections.get("experience") or text or ""
+    return {
+        "preview": truncate(compact(preview_source), preview_chars),
+        "sections": {
+            name: truncate(compact(sections[name]), section_chars) for name in DIGEST_SECTIONS if name in sections
+        },
+    }
@@ -0,0 +1,207 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, List, Optional, TypeVar
+
+from app.core.config import settings
+
+try:  # pragma: no cover - resource is unavailable on Windows
+    import resource
+except ImportError:  # pragma: no cover
+    resource = None  # type: ignore[assignment]
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class ExtractionPoolBusyError(RuntimeError):
+    """Raised when the extraction queue is full and the job is rejected."""
+
+
+class ExtractionTimeoutError(RuntimeError):
+    """Raised when an extraction job exceeds its time budget."""
+
+
+class ExtractionWorkerCrashedError(RuntimeError):
+    """Raised when a job's worker process died (OOM kill, segfault) on both attempts."""
+
+
+def _limit_worker_memory(limit_mb: int) -> None:
+    """Process initializer capping each worker's address space."""
+    if resource is None or limit_mb <= 0:
+        return
+    limit_bytes = limit_mb * 1024 * 1024
+    resource.setrlimit(resource.RLIMIT_AS, (limit_bytes, limit_bytes))
+
+
+class ExtractionPool:
+    """Bounded process pool for CPU-bound document parsing.
+
+    At most ``max_workers`` jobs run at once and at most ``max_queue`` more wait for a worker;
+    further submissions are rejected instead of piling up behind a slow parse.
+
+    A job that exceeds its timeout has its worker processes killed and the executor replaced, so a
+    stuck parse never holds a worker past its budget. A dead worker breaks the whole executor, so the
+    executor is also replaced when that happens; jobs caught up in a breakage they did not cause are
+    retried once on the fresh executor.
+    """
+
+    def __init__(self, *, max_workers: int, max_queue: int, timeout: float, memory_limit_mb: int) -> None:
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.timeout = timeout
+        self.memory_limit_mb = memory_limit_mb
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._metrics: Dict[str, float] = {
+            "queued": 0,
+            "running": 0,
+            "peak_queued": 0,
+            "completed": 0,
+            "failed": 0,
+            "timed_out": 0,
+            "rejected": 0,
+            "retried": 0,
+            "recycled": 0,
+            "total_wait_ms": 0.0,
+            "total_run_ms": 0.0,
+        }
+
+    def _ensure_started(self) -> None:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                initializer=_limit_worker_memory,
+                initargs=(self.memory_limit_mb,),
+            )
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_workers)
+
+    async def run(self, func: Callable[..., T], *args: Any, timeout: Optional[float] = None) -> T:
+        """Run ``func(*args)`` in a worker process and return its result.
+
+        ``func`` and its arguments must be picklable (module-level functions and plain data).
+        """
+        self._ensure_started()
+        assert self._executor is not None and self._slots is not None
+
+        if self._slots.locked() and self._metrics["queued"] >= self.max_queue:
+            self._metrics["rejected"] += 1
+            raise ExtractionPoolBusyError("Document extraction queue is full; retry shortly")
+
+        self._metrics["queued"] += 1
+        self._metrics["peak_queued"] = max(self._metrics["peak_queued"], self._metrics["queued"])
+        enqueued_at = time.perf_counter()
+        try:
+            await self._slots.acquire()
+        finally:
+            self._metrics["queued"] -= 1
+
+        started_at = time.perf_counter()
+        self._metrics["total_wait_ms"] += (started_at - enqueued_at) * 1000
+        self._metrics["running"] += 1
+        try:
+            result = await self._execute(func, args, timeout or self.timeout)
+        except asyncio.TimeoutError as exc:
+            self._metrics["timed_out"] += 1
+            logger.warning("Extraction job %s timed out after %.1fs", getattr(func, "__name__", func), timeout or self.timeout)
+            raise ExtractionTimeoutError("Document extraction timed out") from exc
+        except Exception:
+            self._metrics["failed"] += 1
+            raise
+        finally:
+            self._metrics["running"] -= 1
+            self._metrics["total_run_ms"] += (time.perf_counter() - started_at) * 1000
+            self._slots.release()
+
+        self._metrics["completed"] += 1
+        return result
+
+    async def _execute(self, func: Callable[..., T], args: tuple, timeout: float) -> T:
+        loop = asyncio.get_running_loop()
+        for attempt in range(2):
+            self._ensure_started()
+            executor = self._executor
+            assert executor is not None
+            try:
+                return await asyncio.wait_for(loop.run_in_executor(executor, func, *args), timeout=timeout)
+            except asyncio.TimeoutError:
+                self._recycle(executor, kill=True)
+                raise
+            except BrokenProcessPool as exc:
+                self._recycle(executor, kill=False)
+                if attempt:
+                    raise ExtractionWorkerCrashedError("Document extraction worker crashed") from exc
+                self._metrics["retried"] += 1
+                logger.warning("Extraction worker died; retrying %s on a fresh pool", getattr(func, "__name__", func))
+        raise AssertionError("unreachable")
+
+    def _recycle(self, executor: ProcessPoolExecutor, *, kill: bool) -> None:
+        """Replace ``executor`` if it is still the current one.
+
+        Every job running on a broken executor fails together, so only the first one to get here swaps it;
+        nothing awaits between the check and the swap, which makes this atomic on the event loop.
+        """
+        if self._executor is not executor:
+            return
+        self._executor = None
+        if kill:
+            for process in list((getattr(executor, "_processes", None) or {}).values()):
+                process.kill()
+        executor.shutdown(wait=False, cancel_futures=True)
+        self._metrics["recycled"] += 1
+
+    def metrics(self) -> Dict[str, Any]:
+        finished = self._metrics["completed"] + self._metrics["failed"] + self._metrics["timed_out"]
+        started = finished + self._metrics["running"]
+        return {
+            "workers": self.max_workers,
+            "max_queue": self.max_queue,
+            "queue_depth": int(self._metrics["queued"]),
+            "peak_queue_depth": int(self._metrics["peak_queued"]),
+            "running": int(self._metrics["running"]),
+            "completed": int(self._metrics["completed"]),
+            "failed": int(self._metrics["failed"]),
+            "timed_out": int(self._metrics["timed_out"]),
+            "rejected": int(self._metrics["rejected"]),
+            "retried": int(self._metrics["retried"]),
+            "recycled": int(self._metrics["recycled"]),
+            "avg_wait_ms": round(self._metrics["total_wait_ms"] / started, 2) if started else 0.0,
+            "avg_run_ms": round(self._metrics["total_run_ms"] / finished, 2) if finished else 0.0,
+        }
+
+    def worker_pids(self) -> List[int]:
+        """PIDs of the live worker processes (e.g. for per-worker memory sampling)."""
+        processes = getattr(self._executor, "_processes", None) or {}
+        return list(processes)
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+        self._slots = None
+
+
+_pool = ExtractionPool(
+    max_workers=settings.EXTRACTION_POOL_WORKERS,
+    max_queue=settings.EXTRACTION_MAX_QUEUE,
+    timeout=settings.EXTRACTION_TIMEOUT_SECONDS,
+    memory_limit_mb=settings.EXTRACTION_MEMORY_LIMIT_MB,
+)
+
+
+async def run(func: Callable[..., T], *args: Any, timeout: Optional[float] = None) -> T:
+    return await _pool.run(func, *args, timeout=timeout)
+
+
+def get_metrics() -> Dict[str, Any]:
+    return _pool.metrics()
+
+
+def shutdown() -> None:
+    _pool.shutdown()
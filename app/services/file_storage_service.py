@@ -0,0 +1,263 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import os
+import tempfile
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, AsyncIterator, BinaryIO, Dict, Optional
+
+from bson import ObjectId
+from fastapi import UploadFile
+from gridfs.errors import FileExists, NoFile
+from motor.motor_asyncio import AsyncIOMotorGridFSBucket
+from pymongo import ReturnDocument
+
+from app.core.config import settings
+from app.core.database import db
+
+_BUCKET_NAME = "uploads"
+_CHUNK_SIZE = 255 * 1024  # GridFS default chunk size; also used as the read size for uploads
+SHA256_INDEX = "metadata_sha256_unique"
+
+
+class UploadTooLargeError(ValueError):
+    """Raised as soon as an upload grows past the configured size limit."""
+
+
+@dataclass
+class SpooledFile:
+    """A file copied to local disk, with its hash and size computed during the copy."""
+
+    path: str
+    sha256: str
+    length: int
+
+    def discard(self) -> None:
+        try:
+            os.unlink(self.path)
+        except FileNotFoundError:
+            pass
+
+
+def _too_large(max_bytes: int) -> UploadTooLargeError:
+    return UploadTooLargeError(f"File exceeds the {max_bytes // (1024 * 1024)} MB upload limit")
+
+
+def _bucket() -> AsyncIOMotorGridFSBucket:
+    return AsyncIOMotorGridFSBucket(db, bucket_name=_BUCKET_NAME, chunk_size_bytes=_CHUNK_SIZE)
+
+
+def _files_collection():
+    return db[f"{_BUCKET_NAME}.files"]
+
+
+def _serialise_file(document: Dict[str, Any]) -> Dict[str, Any]:
+    metadata = document.get("metadata") or {}
+    return {
+        "file_id": str(document["_id"]),
+        # Duplicates merged by migration 5 keep their hash as content_sha256 (the unique index allows one sha256).
+        "sha256": metadata.get("sha256") or metadata.get("content_sha256"),
+        "length": document.get("length", 0),
+        "content_type": metadata.get("content_type"),
+        "filename": document.get("filename"),
+    }
+
+
+async def ensure_indexes() -> None:
+    """Create the unique content-hash index that deduplicates uploads.
+
+    Databases that still have the old non-unique index (and possibly duplicates) get it from migration 5.
+    """
+    if "metadata.sha256_1" in await _files_collection().index_information():
+        return
+    await _files_collection().create_index("metadata.sha256", unique=True, name=SHA256_INDEX)
+
+
+def can_access(stored: Dict[str, Any], user: Dict[str, Any]) -> bool:
+    """Admins, anyone who uploaded the file, and members of an uploader's org may read it."""
+    if "admin" in (user.get("roles") or []):
+        return True
+    if user.get("sub") and user["sub"] in stored["owners"]:
+        return True
+    return bool(user.get("org_id")) and user["org_id"] in stored["org_ids"]
+
+
+def _grant(owner: Optional[str], org_id: Optional[str]) -> Dict[str, Any]:
+    return {
+        "$addToSet": {
+            "metadata.owners": {"$each": [owner] if owner else []},
+            "metadata.org_ids": {"$each": [org_id] if org_id else []},
+        }
+    }
+
+
+async def _existing(digest: str, owner: Optional[str], org_id: Optional[str]) -> Optional[Dict[str, Any]]:
+    """The stored file with this content, with the new uploader added to its owners."""
+    return await _files_collection().find_one_and_update(
+        {"metadata.sha256": digest}, _grant(owner, org_id), return_document=ReturnDocument.AFTER
+    )
+
+
+async def _lost_race(file_id: Any, digest: str, owner: Optional[str], org_id: Optional[str]) -> Dict[str, Any]:
+    """A concurrent upload stored the same content first: drop our orphaned chunks and use theirs."""
+    try:
+        await _bucket().delete(file_id)
+    except NoFile:
+        pass  # our files document was never inserted; delete() still removed the chunks
+    document = await _existing(digest, owner, org_id)
+    assert document is not None
+    return _serialise_file(document)
+
+
+def _metadata(digest: str, content_type: str, kind: str, owner: Optional[str], org_id: Optional[str]) -> Dict[str, Any]:
+    return {
+        "sha256": digest,
+        "content_type": content_type,
+        "kind": kind,
+        "owners": [owner] if owner else [],
+        "org_ids": [org_id] if org_id else [],
+        "stored_at": datetime.utcnow(),
+    }
+
+
+async def store_upload(
+    upload: UploadFile,
+    *,
+    kind: str,
+    owner: Optional[str] = None,
+    org_id: Optional[str] = None,
+    max_bytes: Optional[int] = None,
+) -> Dict[str, Any]:
+    """Stream an uploaded file into GridFS, storing identical content only once.
+
+    The upload goes through the same path as bulk files: :func:`spool_stream` copies it to
+    ``UPLOAD_SPOOL_DIR`` and hashes it in one pass (rejecting it as soon as it passes ``max_bytes``,
+    which defaults to ``UPLOAD_MAX_FILE_MB``), then :func:`store_spooled` stores new content.
+    ``owner`` and ``org_id`` are added to the file's readers (see :func:`can_access`), also when the
+    content was already stored. Returns a small file reference suitable for embedding in documents.
+    """
+    await upload.seek(0)
+    spooled = await asyncio.to_thread(spool_stream, upload.file, max_bytes=max_bytes)
+    try:
+        return await store_spooled(
+            spooled,
+            filename=upload.filename or spooled.sha256,
+            content_type=upload.content_type or "application/octet-stream",
+            kind=kind,
+            owner=owner,
+            org_id=org_id,
+        )
+    finally:
+        await asyncio.to_thread(spooled.discard)
+        await upload.seek(0)
+
+
+async def store_spooled(
+    spooled: SpooledFile,
+    *,
+    filename: str,
+    content_type: str,
+    kind: str,
+    owner: Optional[str] = None,
+    org_id: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Store a file spooled with :func:`spool_stream`, deduplicated like ``store_upload``.
+
+    The spooled file is read in chunks on a worker thread, so disk reads never block the event loop.
+    """
+    existing = await _existing(spooled.sha256, owner, org_id)
+    if existing:
+        return _serialise_file(existing)
+
+    metadata = _metadata(spooled.sha256, content_type or "application/octet-stream", kind, owner, org_id)
+    grid_in = _bucket().open_upload_stream(filename or spooled.sha256, metadata=metadata)
+    source = await asyncio.to_thread(open, spooled.path, "rb")
+    try:
+        while chunk := await asyncio.to_thread(source.read, _CHUNK_SIZE):
+            await grid_in.write(chunk)
+    except BaseException:
+        await grid_in.abort()
+        raise
+    finally:
+        await asyncio.to_thread(source.close)
+    try:
+        await grid_in.close()
+    except FileExists:  # the unique hash index rejected our files document
+        return await _lost_race(grid_in._id, spooled.sha256, owner, org_id)
+    document = await _files_collection().find_one({"_id": grid_in._id})
+    return _serialise_file(document)
+
+
+def spool_stream(stream: BinaryIO, *, max_bytes: Optional[int] = None) -> SpooledFile:
+    """Copy ``stream`` to a temporary file in ``UPLOAD_SPOOL_DIR``, hashing it on the way.
+
+    Blocking; call it through ``asyncio.to_thread``. The copy stops with :class:`UploadTooLargeError`
+    as soon as it passes ``max_bytes``. Callers must ``discard()`` the result when done.
+    """
+    max_bytes = max_bytes or settings.UPLOAD_MAX_FILE_MB * 1024 * 1024
+    hasher = hashlib.sha256()
+    length = 0
+    with tempfile.NamedTemporaryFile(dir=settings.UPLOAD_SPOOL_DIR, prefix="upload-", delete=False) as target:
+        spooled = SpooledFile(path=target.name, sha256="", length=0)
+        try:
+            while chunk := stream.read(_CHUNK_SIZE):
+                length += len(chunk)
+                if length > max_bytes:
+                    raise _too_large(max_bytes)
+                hasher.update(chunk)
+                target.write(chunk)
+        except BaseException:
+            spooled.discard()
+            raise
+    spooled.sha256 = hasher.hexdigest()
+    spooled.length = length
+    return spooled
+
+
+async def download_to_disk(file_id: str) -> SpooledFile:
+    """Copy a stored file to a local temporary file, e.g. so extraction workers can open it by path."""
+    hasher = hashlib.sha256()
+    length = 0
+    with tempfile.NamedTemporaryFile(dir=settings.UPLOAD_SPOOL_DIR, prefix="stored-", delete=False) as target:
+        spooled = SpooledFile(path=target.name, sha256="", length=0)
+        try:
+            async for chunk in iter_file(file_id):
+                length += len(chunk)
+                hasher.update(chunk)
+                target.write(chunk)
+        except BaseException:
+            spooled.discard()
+            raise
+    spooled.sha256 = hasher.hexdigest()
+    spooled.length = length
+    return spooled
+
+
+async def get_file(file_id: str) -> Optional[Dict[str, Any]]:
+    """Return the stored file reference for ``file_id`` or ``None`` if it does not exist."""
+    try:
+        object_id = ObjectId(file_id)
+    except Exception:
+        return None
+
+    document = await _files_collection().find_one({"_id": object_id})
+    if not document:
+        return None
+    metadata = document.get("metadata") or {}
+    return {**_serialise_file(document), "owners": metadata.get("owners", []), "org_ids": metadata.get("org_ids", [])}
+
+
+async def iter_file(file_id: str, start: int = 0, end: Optional[int] = None) -> AsyncIterator[bytes]:
+    """Yield the bytes of a stored file between ``start`` and ``end`` (inclusive) chunk by chunk."""
+    grid_out = await _bucket().open_download_stream(ObjectId(file_id))
+    last = grid_out.length - 1 if end is None else min(end, grid_out.length - 1)
+    grid_out.seek(start)
+    remaining = last - start + 1
+    while remaining > 0:
+        chunk = await grid_out.read(min(_CHUNK_SIZE, remaining))
+        if not chunk:
+            break
+        remaining -= len(chunk)
+        yield chunk
@@ -0,0 +1,348 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+from bson import ObjectId
+
+from app.core.database import db
+from app.services import file_storage_service, job_service, resume_service
+from app.services.documents import DocumentExtractionError, ExtractionResult, extract_in_pool
+from app.services.documents import cache as extraction_cache
+from app.services.extraction_pool import ExtractionPoolBusyError, ExtractionTimeoutError
+from app.services.skills import merge_skills
+
+logger = logging.getLogger(__name__)
+
+INGESTION_KINDS = {"resume", "job_description"}
+TERMINAL_STATUSES = {"completed", "failed"}
+
+_BUSY_RETRY_DELAY_SECONDS = 2.0
+# A claimed ingestion whose worker has not updated it for this long is considered abandoned (crashed task, dead
+# instance) and may be claimed again. Every stage change renews the lease.
+_PROCESSING_LEASE = timedelta(minutes=10)
+_LEASE_CHECK_SECONDS = 60.0
+
+_queue: Optional[asyncio.Queue] = None
+_workers: List[asyncio.Task] = []
+_updates: Dict[str, "_Watch"] = {}
+
+
+class _Watch:
+    """Wakes every caller waiting on one ingestion; it exists only while someone is waiting."""
+
+    def __init__(self) -> None:
+        self.event = asyncio.Event()
+        self.waiters = 0
+
+
+def _collection():
+    return db.ingestions
+
+
+def _serialise_ingestion(document: Dict[str, Any]) -> Dict[str, Any]:
+    ingestion = {
+        "id": str(document["_id"]),
+        "kind": document.get("kind"),
+        "status": document.get("status"),
+        "stage": document.get("stage"),
+        "filename": (document.get("params") or {}).get("filename"),
+        "result": document.get("result"),
+        "error": document.get("error"),
+        "timings_ms": document.get("timings_ms", {}),
+    }
+    for field in ("created_at", "updated_at", "completed_at"):
+        value = document.get(field)
+        ingestion[field] = value.isoformat() if isinstance(value, datetime) else value
+    return ingestion
+
+
+async def create_ingestion(
+    *,
+    kind: str,
+    file_ref: Dict[str, Any],
+    params: Dict[str, Any],
+    owner: Optional[str] = None,
+    org_id: Optional[str] = None,
+) -> str:
+    """Record a stored upload for background processing and enqueue it.
+
+    ``owner`` and ``org_id`` decide who may read the ingestion (see :func:`can_access`).
+    """
+    if kind not in INGESTION_KINDS:
+        raise ValueError(f"Unsupported ingestion kind '{kind}'")
+
+    now = datetime.utcnow()
+    result = await _collection().insert_one(
+        {
+            "kind": kind,
+            "status": "queued",
+            "stage": "stored",
+            "file": file_ref,
+            "params": params,
+            "owner": owner,
+            "org_id": org_id,
+            "timings_ms": {},
+            "created_at": now,
+            "updated_at": now,
+        }
+    )
+    ingestion_id = str(result.inserted_id)
+    _enqueue(ingestion_id)
+    return ingestion_id
+
+
+async def _find(ingestion_id: str) -> Optional[Dict[str, Any]]:
+    try:
+        object_id = ObjectId(ingestion_id)
+    except Exception:
+        return None
+    return await _collection().find_one({"_id": object_id})
+
+
+async def get_ingestion(ingestion_id: str) -> Optional[Dict[str, Any]]:
+    document = await _find(ingestion_id)
+    return _serialise_ingestion(document) if document else None
+
+
+def can_access(document: Dict[str, Any], user: Dict[str, Any]) -> bool:
+    """Admins, the uploader and members of the uploader's org may read an ingestion and its results."""
+    if "admin" in (user.get("roles") or []):
+        return True
+    if user.get("sub") and user["sub"] == document.get("owner"):
+        return True
+    return bool(user.get("org_id")) and user["org_id"] == document.get("org_id")
+
+
+async def get_ingestion_for(ingestion_id: str, user: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """The ingestion if ``user`` may read it, otherwise ``None`` (as if it did not exist)."""
+    document = await _find(ingestion_id)
+    if not document or not can_access(document, user):
+        return None
+    return _serialise_ingestion(document)
+
+
+async def wait_for_update(ingestion_id: str, timeout: float) -> None:
+    """Wait until this process updates the ingestion, or ``timeout`` elapses.
+
+    Ingestions processed by another instance are not signalled; callers re-read the status after
+    each wait, so they fall back to polling at ``timeout`` intervals.
+    """
+    watch = _updates.get(ingestion_id)
+    if watch is None:
+        watch = _updates[ingestion_id] = _Watch()
+    watch.waiters += 1
+    try:
+        await asyncio.wait_for(watch.event.wait(), timeout=timeout)
+    except asyncio.TimeoutError:
+        pass
+    finally:
+        watch.waiters -= 1
+        # Unknown ids and ingestions finished by another instance must not leave an entry behind.
+        if watch.waiters == 0 and _updates.get(ingestion_id) is watch:
+            del _updates[ingestion_id]
+
+
+async def _update(ingestion_id: str, updates: Dict[str, Any]) -> None:
+    updates["updated_at"] = datetime.utcnow()
+    await _collection().update_one({"_id": ObjectId(ingestion_id)}, {"$set": updates})
+    # Current waiters wake up and re-read the status; later waits get a fresh watch.
+    watch = _updates.pop(ingestion_id, None)
+    if watch is not None:
+        watch.event.set()
+
+
+def _enqueue(ingestion_id: str) -> None:
+    if _queue is None:
+        logger.warning("Ingestion workers are not running; %s stays queued until the next startup", ingestion_id)
+        return
+    _queue.put_nowait(ingestion_id)
+
+
+def _lease_expired(now: datetime) -> Dict[str, Any]:
+    return {"status": "processing", "updated_at": {"$lt": now - _PROCESSING_LEASE}}
+
+
+async def start_workers(count: int) -> None:
+    """Start ``count`` background workers and requeue ingestions left unfinished by a previous run."""
+    global _queue
+    if _queue is not None:
+        return
+    _queue = asyncio.Queue()
+    _workers.extend(asyncio.create_task(_worker(index)) for index in range(count))
+    _workers.append(asyncio.create_task(_reclaim_expired()))
+
+    claimable = {"$or": [{"status": "queued"}, _lease_expired(datetime.utcnow())]}
+    async for document in _collection().find(claimable, {"_id": 1}).sort("created_at", 1):
+        _queue.put_nowait(str(document["_id"]))
+
+
+async def _reclaim_expired() -> None:
+    """Requeue ingestions whose lease ran out while this process keeps running, e.g. after a worker died.
+
+    Ingestions left queued for a whole lease (their instance went away before claiming them) are picked up too.
+    """
+    while True:
+        await asyncio.sleep(_LEASE_CHECK_SECONDS)
+        now = datetime.utcnow()
+        stale = {"$or": [_lease_expired(now), {"status": "queued", "updated_at": {"$lt": now - _PROCESSING_LEASE}}]}
+        try:
+            async for document in _collection().find(stale, {"_id": 1}).sort("created_at", 1):
+                _enqueue(str(document["_id"]))
+        except Exception:  # noqa: BLE001 - try again on the next check
+            logger.exception("Reclaiming expired ingestions failed")
+
+
+async def stop_workers() -> None:
+    global _queue
+    for worker in _workers:
+        worker.cancel()
+    await asyncio.gather(*_workers, return_exceptions=True)
+    _workers.clear()
+    _queue = None
+
+
+async def _worker(index: int) -> None:
+    assert _queue is not None
+    queue = _queue
+    while True:
+        ingestion_id = await queue.get()
+        try:
+            await _process(ingestion_id)
+        except asyncio.CancelledError:
+            raise
+        except Exception:  # noqa: BLE001 - a bad ingestion must not kill the worker
+            logger.exception("Ingestion worker %s failed on %s", index, ingestion_id)
+        finally:
+            queue.task_done()
+
+
+async def _process(ingestion_id: str) -> None:
+    # Claim atomically so concurrent instances never process the same ingestion twice; an expired lease means the
+    # previous claimant is gone.
+    now = datetime.utcnow()
+    document = await _collection().find_one_and_update(
+        {"_id": ObjectId(ingestion_id), "$or": [{"status": "queued"}, _lease_expired(now)]},
+        {"$set": {"status": "processing", "claimed_at": now, "updated_at": now}},
+    )
+    if not document:
+        return
+
+    file_ref: Dict[str, Any] = document["file"]
+    params: Dict[str, Any] = document.get("params", {})
+    timings: Dict[str, float] = dict(document.get("timings_ms", {}))
+
+    try:
+        started = time.perf_counter()
+        await _update(ingestion_id, {"stage": "parsing"})
+        extraction = await _extract_stored(file_ref, params)
+        timings["parsing"] = round((time.perf_counter() - started) * 1000, 2)
+
+        started = time.perf_counter()
+        await _update(ingestion_id, {"stage": "skills", "timings_ms": timings})
+        skills = merge_skills(params.get("skills"), extraction.skills)
+        timings["skills"] = round((time.perf_counter() - started) * 1000, 2)
+
+        started = time.perf_counter()
+        await _update(ingestion_id, {"stage": "indexing", "timings_ms": timings})
+        result = await _index(document["kind"], params, file_ref, extraction, skills)
+        timings["indexing"] = round((time.perf_counter() - started) * 1000, 2)
+    except ExtractionPoolBusyError:
+        # Back-pressure from the extraction pool: retry later instead of failing the upload.
+        await _update(ingestion_id, {"status": "queued", "stage": "stored"})
+        await asyncio.sleep(_BUSY_RETRY_DELAY_SECONDS)
+        _enqueue(ingestion_id)
+        return
+    except (DocumentExtractionError, ExtractionTimeoutError) as exc:
+        await _fail(ingestion_id, getattr(exc, "code", "extraction_timeout"), str(exc), timings)
+        return
+    except Exception as exc:  # noqa: BLE001
+        logger.exception("Ingestion %s failed", ingestion_id)
+        await _fail(ingestion_id, "internal_error", str(exc), timings)
+        return
+
+    await _update(
+        ingestion_id,
+        {
+            "status": "completed",
+            "stage": "done",
+            "result": result,
+            "timings_ms": timings,
+            "completed_at": datetime.utcnow(),
+        },
+    )
+
+
+async def _fail(ingestion_id: str, code: str, message: str, timings: Dict[str, float]) -> None:
+    await _update(
+        ingestion_id,
+        {
+            "status": "failed",
+            "error": {"code": code, "message": message},
+            "timings_ms": timings,
+            "completed_at": datetime.utcnow(),
+        },
+    )
+
+
+async def _extract_stored(file_ref: Dict[str, Any], params: Dict[str, Any]) -> ExtractionResult:
+    # Check the cache before downloading so repeated content never leaves GridFS.
+    cached = await extraction_cache.get(file_ref["sha256"]) if file_ref.get("sha256") else None
+    if cached is not None:
+        return cached
+
+    # Workers open the file by path, so the payload is never held in this process or pickled.
+    spooled = await file_storage_service.download_to_disk(file_ref["file_id"])
+    try:
+        extraction = await extract_in_pool(
+            spooled.path,
+            params.get("content_type") or "application/octet-stream",
+            params.get("filename") or "",
+        )
+    finally:
+        spooled.discard()
+    await extraction_cache.put(spooled.sha256, extraction)
+    return extraction
+
+
+async def _index(
+    kind: str,
+    params: Dict[str, Any],
+    file_ref: Dict[str, Any],
+    extraction: ExtractionResult,
+    skills: List[str],
+) -> Dict[str, Any]:
+    # Deduplicated files keep the name of their first upload, so use this upload's own metadata.
+    content_type = params.get("content_type") or "application/octet-stream"
+    filename = params.get("filename") or ""
+    if kind == "resume":
+        resume_id = await resume_service.upload_resume(
+            candidate_id=params["candidate_id"],
+            name=params["name"],
+            content_type=content_type,
+            original_filename=filename,
+            extraction=extraction,
+            resume_type=params.get("resume_type") or "general",
+            version=params.get("version"),
+            summary=params.get("summary"),
+            skills=skills,
+            file_ref=file_ref,
+        )
+        return {"resume_id": resume_id}
+
+    job_id = await job_service.upload_job_description(
+        recruiter_id=params["recruiter_id"],
+        title=params["title"],
+        content_type=content_type,
+        original_filename=filename,
+        extraction=extraction,
+        company=params.get("company"),
+        budget=params.get("budget"),
+        job_brief=params.get("job_brief"),
+        additional_details=params.get("additional_details"),
+        file_ref=file_ref,
+    )
+    return {"job_id": job_id}
@@ -1,57 +1,15 @@
 from __future__ import annotations
 
-import io
 from datetime import datetime
 from typing import Any, Dict, Iterable, List, Optional
 
 from bson import ObjectId
-from PyPDF2 import PdfReader
-import docx
 
 from app.core.database import db
+from app.services.documents import ExtractionResult, extract_cached
 from app.services.ranking_service import calculate_ranking
 
 
-def _extract_text_from_pdf(file_bytes: bytes) -> str:
-    """Extract text content from PDF file."""
-    try:
-        pdf_reader = PdfReader(io.BytesIO(file_bytes))
-        text = ""
-        for page in pdf_reader.pages:
-            text += page.extract_text() + "\n"
-        return text.strip()
-    except Exception:
-        return ""
-
-
-def _extract_text_from_docx(file_bytes: bytes) -> str:
-    """Extract text content from DOCX file."""
-    try:
-        doc = docx.Document(io.BytesIO(file_bytes))
-        text = ""
-        for paragraph in doc.paragraphs:
-            text += paragraph.text + "\n"
-        return text.strip()
-    except Exception:
-        return ""
-
-
-def _extract_text_from_file(file_bytes: bytes, content_type: str, filename: str) -> str:
-    """Extract text content from uploaded file based on type."""
-    filename_lower = filename.lower()
-
-    if content_type == "application/pdf" or filename_lower.endswith(".pdf"):
-        return _extract_text_from_pdf(file_bytes)
-    elif content_type == "application/vnd.openxmlformats-officedocument.wordprocessingml.document" or filename_lower.endswith((".docx", ".doc")):
-        return _extract_text_from_docx(file_bytes)
-    else:
-        # For other file types, try to decode as text
-        try:
-            return file_bytes.decode('utf-8')
-        except UnicodeDecodeError:
-            return ""
-
-
 def _serialize_job_document(document: Dict[str, Any]) -> Dict[str, Any]:
     job = document.copy()
     job["id"] = str(job.pop("_id"))
@@ -66,11 +24,13 @@ async def _get_candidate_skillset(candidate_id: str) -> List[str]:
     skills: List[str] = candidate.get("skills", []) if candidate else []
 
     latest_resume = await db.resumes.find_one(
-        {"candidate_id": candidate_id},
+        {"candidate_id": candidate_id, "is_active": True},
         sort=[("last_updated", -1)],
     )
     if latest_resume:
-        combined = set(skills) | set(latest_resume.get("skills", []))
+        # Uploaded resumes keep their skills under metadata; seeded ones at the top level.
+        resume_skills = latest_resume.get("skills") or (latest_resume.get("metadata") or {}).get("skills", [])
+        combined = set(skills) | set(resume_skills)
         return sorted(combined)
     return skills
 
@@ -280,46 +240,87 @@ async def update_job_description(job_id: str, update_data: Dict[str, Any]) -> Op
     return None
 
 
-async def upload_job_description(
+def build_job_description_document(
     *,
     recruiter_id: str,
     title: str,
-    file_bytes: bytes,
-    content_type: str,
+    extraction: ExtractionResult,
     original_filename: str,
     company: Optional[str] = None,
     budget: Optional[str] = None,
     job_brief: Optional[str] = None,
     additional_details: Optional[Dict[str, Any]] = None,
-) -> str:
-    """Upload a job description and extract its text content."""
-
-    # Extract text content from the file
-    jd_content = _extract_text_from_file(file_bytes, content_type, original_filename)
+    file_ref: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    """Build the job document for an extracted job description without inserting it."""
 
     # Generate a unique code for the job
     code = f"REQ-{datetime.utcnow().strftime('%Y%m%d')}-{str(ObjectId())[:6].upper()}"
 
-    document: Dict[str, Any] = {
+    return {
         "title": title,
         "company": company,
         "budget": budget,
         "job_brief": job_brief,
-        "jd_content": jd_content,
+        "jd_content": extraction.text,
         "jd_filename": original_filename,
+        "jd_file": file_ref,
+        "jd_extraction": extraction.stats(),
         "additional_details": additional_details or {},
         "uploaded_by": recruiter_id,
         "uploaded_at": datetime.utcnow(),
         "is_curated": True,
         "code": code,
         "status": "active",
-        "skills": [],  # Initialize as empty array
+        "skills": list(extraction.skills),
         "responsibilities": [],  # Initialize as empty array
         "requirements": [],  # Initialize as empty array
         "skills_required": [],  # Will be extracted by AI later
         "location": "",  # Will be extracted by AI later
     }
 
+
+async def upload_job_description(
+    *,
+    recruiter_id: str,
+    title: str,
+    content_type: str,
+    original_filename: str,
+    file_bytes: Optional[bytes] = None,
+    extraction: Optional[ExtractionResult] = None,
+    company: Optional[str] = None,
+    budget: Optional[str] = None,
+    job_brief: Optional[str] = None,
+    additional_details: Optional[Dict[str, Any]] = None,
+    file_ref: Optional[Dict[str, Any]] = None,
+) -> str:
+    """Upload a job description and extract its text content.
+
+    Pass ``extraction`` when the file was already extracted (e.g. by the ingestion pipeline);
+    otherwise ``file_bytes`` is extracted here. ``file_ref`` points at the original file in GridFS
+    (see ``file_storage_service``).
+    """
+    if extraction is None:
+        if file_bytes is None:
+            raise ValueError("Either file_bytes or extraction is required")
+        extraction = await extract_cached(
+            file_bytes,
+            content_type,
+            original_filename,
+            sha256=file_ref.get("sha256") if file_ref else None,
+        )
+
+    document = build_job_description_document(
+        recruiter_id=recruiter_id,
+        title=title,
+        extraction=extraction,
+        original_filename=original_filename,
+        company=company,
+        budget=budget,
+        job_brief=job_brief,
+        additional_details=additional_details,
+        file_ref=file_ref,
+    )
     result = await db.jobs.insert_one(document)
     return str(result.inserted_id)
 
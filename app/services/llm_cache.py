@@ -0,0 +1,165 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional, Tuple
+
+from pymongo import ASCENDING
+from pymongo.errors import PyMongoError
+
+from app.core.config import settings
+from app.core.database import db
+from app.services.llm_providers.base import LLMRequest
+
+logger = logging.getLogger(__name__)
+
+# Bump when provider output handling changes so stale responses are not served.
+# v2: keys are scoped to the org, endpoint and credential that produced the response.
+_CACHE_VERSION = 2
+
+# key -> (response text, expires_at, tokens the call cost)
+_lru: "OrderedDict[str, Tuple[str, datetime, int]]" = OrderedDict()
+_metrics: Dict[str, int] = {
+    "memory_hits": 0,
+    "mongo_hits": 0,
+    "misses": 0,
+    "bypassed": 0,
+    "writes": 0,
+    "tokens_saved": 0,
+}
+
+
+def _collection():
+    return db.llm_response_cache
+
+
+def credential_hash(request: LLMRequest) -> str:
+    """Short, non-reversible identity of the API key a request is sent with."""
+    return hashlib.sha256((request.api_key or "").encode("utf-8")).hexdigest()[:16]
+
+
+def cache_key(
+    provider: str, request: LLMRequest, prompt_version: Optional[str] = None, org_id: Optional[str] = None
+) -> str:
+    """Content address of an LLM call: everything that determines the response, nothing secret.
+
+    Responses are scoped to the org, endpoint and credential that produced them, so a caller pointing a config at
+    their own server cannot plant answers that another tenant's identical prompt would be served.
+    """
+    material = {
+        "v": _CACHE_VERSION,
+        "org_id": org_id,
+        "provider": provider,
+        "base_url": request.base_url,
+        "credential": credential_hash(request),
+        "model": request.model,
+        "messages": [[message.role, message.content] for message in request.messages],
+        "temperature": request.temperature,
+        "max_tokens": request.max_tokens,
+        "response_format": request.response_format,
+        "prompt_version": prompt_version,
+        # fake_* keys only tune the fake provider's latency and failures, not the response.
+        "extra_payload": {key: value for key, value in request.extra_payload.items() if not key.startswith("fake_")},
+    }
+    encoded = json.dumps(material, ensure_ascii=False, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def _remember(key: str, text: str, expires_at: datetime, tokens: int) -> None:
+    _lru[key] = (text, expires_at, tokens)
+    _lru.move_to_end(key)
+    while len(_lru) > settings.LLM_CACHE_LRU_SIZE:
+        _lru.popitem(last=False)
+
+
+async def ensure_indexes() -> None:
+    await _collection().create_index([("expires_at", ASCENDING)], expireAfterSeconds=0)
+
+
+async def get(key: str) -> Optional[str]:
+    """Return the cached response for ``key``, checking the in-process LRU first."""
+    now = datetime.utcnow()
+    cached = _lru.get(key)
+    if cached is not None:
+        text, expires_at, tokens = cached
+        if expires_at > now:
+            _lru.move_to_end(key)
+            _metrics["memory_hits"] += 1
+            _metrics["tokens_saved"] += tokens
+            return text
+        del _lru[key]
+
+    try:
+        document = await _collection().find_one_and_update(
+            {"_id": key, "expires_at": {"$gt": now}},
+            {"$inc": {"hits": 1}},
+        )
+    except PyMongoError as exc:
+        logger.warning("LLM cache lookup failed: %s", exc)
+        document = None
+    if not document:
+        _metrics["misses"] += 1
+        return None
+
+    _remember(key, document["response"], document["expires_at"], document.get("tokens", 0))
+    _metrics["mongo_hits"] += 1
+    _metrics["tokens_saved"] += document.get("tokens", 0)
+    return document["response"]
+
+
+async def put(
+    key: str,
+    text: str,
+    *,
+    ttl_seconds: Optional[int] = None,
+    tokens: int = 0,
+    provider: str,
+    model: str,
+    step: Optional[str] = None,
+) -> None:
+    now = datetime.utcnow()
+    expires_at = now + timedelta(seconds=ttl_seconds or settings.LLM_CACHE_TTL_SECONDS)
+    _remember(key, text, expires_at, tokens)
+    _metrics["writes"] += 1
+    try:
+        await _collection().update_one(
+            {"_id": key},
+            {
+                "$set": {
+                    "response": text,
+                    "tokens": tokens,
+                    "provider": provider,
+                    "model": model,
+                    "step": step,
+                    "expires_at": expires_at,
+                    "updated_at": now,
+                },
+                "$setOnInsert": {"created_at": now, "hits": 0},
+            },
+            upsert=True,
+        )
+    except PyMongoError as exc:
+        logger.warning("LLM cache write failed: %s", exc)
+
+
+def record_bypass() -> None:
+    _metrics["bypassed"] += 1
+
+
+async def clear() -> int:
+    _lru.clear()
+    result = await _collection().delete_many({})
+    return result.deleted_count
+
+
+def get_metrics() -> Dict[str, Any]:
+    hits = _metrics["memory_hits"] + _metrics["mongo_hits"]
+    lookups = hits + _metrics["misses"]
+    return {
+        **_metrics,
+        "lru_size": len(_lru),
+        "hit_rate": round(hits / lookups, 3) if lookups else 0.0,
+    }
@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+import copy
+import json
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from app.services import llm_tokens
+from app.services.llm_tokens import ContextWindowExceededError
+
+logger = logging.getLogger(__name__)
+
+# (field, limit): strings keep ``limit`` characters, lists ``limit`` items, dicts ``limit`` characters per value;
+# a limit of None drops the field.
+Trim = Tuple[str, Optional[int]]
+
+
+@dataclass(frozen=True)
+class PromptLimit:
+    """Room for the shared context in one model's prompt."""
+
+    provider: str
+    model: str
+    tokens: int
+
+
+@dataclass
+class FitReport:
+    tokens: Dict[str, int] = field(default_factory=dict)  # estimated context tokens per "provider:model"
+    trims: List[str] = field(default_factory=list)
+    dropped_items: int = 0
+    truncated_text: bool = False
+
+    @property
+    def trimmed(self) -> bool:
+        return bool(self.trims or self.dropped_items or self.truncated_text)
+
+
+def _render(payload: Dict[str, Any]) -> str:
+    return json.dumps(payload, ensure_ascii=False, separators=(",", ":"))
+
+
+def _shorten(value: Any, limit: int) -> Any:
+    if isinstance(value, str):
+        return value if len(value) <= limit else value[:limit].rstrip() + "…"
+    if isinstance(value, list):
+        return value[:limit]
+    if isinstance(value, dict):
+        return {key: _shorten(item, limit) for key, item in value.items()}
+    return value
+
+
+class ContextBudget:
+    """Fits one JSON context into the prompt of every model that will receive it.
+
+    ``fit`` tries, in order: applying ``trims`` to every item (lowest-priority fields first), dropping items
+    from the end of the list, and truncating the free-text field. Each stage stops as soon as the context fits.
+    """
+
+    def __init__(self, limits: Sequence[PromptLimit]) -> None:
+        if not limits:
+            raise ValueError("ContextBudget needs at least one prompt limit")
+        self.limits = list(limits)
+
+    def overflow(self, text: str) -> int:
+        """Tokens by which ``text`` exceeds the tightest limit (zero or negative when it fits)."""
+        return max(llm_tokens.estimate_tokens(text, limit.provider, limit.model) - limit.tokens for limit in self.limits)
+
+    def _report_tokens(self, text: str) -> Dict[str, int]:
+        return {
+            f"{limit.provider}:{limit.model}": llm_tokens.estimate_tokens(text, limit.provider, limit.model)
+            for limit in self.limits
+        }
+
+    def fit(
+        self,
+        payload: Dict[str, Any],
+        *,
+        items_key: str,
+        trims: Sequence[Trim],
+        text_path: Tuple[str, str],
+        omitted_key: str,
+        min_items: int = 1,
+        render: Callable[[Dict[str, Any]], str] = _render,
+    ) -> Tuple[str, FitReport]:
+        report = FitReport()
+        text = render(payload)
+        if self.overflow(text) <= 0:
+            report.tokens = self._report_tokens(text)
+            return text, report
+
+        payload = copy.deepcopy(payload)
+        items: List[Dict[str, Any]] = payload.get(items_key, [])
+
+        for name, limit in trims:
+            touched = False
+            for item in items:
+                if name not in item:
+                    continue
+                touched = True
+                if limit is None:
+                    del item[name]
+                else:
+                    item[name] = _shorten(item[name], limit)
+            if not touched:
+                continue
+            report.trims.append(name if limit is None else f"{name}<={limit}")
+            text = render(payload)
+            if self.overflow(text) <= 0:
+                break
+
+        while self.overflow(text) > 0 and len(items) > min_items:
+            items.pop()
+            report.dropped_items += 1
+            payload[omitted_key] = report.dropped_items
+            text = render(payload)
+
+        section, key = text_path
+        while self.overflow(text) > 0 and payload.get(section, {}).get(key):
+            current = payload[section][key]
+            # Cut a little more than the overflow (at >= 1 character per token) so this converges quickly.
+            keep = len(current) - max(self.overflow(text) * 2, 200)
+            if keep <= 0:
+                del payload[section][key]
+            else:
+                payload[section][key] = current[:keep].rstrip() + "…"
+            report.truncated_text = True
+            text = render(payload)
+
+        if self.overflow(text) > 0:
+            raise ContextWindowExceededError(
+                "The workflow context does not fit the configured model's context window, even after trimming"
+            )
+        report.tokens = self._report_tokens(text)
+        return text, report
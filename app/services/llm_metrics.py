@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+from collections import deque
+from typing import Any, Deque, Dict, Optional, Tuple
+
+# Rolling window of recent samples kept per (metric, provider, model).
+_WINDOW = 500
+
+_samples: Dict[Tuple[str, str, str], Deque[float]] = {}
+_counts: Dict[Tuple[str, str, str], int] = {}
+_events: Dict[Tuple[str, str, str], int] = {}
+_tokens: Dict[Tuple[str, str], Dict[str, int]] = {}
+
+
+def record(metric: str, provider: str, model: str, value_ms: float) -> None:
+    """Record one ``metric`` sample (``ttft_ms`` or ``latency_ms``) for a provider/model pair."""
+    key = (metric, provider, model)
+    _samples.setdefault(key, deque(maxlen=_WINDOW)).append(value_ms)
+    _counts[key] = _counts.get(key, 0) + 1
+
+
+def increment(event: str, provider: str, model: str) -> None:
+    """Count an orchestration event such as ``hedges``, ``failovers`` or ``fallback_wins``."""
+    key = (event, provider, model)
+    _events[key] = _events.get(key, 0) + 1
+
+
+def record_tokens(provider: str, model: str, prompt_tokens: int, completion_tokens: int, *, estimated: bool) -> None:
+    """Add one call's token counts; ``estimated`` when the provider did not report usage."""
+    totals = _tokens.setdefault(
+        (provider, model), {"calls": 0, "estimated_calls": 0, "prompt_tokens": 0, "completion_tokens": 0}
+    )
+    totals["calls"] += 1
+    totals["estimated_calls"] += int(estimated)
+    totals["prompt_tokens"] += prompt_tokens
+    totals["completion_tokens"] += completion_tokens
+
+
+def percentile(metric: str, provider: str, model: str, fraction: float, min_samples: int = 1) -> Optional[float]:
+    """Nearest-rank percentile over the rolling window, or None with fewer than ``min_samples`` samples."""
+    samples = _samples.get((metric, provider, model))
+    if not samples or len(samples) < max(min_samples, 1):
+        return None
+    ordered = sorted(samples)
+    return ordered[min(int(fraction * len(ordered)), len(ordered) - 1)]
+
+
+def get_metrics() -> Dict[str, Any]:
+    summary: Dict[str, Any] = {}
+    for (metric, provider, model), samples in sorted(_samples.items()):
+        ordered = sorted(samples)
+        summary.setdefault(metric, []).append(
+            {
+                "provider": provider,
+                "model": model,
+                "count": _counts[(metric, provider, model)],
+                "p50": round(ordered[len(ordered) // 2], 1),
+                "p95": round(ordered[min(int(0.95 * len(ordered)), len(ordered) - 1)], 1),
+                "max": round(ordered[-1], 1),
+            }
+        )
+    summary["events"] = [
+        {"event": event, "provider": provider, "model": model, "count": count}
+        for (event, provider, model), count in sorted(_events.items())
+    ]
+    summary["tokens"] = [
+        {"provider": provider, "model": model, **totals} for (provider, model), totals in sorted(_tokens.items())
+    ]
+    return summary
+
+
+def reset() -> None:
+    _samples.clear()
+    _counts.clear()
+    _events.clear()
+    _tokens.clear()
@@ -1,22 +1,64 @@
 from __future__ import annotations
 
-from typing import Dict, Iterable
+import asyncio
+import json
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import AsyncGenerator, Dict, Iterable, List, Optional, Tuple
 
+import httpx
+from botocore.exceptions import ClientError
+
+from app.core.config import settings
 from app.models.llm_model import LLMProviderConfig
+from app.services import llm_cache, llm_metrics, llm_rate_limiter, llm_resilience, llm_singleflight, llm_telemetry, llm_tokens
+from app.services.llm_context_budget import PromptLimit
 from app.services.llm_providers import (
     AnthropicProvider,
     BedrockProvider,
     DeepSeekProvider,
+    FakeProvider,
     GoogleGenerativeAIProvider,
     OpenAIProvider,
 )
 from app.services.llm_providers.base import LLMMessage, LLMRequest, LLMProvider, ProviderNotConfiguredError
 from app.services.llm_settings_service import env_config_for_provider
+from app.services.llm_tokens import ContextWindowExceededError
 
 _DEFAULT_TEMPERATURE = 0.2
+# Distinct configs seen in practice are the admin default/step configs plus the odd request override.
+_HYDRATED_CACHE_SIZE = 256
+# Providers that send OpenAI-style response_format=json_object and fall back to text mode on a 400.
+_JSON_MODE_PROVIDERS = ("openai", "deepseek")
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class LLMCallOptions:
+    """Per-call context that is not part of the provider configuration."""
+
+    step: Optional[str] = None
+    prompt_version: Optional[str] = None
+    bypass_cache: bool = False
+    org_id: Optional[str] = None
+    # Configs (e.g. the admin settings' default and step configs) whose credentials fallback targets may reuse.
+    credentials: Tuple[LLMProviderConfig, ...] = ()
+
+
+@dataclass(frozen=True)
+class _Candidate:
+    config: LLMProviderConfig
+    provider: LLMProvider
+    request: LLMRequest
+    prompt_tokens: int
 
 
 class LLMOrchestrator:
+    """Routes calls to providers. Create one per process (``app.state.llm_orchestrator``) and share it."""
+
     def __init__(self) -> None:
         self._providers: Dict[str, LLMProvider] = {
             "openai": OpenAIProvider(),
@@ -25,38 +67,417 @@ class LLMOrchestrator:
             "deepseek": DeepSeekProvider(),
             "bedrock": BedrockProvider(),
         }
+        # Records real responses through the providers above when a config uses fake_mode "record".
+        self._providers["fake"] = FakeProvider(self._providers)
+        # Env settings are fixed for the process, so env defaults and hydrated configs are computed once.
+        self._env_defaults: Dict[str, LLMProviderConfig] = {}
+        self._hydrated: "OrderedDict[str, LLMProviderConfig]" = OrderedDict()
 
-    async def generate(self, messages: Iterable[LLMMessage], config: LLMProviderConfig, response_format: str = "json") -> str:
-        hydrated = self._hydrate_config(config)
-        provider = self._providers.get(hydrated.provider)
-        if provider is None:
-            raise ValueError(f"Unsupported LLM provider '{hydrated.provider}'")
+    async def generate(
+        self,
+        messages: Iterable[LLMMessage],
+        config: LLMProviderConfig,
+        response_format: str = "json",
+        *,
+        options: Optional[LLMCallOptions] = None,
+    ) -> str:
+        options = options or LLMCallOptions()
+        primary = self._candidate(messages, config, response_format)
 
-        request = LLMRequest(
-            model=hydrated.model,
-            messages=list(messages),
-            api_key=hydrated.api_key or "",
-            base_url=hydrated.base_url,
-            max_tokens=hydrated.max_tokens,
-            temperature=hydrated.temperature if hydrated.temperature is not None else _DEFAULT_TEMPERATURE,
-            extra_headers=hydrated.extra_headers,
-            extra_payload=hydrated.extra_payload,
-            response_format=response_format,
+        cache_key = self._cache_lookup_key(primary.config, primary.request, options)
+        if cache_key:
+            started = time.perf_counter()
+            cached = await llm_cache.get(cache_key)
+            if cached is not None:
+                self._record_cache_hit(primary, options, started)
+                return cached
+
+        if not settings.LLM_COALESCE_ENABLED:
+            return await self._generate_fresh(primary, options)
+        return await llm_singleflight.do(
+            self._flight_key(primary, options), lambda: self._generate_fresh(primary, options)
         )
 
-        if not request.api_key and hydrated.provider not in {"bedrock"}:
-            raise ProviderNotConfiguredError(
-                f"Provider '{hydrated.provider}' is missing an API key. Configure credentials in env vars or admin settings."
+    async def generate_stream(
+        self,
+        messages: Iterable[LLMMessage],
+        config: LLMProviderConfig,
+        response_format: str = "json",
+        *,
+        options: Optional[LLMCallOptions] = None,
+    ):
+        """Generate content with streaming support (token by token).
+
+        A cached response is replayed as a single chunk; a fresh one is cached once the stream completes.
+        Concurrent identical streams share one provider call. If a provider fails before its first chunk,
+        the next configured fallback takes over.
+        """
+        options = options or LLMCallOptions()
+        primary = self._candidate(messages, config, response_format)
+
+        cache_key = self._cache_lookup_key(primary.config, primary.request, options)
+        if cache_key:
+            started = time.perf_counter()
+            cached = await llm_cache.get(cache_key)
+            if cached is not None:
+                self._record_cache_hit(primary, options, started)
+                yield cached
+                return
+
+        if not settings.LLM_COALESCE_ENABLED:
+            source = self._stream_fresh(primary, options)
+        else:
+            source = llm_singleflight.stream(
+                self._flight_key(primary, options), lambda: self._stream_fresh(primary, options)
             )
+        async for chunk in source:
+            yield chunk
+
+    async def _generate_fresh(self, primary: _Candidate, options: LLMCallOptions) -> str:
+        candidates = [primary, *self._fallback_candidates(primary, options)]
+        if len(candidates) == 1:
+            result = await self._timed_call(primary, options)
+        else:
+            result = await self._hedged_call(candidates, options)
+
+        if primary.config.cache_enabled:
+            await self._cache_store(primary, options, result)
+        return result
+
+    async def _stream_fresh(self, primary: _Candidate, options: LLMCallOptions) -> AsyncGenerator[str, None]:
+        candidates = [primary, *self._fallback_candidates(primary, options)]
+        chunks: List[str] = []
+        for index, candidate in enumerate(candidates):
+            name, model = candidate.config.provider, candidate.request.model
+            started = time.perf_counter()
+            ttft_ms: Optional[float] = None
+            try:
+                async for chunk in self._call_stream(candidate, options):
+                    if ttft_ms is None:
+                        ttft_ms = (time.perf_counter() - started) * 1000
+                        llm_metrics.record("ttft_ms", name, model, ttft_ms)
+                    chunks.append(chunk)
+                    yield chunk
+            except Exception as exc:
+                self._record_failure(candidate, options, started, exc, ttfb_ms=ttft_ms)
+                if chunks or index == len(candidates) - 1:
+                    raise
+                logger.warning("LLM stream from %s failed before its first chunk, failing over: %s", name, exc)
+                llm_metrics.increment("failovers", name, model)
+                continue
+            latency_ms = (time.perf_counter() - started) * 1000
+            llm_metrics.record("latency_ms", name, model, latency_ms)
+            self._record_usage(candidate, "".join(chunks), options, latency_ms=latency_ms, ttfb_ms=ttft_ms)
+            break
+
+        if primary.config.cache_enabled and chunks:
+            await self._cache_store(primary, options, "".join(chunks))
 
-        return await provider.generate(request)
+    async def _timed_call(self, candidate: _Candidate, options: LLMCallOptions) -> str:
+        name, model = candidate.config.provider, candidate.request.model
+        started = time.perf_counter()
+        try:
+            result = await self._call(candidate, options)
+        except Exception as exc:
+            self._record_failure(candidate, options, started, exc)
+            raise
+        latency_ms = (time.perf_counter() - started) * 1000
+        llm_metrics.record("latency_ms", name, model, latency_ms)
+        self._record_usage(candidate, result, options, latency_ms=latency_ms)
+        return result
+
+    def _record_cache_hit(self, primary: _Candidate, options: LLMCallOptions, started: float) -> None:
+        llm_telemetry.record(
+            provider=primary.config.provider,
+            model=primary.request.model,
+            step=options.step,
+            org_id=options.org_id,
+            latency_ms=(time.perf_counter() - started) * 1000,
+            cache_hit=True,
+        )
+
+    def _record_failure(
+        self,
+        candidate: _Candidate,
+        options: LLMCallOptions,
+        started: float,
+        exc: Exception,
+        *,
+        ttfb_ms: Optional[float] = None,
+    ) -> None:
+        llm_telemetry.record(
+            provider=candidate.config.provider,
+            model=candidate.request.model,
+            step=options.step,
+            org_id=options.org_id,
+            latency_ms=(time.perf_counter() - started) * 1000,
+            ttfb_ms=ttfb_ms,
+            prompt_tokens=candidate.prompt_tokens,
+            error=exc,
+        )
 
-    async def generate_stream(self, messages: Iterable[LLMMessage], config: LLMProviderConfig, response_format: str = "json"):
-        """Generate content with streaming support (token by token)."""
+    def _record_usage(
+        self,
+        candidate: _Candidate,
+        result: str,
+        options: LLMCallOptions,
+        *,
+        latency_ms: float,
+        ttfb_ms: Optional[float] = None,
+    ) -> Dict[str, int]:
+        """Prompt and completion tokens of a finished call: provider-reported when available, else estimated."""
+        name, request = candidate.config.provider, candidate.request
+        estimated = not request.usage
+        usage = dict(request.usage) or {
+            "prompt_tokens": candidate.prompt_tokens,
+            "completion_tokens": llm_tokens.estimate_tokens(result, name, request.model),
+        }
+        llm_metrics.record_tokens(
+            name, request.model, usage["prompt_tokens"], usage["completion_tokens"], estimated=estimated
+        )
+        logger.info(
+            "LLM call %s/%s step=%s: %s prompt + %s completion tokens%s",
+            name,
+            request.model,
+            options.step or "-",
+            usage["prompt_tokens"],
+            usage["completion_tokens"],
+            " (estimated)" if estimated else "",
+        )
+        llm_telemetry.record(
+            provider=name,
+            model=request.model,
+            step=options.step,
+            org_id=options.org_id,
+            latency_ms=latency_ms,
+            ttfb_ms=ttfb_ms,
+            prompt_tokens=usage["prompt_tokens"],
+            completion_tokens=usage["completion_tokens"],
+        )
+        return usage
+
+    async def _hedged_call(self, candidates: List[_Candidate], options: LLMCallOptions) -> str:
+        """Race the primary against its fallbacks: the first good answer wins and the rest are cancelled.
+
+        The first fallback is fired as a hedge once the primary has been running for its hedge delay,
+        and the next candidate is started immediately whenever every running call has failed.
+        """
+        hedge_delay = self._hedge_delay(candidates[0])
+        running: Dict[asyncio.Task, _Candidate] = {}
+        errors: List[Exception] = []
+        launched = 0
+
+        def launch() -> None:
+            nonlocal launched
+            candidate = candidates[launched]
+            launched += 1
+            running[asyncio.create_task(self._timed_call(candidate, options))] = candidate
+
+        launch()
+        try:
+            while running:
+                can_hedge = hedge_delay is not None and launched == 1
+                done, _ = await asyncio.wait(
+                    running, timeout=hedge_delay if can_hedge else None, return_when=asyncio.FIRST_COMPLETED
+                )
+                if not done:
+                    hedge = candidates[launched]
+                    llm_metrics.increment("hedges", hedge.config.provider, hedge.request.model)
+                    launch()
+                    continue
+                for task in done:
+                    candidate = running.pop(task)
+                    if task.exception() is None:
+                        if candidate is not candidates[0]:
+                            llm_metrics.increment("fallback_wins", candidate.config.provider, candidate.request.model)
+                        return task.result()
+                    errors.append(task.exception())
+                    llm_metrics.increment("failovers", candidate.config.provider, candidate.request.model)
+                    logger.warning("LLM call to %s failed, failing over: %s", candidate.config.provider, task.exception())
+                if not running and launched < len(candidates):
+                    launch()
+            raise errors[0]
+        finally:
+            for task in running:
+                task.cancel()
+            if running:
+                await asyncio.gather(*running, return_exceptions=True)
+
+    def _hedge_delay(self, primary: _Candidate) -> Optional[float]:
+        """Seconds to wait for the primary before hedging, or None to only fail over on errors."""
+        if not settings.LLM_HEDGE_ENABLED:
+            return None
+        if primary.config.hedge_after_ms is not None:
+            return primary.config.hedge_after_ms / 1000
+        p95 = llm_metrics.percentile(
+            "latency_ms",
+            primary.config.provider,
+            primary.request.model,
+            0.95,
+            min_samples=settings.LLM_HEDGE_MIN_SAMPLES,
+        )
+        return p95 / 1000 if p95 is not None else None
+
+    def _fallback_candidates(self, primary: _Candidate, options: LLMCallOptions) -> List[_Candidate]:
+        """Resolve the primary's fallback targets, reusing credentials from ``options.credentials`` when available."""
+        candidates: List[_Candidate] = []
+        for target in primary.config.fallbacks:
+            known = next((cfg for cfg in options.credentials if cfg.provider == target.provider), None)
+            base = known or LLMProviderConfig(provider=target.provider, model="")
+            config = base.copy(
+                update={
+                    "model": target.model or base.model,
+                    "temperature": primary.config.temperature,
+                    "max_tokens": primary.config.max_tokens,
+                    "fallbacks": [],
+                    "cache_enabled": False,
+                }
+            )
+            try:
+                candidates.append(self._candidate(primary.request.messages, config, primary.request.response_format))
+            except (ProviderNotConfiguredError, ValueError) as exc:
+                logger.warning("Skipping LLM fallback %s: %s", target.provider, exc)
+        return candidates
+
+    async def _call(self, candidate: _Candidate, options: LLMCallOptions) -> str:
+        """One provider call inside its rate limits and circuit breaker, retrying 429s and transient failures."""
+        name, provider, request = candidate.config.provider, candidate.provider, candidate.request
+        tokens = _request_tokens(candidate)
+        circuit = llm_resilience.breaker(name)
+        llm_resilience.budget(name).record_call()
+        retries = {"throttled": 0, "transient": 0}
+        while True:
+            circuit.before_call(name)
+            try:
+                async with llm_rate_limiter.slot(name, request.model, options.org_id, tokens):
+                    result = await provider.generate(request)
+            except asyncio.CancelledError:
+                circuit.release()
+                raise
+            except Exception as exc:
+                delay = self._retry_delay(name, request, options, exc, retries)
+                if delay is None:
+                    raise
+                await asyncio.sleep(delay)
+                continue
+            circuit.record_success()
+            return result
+
+    async def _call_stream(self, candidate: _Candidate, options: LLMCallOptions) -> AsyncGenerator[str, None]:
+        """Streaming counterpart of ``_call``; failures are only retried before the first chunk."""
+        name, provider, request = candidate.config.provider, candidate.provider, candidate.request
+        tokens = _request_tokens(candidate)
+        circuit = llm_resilience.breaker(name)
+        llm_resilience.budget(name).record_call()
+        retries = {"throttled": 0, "transient": 0}
+        while True:
+            circuit.before_call(name)
+            started = False
+            try:
+                async with llm_rate_limiter.slot(name, request.model, options.org_id, tokens):
+                    async for chunk in provider.generate_stream(request):
+                        started = True
+                        yield chunk
+            except (asyncio.CancelledError, GeneratorExit):
+                circuit.release()
+                raise
+            except Exception as exc:
+                delay = self._retry_delay(name, request, options, exc, retries, retryable=not started)
+                if delay is None:
+                    raise
+                await asyncio.sleep(delay)
+                continue
+            circuit.record_success()
+            return
+
+    def _retry_delay(
+        self,
+        name: str,
+        request: LLMRequest,
+        options: LLMCallOptions,
+        exc: Exception,
+        retries: Dict[str, int],
+        *,
+        retryable: bool = True,
+    ) -> Optional[float]:
+        """Update the breaker for a failed attempt and return how long to wait before retrying, or None to give up."""
+        circuit = llm_resilience.breaker(name)
+        if self._throttled(name, request, options, exc):
+            # The limiter holds the retry back until Retry-After has passed.
+            circuit.release()
+            retries["throttled"] += 1
+            return 0.0 if retryable and retries["throttled"] <= settings.LLM_RATE_LIMIT_RETRIES else None
+        if not llm_resilience.is_transient(exc):
+            circuit.release()
+            return None
+
+        circuit.record_failure(exc)
+        retries["transient"] += 1
+        policy = llm_resilience.retry_policy()
+        if not retryable or retries["transient"] >= policy.max_attempts or circuit.state == "open":
+            return None
+        if not llm_resilience.budget(name).try_spend():
+            return None
+        return policy.delay(retries["transient"])
+
+    def _throttled(self, name: str, request: LLMRequest, options: LLMCallOptions, exc: Exception) -> bool:
+        """Pause the caller's limiter if ``exc`` is a provider rate-limit response."""
+        if isinstance(exc, httpx.HTTPStatusError) and exc.response.status_code == 429:
+            retry_after = exc.response.headers.get("retry-after")
+        elif isinstance(exc, ClientError) and exc.response.get("Error", {}).get("Code") == "ThrottlingException":
+            retry_after = None
+        else:
+            return False
+        delay = llm_rate_limiter.parse_retry_after(retry_after, default=settings.LLM_RETRY_AFTER_DEFAULT_SECONDS)
+        llm_rate_limiter.block_for(name, request.model, options.org_id, delay)
+        return True
+
+    def http_endpoints(self) -> List[Tuple[str, str]]:
+        """``(provider, base URL)`` pairs the pooled HTTP clients should be opened for at startup."""
+        endpoints = []
+        for name, provider in self._providers.items():
+            default_base_url = getattr(provider, "default_base_url", None)
+            if default_base_url:
+                endpoints.append((name, self._env_config(name).base_url or default_base_url))
+        return endpoints
+
+    def capability_probes(self) -> List[Tuple[LLMProvider, LLMRequest]]:
+        """Tiny JSON-mode requests for each env-configured JSON-mode provider, used to learn support at startup."""
+        probes = []
+        for name in _JSON_MODE_PROVIDERS:
+            config = self._env_config(name)
+            if not config.api_key or not config.model:
+                continue
+            request = LLMRequest(
+                model=config.model,
+                # OpenAI-compatible APIs reject JSON mode unless the prompt mentions JSON.
+                messages=[LLMMessage(role="user", content='Reply with the JSON object {"ok": true}.')],
+                api_key=config.api_key,
+                base_url=config.base_url,
+                max_tokens=16,
+                temperature=0,
+                extra_headers=config.extra_headers,
+                response_format="json",
+            )
+            probes.append((self._providers[name], request))
+        return probes
+
+    def prompt_limit(self, config: LLMProviderConfig) -> PromptLimit:
+        """Prompt tokens ``config``'s model can take once its completion (``max_tokens``) is reserved."""
+        hydrated = self._hydrate_config(config)
+        return PromptLimit(
+            provider=hydrated.provider,
+            model=hydrated.model,
+            tokens=llm_tokens.prompt_budget(hydrated.provider, hydrated.model, hydrated.max_tokens),
+        )
+
+    def _candidate(self, messages: Iterable[LLMMessage], config: LLMProviderConfig, response_format: str) -> _Candidate:
         hydrated = self._hydrate_config(config)
         provider = self._providers.get(hydrated.provider)
         if provider is None:
             raise ValueError(f"Unsupported LLM provider '{hydrated.provider}'")
+        if hydrated.provider == "fake" and not settings.LLM_FAKE_ENABLED:
+            raise ProviderNotConfiguredError("The fake LLM provider is disabled. Set LLM_FAKE_ENABLED=true to use it.")
 
         request = LLMRequest(
             model=hydrated.model,
@@ -70,16 +491,75 @@ class LLMOrchestrator:
             response_format=response_format,
         )
 
-        if not request.api_key and hydrated.provider not in {"bedrock"}:
+        if not request.api_key and hydrated.provider not in {"bedrock", "fake"}:
             raise ProviderNotConfiguredError(
                 f"Provider '{hydrated.provider}' is missing an API key. Configure credentials in env vars or admin settings."
             )
 
-        async for chunk in provider.generate_stream(request):
-            yield chunk
+        prompt_tokens = llm_tokens.count_messages(request.messages, hydrated.provider, request.model)
+        room = llm_tokens.context_window(hydrated.provider, request.model) - prompt_tokens
+        if room < llm_tokens.completion_reserve(request.max_tokens):
+            if room < settings.LLM_MIN_COMPLETION_TOKENS:
+                raise ContextWindowExceededError(
+                    f"Prompt of ~{prompt_tokens} tokens leaves no room for a response in {hydrated.provider} "
+                    f"model '{request.model}'"
+                )
+            logger.warning("Reducing max_tokens to %s to fit %s's context window", room, request.model)
+            request.max_tokens = room
+        return _Candidate(config=hydrated, provider=provider, request=request, prompt_tokens=prompt_tokens)
+
+    def _flight_key(self, primary: _Candidate, options: LLMCallOptions) -> str:
+        return llm_singleflight.flight_key(
+            primary.config.provider, primary.request, options.prompt_version, options.org_id
+        )
+
+    def _cache_lookup_key(
+        self, hydrated: LLMProviderConfig, request: LLMRequest, options: LLMCallOptions
+    ) -> Optional[str]:
+        """Cache key to read from, or None when the step has not opted in or the caller bypasses the cache."""
+        if not hydrated.cache_enabled:
+            return None
+        if options.bypass_cache:
+            llm_cache.record_bypass()
+            return None
+        return llm_cache.cache_key(hydrated.provider, request, options.prompt_version, options.org_id)
+
+    async def _cache_store(self, primary: _Candidate, options: LLMCallOptions, result: str) -> None:
+        hydrated, request = primary.config, primary.request
+        await llm_cache.put(
+            llm_cache.cache_key(hydrated.provider, request, options.prompt_version, options.org_id),
+            result,
+            ttl_seconds=hydrated.cache_ttl_seconds,
+            # Tokens a cache hit saves, for the tokens-saved metric.
+            tokens=primary.prompt_tokens + llm_tokens.estimate_tokens(result, hydrated.provider, request.model),
+            provider=hydrated.provider,
+            model=request.model,
+            step=options.step,
+        )
+
+    def _env_config(self, provider: str) -> LLMProviderConfig:
+        defaults = self._env_defaults.get(provider)
+        if defaults is None:
+            defaults = self._env_defaults[provider] = env_config_for_provider(provider)
+        return defaults
 
     def _hydrate_config(self, config: LLMProviderConfig) -> LLMProviderConfig:
-        env_defaults = env_config_for_provider(config.provider)
+        """``config`` with env defaults filled in, memoized by the config's content.
+
+        The returned config is shared between calls and must not be mutated.
+        """
+        fingerprint = json.dumps(config.dict(), sort_keys=True, default=str)
+        hydrated = self._hydrated.get(fingerprint)
+        if hydrated is not None:
+            self._hydrated.move_to_end(fingerprint)
+            return hydrated
+        hydrated = self._hydrated[fingerprint] = self._merge_env_defaults(config)
+        while len(self._hydrated) > _HYDRATED_CACHE_SIZE:
+            self._hydrated.popitem(last=False)
+        return hydrated
+
+    def _merge_env_defaults(self, config: LLMProviderConfig) -> LLMProviderConfig:
+        env_defaults = self._env_config(config.provider)
 
         return LLMProviderConfig(
             provider=config.provider,
@@ -90,4 +570,13 @@ class LLMOrchestrator:
             max_tokens=config.max_tokens or env_defaults.max_tokens,
             extra_headers={**env_defaults.extra_headers, **config.extra_headers},
             extra_payload={**env_defaults.extra_payload, **config.extra_payload},
+            cache_enabled=config.cache_enabled,
+            cache_ttl_seconds=config.cache_ttl_seconds,
+            fallbacks=config.fallbacks,
+            hedge_after_ms=config.hedge_after_ms,
         )
+
+
+def _request_tokens(candidate: _Candidate) -> int:
+    """Tokens a call may consume against a TPM budget: the prompt counted in ``_candidate`` plus the completion cap."""
+    return candidate.prompt_tokens + (candidate.request.max_tokens or 0)
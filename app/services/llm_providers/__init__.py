@@ -1,6 +1,7 @@
 from .anthropic_provider import AnthropicProvider
 from .bedrock_provider import BedrockProvider
 from .deepseek_provider import DeepSeekProvider
+from .fake_provider import FakeProvider
 from .google_provider import GoogleGenerativeAIProvider
 from .openai_provider import OpenAIProvider
 
@@ -8,6 +9,7 @@ __all__ = [
     "AnthropicProvider",
     "BedrockProvider",
     "DeepSeekProvider",
+    "FakeProvider",
     "GoogleGenerativeAIProvider",
     "OpenAIProvider",
 ]
@@ -1,15 +1,16 @@
 from __future__ import annotations
 
-from typing import Any, Dict, List
+import json
+from typing import Any, AsyncGenerator, Dict, List
 
-import httpx
-
-from .base import LLMProvider, LLMRequest, ProviderNotConfiguredError, ensure_api_key
+from . import http_clients
+from .base import LLMProvider, LLMRequest, ProviderNotConfiguredError, ensure_api_key, iter_sse_data, record_usage
 
 
 class AnthropicProvider(LLMProvider):
     name = "anthropic"
-    _endpoint = "https://api.anthropic.com/v1/messages"
+    default_base_url = "https://api.anthropic.com"
+    _endpoint = f"{default_base_url}/v1/messages"
     _api_version = "2023-06-01"
 
     async def generate(self, request: LLMRequest) -> str:
@@ -24,16 +25,52 @@ class AnthropicProvider(LLMProvider):
 
         payload = self._build_payload(request)
 
-        async with httpx.AsyncClient(timeout=httpx.Timeout(60.0)) as client:
-            response = await client.post(self._endpoint, headers=headers, json=payload)
+        client = http_clients.get_client(self.name, self._endpoint)
+        response = await client.post(self._endpoint, headers=headers, json=payload)
 
         if response.status_code == 401:
             raise ProviderNotConfiguredError("Invalid Anthropic API key provided")
 
         response.raise_for_status()
         data = response.json()
+        record_usage(request, data.get("usage"), "input_tokens", "output_tokens")
         return self._extract_content(data)
 
+    async def generate_stream(self, request: LLMRequest) -> AsyncGenerator[str, None]:
+        """Stream ``text_delta`` chunks from the Messages API's server-sent events."""
+        ensure_api_key(request)
+
+        headers = {
+            "x-api-key": request.api_key,
+            "Content-Type": "application/json",
+            "anthropic-version": self._api_version,
+        }
+        headers.update(request.extra_headers)
+
+        payload = {**self._build_payload(request), "stream": True}
+
+        client = http_clients.get_client(self.name, self._endpoint)
+        async with client.stream("POST", self._endpoint, headers=headers, json=payload) as response:
+            if response.status_code == 401:
+                raise ProviderNotConfiguredError("Invalid Anthropic API key provided")
+
+            response.raise_for_status()
+
+            async for raw in iter_sse_data(response):
+                try:
+                    event = json.loads(raw)
+                except json.JSONDecodeError:
+                    continue
+                if event.get("type") == "error":
+                    error = event.get("error", {})
+                    raise RuntimeError(f"Anthropic stream error: {error.get('type')}: {error.get('message')}")
+                if event.get("type") == "content_block_delta":
+                    delta = event.get("delta", {})
+                    if delta.get("type") == "text_delta" and delta.get("text"):
+                        yield delta["text"]
+                elif event.get("type") == "message_stop":
+                    return
+
     def _build_payload(self, request: LLMRequest) -> Dict[str, Any]:
         system_messages: List[str] = [message.content for message in request.messages if message.role == "system"]
         chat_messages: List[Dict[str, str]] = [
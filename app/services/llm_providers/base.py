@@ -2,7 +2,9 @@ from __future__ import annotations
 
 import abc
 from dataclasses import dataclass, field
-from typing import Any, Dict, List, Literal, Optional
+from typing import Any, AsyncIterator, Dict, List, Literal, Optional
+
+import httpx
 
 LLMMessageRole = Literal["system", "user", "assistant"]
 
@@ -24,6 +26,8 @@ class LLMRequest:
     response_format: Literal["json", "text"] = "json"
     extra_headers: Dict[str, str] = field(default_factory=dict)
     extra_payload: Dict[str, Any] = field(default_factory=dict)
+    # Token counts reported by the provider for the last call ("prompt_tokens", "completion_tokens").
+    usage: Dict[str, int] = field(default_factory=dict)
 
 
 class LLMProvider(abc.ABC):
@@ -56,6 +60,27 @@ class ProviderNotConfiguredError(RuntimeError):
     """Raised when a provider is selected but lacks credentials or configuration."""
 
 
+def record_usage(request: LLMRequest, usage: Any, prompt_key: str, completion_key: str) -> None:
+    """Copy provider-reported token counts onto ``request.usage`` when the response includes them."""
+    if not isinstance(usage, dict):
+        return
+    prompt_tokens, completion_tokens = usage.get(prompt_key), usage.get(completion_key)
+    if isinstance(prompt_tokens, int) and isinstance(completion_tokens, int):
+        request.usage = {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens}
+
+
 def ensure_api_key(request: LLMRequest) -> None:
     if not request.api_key:
         raise ProviderNotConfiguredError("Missing API key for provider request")
+
+
+async def iter_sse_data(response: httpx.Response) -> AsyncIterator[str]:
+    """Yield the ``data:`` payloads of a server-sent event stream, stopping at ``[DONE]``."""
+    async for line in response.aiter_lines():
+        if not line.startswith("data:"):
+            continue  # blank separators, ``event:`` names and keep-alive comments
+        data = line[5:].strip()
+        if data == "[DONE]":
+            return
+        if data:
+            yield data
@@ -1,37 +1,138 @@
 from __future__ import annotations
 
 import asyncio
+import hashlib
 import json
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from functools import partial
-from typing import Any, Dict, List
+from typing import Any, AsyncGenerator, Dict, List, Optional, Tuple
 
 import boto3
+from botocore.config import Config
 
-from .base import LLMProvider, LLMRequest
+from app.core.config import settings
+
+from .base import LLMProvider, LLMRequest, record_usage
+
+_CREDENTIAL_KEYS = {"aws_region", "aws_access_key_id", "aws_secret_access_key", "aws_session_token"}
+_STREAM_DONE = object()
+# How often a reader thread waiting for queue space checks whether the consumer has gone.
+_STREAM_PUT_POLL_SECONDS = 0.1
+
+
+class _BedrockClientCache:
+    """Thread-safe LRU of ``bedrock-runtime`` clients keyed by region and a credential fingerprint.
+
+    boto3 clients are safe to share between threads once built; building one (loading the service
+    model, resolving endpoints) is the expensive part, so it happens once per credential set.
+    """
+
+    def __init__(self, max_size: int) -> None:
+        self.max_size = max_size
+        self._clients: "OrderedDict[Tuple[str, str], Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(
+        self,
+        region: str,
+        access_key_id: Optional[str],
+        secret_access_key: Optional[str],
+        session_token: Optional[str],
+    ) -> Any:
+        fingerprint = hashlib.sha256(
+            "\0".join(value or "" for value in (access_key_id, secret_access_key, session_token)).encode("utf-8")
+        ).hexdigest()
+        key = (region, fingerprint)
+        with self._lock:
+            client = self._clients.get(key)
+            if client is not None:
+                self._clients.move_to_end(key)
+                self.hits += 1
+                return client
+            self.misses += 1
+            client = boto3.client(
+                "bedrock-runtime",
+                region_name=region,
+                aws_access_key_id=access_key_id,
+                aws_secret_access_key=secret_access_key,
+                aws_session_token=session_token,
+                config=Config(
+                    connect_timeout=settings.LLM_HTTP_CONNECT_TIMEOUT_SECONDS,
+                    read_timeout=settings.LLM_HTTP_READ_TIMEOUT_SECONDS,
+                    max_pool_connections=settings.LLM_HTTP_MAX_CONNECTIONS,
+                ),
+            )
+            self._clients[key] = client
+            while len(self._clients) > self.max_size:
+                self._clients.popitem(last=False)
+            return client
+
+    def clear(self) -> None:
+        with self._lock:
+            self._clients.clear()
+
+    def get_metrics(self) -> Dict[str, int]:
+        return {"clients": len(self._clients), "hits": self.hits, "misses": self.misses}
+
+
+_client_cache = _BedrockClientCache(max_size=16)
+
+
+def get_client_cache_metrics() -> Dict[str, int]:
+    return _client_cache.get_metrics()
+
+
+_stream_executor: Optional[ThreadPoolExecutor] = None
+_stream_executor_lock = threading.Lock()
+
+
+def _stream_readers() -> ThreadPoolExecutor:
+    """Threads that read Bedrock event streams, one per open stream, bounded like the HTTP connection pool.
+
+    Kept apart from the default executor so slow streams cannot starve ``asyncio.to_thread`` callers.
+    """
+    global _stream_executor
+    with _stream_executor_lock:
+        if _stream_executor is None:
+            _stream_executor = ThreadPoolExecutor(
+                max_workers=settings.LLM_HTTP_MAX_CONNECTIONS, thread_name_prefix="bedrock-stream"
+            )
+        return _stream_executor
+
+
+def shutdown_stream_readers() -> None:
+    global _stream_executor
+    with _stream_executor_lock:
+        if _stream_executor is not None:
+            _stream_executor.shutdown(wait=False, cancel_futures=True)
+            _stream_executor = None
 
 
 class BedrockProvider(LLMProvider):
     name = "bedrock"
 
-    async def generate(self, request: LLMRequest) -> str:
+    _stream_queue_size = 64
+
+    def _client(self, request: LLMRequest) -> Any:
         aws_region = request.extra_payload.get("aws_region")
         if not aws_region:
             raise ValueError("AWS region is required for Bedrock requests")
+        return _client_cache.get(
+            aws_region,
+            request.extra_payload.get("aws_access_key_id"),
+            request.extra_payload.get("aws_secret_access_key") or request.api_key,
+            request.extra_payload.get("aws_session_token"),
+        )
 
-        aws_access_key_id = request.extra_payload.get("aws_access_key_id")
-        aws_secret_access_key = request.extra_payload.get("aws_secret_access_key") or request.api_key
-        aws_session_token = request.extra_payload.get("aws_session_token")
-
+    async def generate(self, request: LLMRequest) -> str:
+        client = self._client(request)
         payload = self._build_payload(request)
 
         def _invoke() -> str:
-            client = boto3.client(
-                "bedrock-runtime",
-                region_name=aws_region,
-                aws_access_key_id=aws_access_key_id,
-                aws_secret_access_key=aws_secret_access_key,
-                aws_session_token=aws_session_token,
-            )
             response = client.invoke_model(
                 modelId=request.model,
                 contentType="application/json",
@@ -47,8 +148,89 @@ class BedrockProvider(LLMProvider):
 
         raw_response: str = await asyncio.to_thread(partial(_invoke))
         data = json.loads(raw_response)
+        record_usage(request, data.get("usage"), "input_tokens", "output_tokens")
         return self._extract_text(data)
 
+    async def generate_stream(self, request: LLMRequest) -> AsyncGenerator[str, None]:
+        """Stream text deltas from ``invoke_model_with_response_stream``.
+
+        The blocking event stream is read on a dedicated worker thread. At most ``_stream_queue_size`` chunks are in
+        flight, so a slow consumer applies back-pressure instead of buffering the whole completion. Leaving the
+        generator early closes the stream, which unblocks the reader and ends it.
+        """
+        client = self._client(request)
+        payload = self._build_payload(request)
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue()
+        slots = threading.BoundedSemaphore(self._stream_queue_size)
+        stopped = threading.Event()
+        body_lock = threading.Lock()
+        stream: Dict[str, Any] = {}
+
+        def _send(item: Any) -> bool:
+            try:
+                loop.call_soon_threadsafe(queue.put_nowait, item)
+            except RuntimeError:  # the event loop has closed
+                stopped.set()
+                return False
+            return True
+
+        def _put(text: str) -> bool:
+            """Wait for queue space, giving up as soon as the consumer has gone."""
+            while not slots.acquire(timeout=_STREAM_PUT_POLL_SECONDS):
+                if stopped.is_set():
+                    return False
+            return not stopped.is_set() and _send(text)
+
+        def _close_body() -> None:
+            with body_lock:
+                body = stream.pop("body", None)
+            if body is not None and hasattr(body, "close"):
+                body.close()
+
+        def _read() -> None:
+            try:
+                response = client.invoke_model_with_response_stream(
+                    modelId=request.model,
+                    contentType="application/json",
+                    accept="application/json",
+                    body=json.dumps(payload).encode("utf-8"),
+                )
+                body = response.get("body")
+                with body_lock:
+                    stream["body"] = body
+                # The consumer may have left before the body existed; the finally below closes it then.
+                if stopped.is_set():
+                    return
+                for event in body or ():
+                    if stopped.is_set():
+                        break
+                    text = self._extract_stream_text(event)
+                    if text and not _put(text):
+                        break
+            except Exception as exc:  # noqa: BLE001 - re-raised on the consumer side
+                if not stopped.is_set():
+                    _send(exc)
+            finally:
+                _close_body()
+                if not stopped.is_set():
+                    _send(_STREAM_DONE)
+
+        loop.run_in_executor(_stream_readers(), _read)
+        try:
+            while True:
+                item = await queue.get()
+                if item is _STREAM_DONE:
+                    break
+                if isinstance(item, Exception):
+                    raise item
+                slots.release()
+                yield item
+        finally:
+            stopped.set()
+            # Closing the body ends a reader blocked waiting for Bedrock's next event.
+            _close_body()
+
     def _build_payload(self, request: LLMRequest) -> Dict[str, Any]:
         # Align with Anthropic message schema for Bedrock Claude models.
         system_messages: List[str] = [message.content for message in request.messages if message.role == "system"]
@@ -70,8 +252,7 @@ class BedrockProvider(LLMProvider):
                 {
                     key: value
                     for key, value in request.extra_payload.items()
-                    if key
-                    not in {"aws_region", "aws_access_key_id", "aws_secret_access_key", "aws_session_token"}
+                    if key not in _CREDENTIAL_KEYS
                 }
             )
         return payload
@@ -87,3 +268,18 @@ class BedrockProvider(LLMProvider):
         if not parts:
             raise RuntimeError("Bedrock response contained no text segments")
         return "".join(parts)
+
+    def _extract_stream_text(self, event: Dict[str, Any]) -> str:
+        chunk = event.get("chunk")
+        if chunk is None:
+            errors = [key for key in event if key.endswith("Exception")]
+            if errors:
+                detail = event[errors[0]].get("message", "") if isinstance(event[errors[0]], dict) else ""
+                raise RuntimeError(f"Bedrock stream failed with {errors[0]}: {detail}".rstrip(": "))
+            return ""
+        data = json.loads(chunk.get("bytes") or b"{}")
+        if data.get("type") == "content_block_delta":
+            delta = data.get("delta", {})
+            if delta.get("type") in (None, "text_delta"):
+                return delta.get("text", "")
+        return ""
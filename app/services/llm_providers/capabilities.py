@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from app.core.config import settings
+
+from .base import LLMProvider, LLMRequest
+
+logger = logging.getLogger(__name__)
+
+CapabilityKey = Tuple[str, str, str]  # (provider, model, base URL)
+
+# Whether each (provider, model, base URL) accepts ``response_format=json_object``, learned from live calls (a 400
+# naming response_format followed by a successful text-mode retry) or from the optional startup probe. Negatives
+# expire after LLM_JSON_MODE_NEGATIVE_TTL_SECONDS.
+_json_mode: Dict[CapabilityKey, Dict[str, Any]] = {}
+_metrics: Dict[str, int] = {"json_mode_fallbacks": 0, "text_mode_direct": 0}
+_probe: Optional[asyncio.Task] = None
+
+
+def json_mode(provider: str, model: str, base_url: str) -> Optional[bool]:
+    """Known JSON-mode support for a model behind ``base_url``, or None when it has not been seen yet."""
+    key = (provider, model, base_url)
+    entry = _json_mode.get(key)
+    if entry is None:
+        return None
+    if not entry["supported"] and _expired(entry):
+        del _json_mode[key]
+        return None
+    return entry["supported"]
+
+
+def _expired(entry: Dict[str, Any]) -> bool:
+    return datetime.utcnow() - entry["learned_at"] > timedelta(seconds=settings.LLM_JSON_MODE_NEGATIVE_TTL_SECONDS)
+
+
+def rejects_json_mode(body: str) -> bool:
+    """Whether a 400 body blames ``response_format`` itself, rather than the prompt or some other part of the payload.
+
+    OpenAI's "messages must contain the word 'json'" also names response_format, but it is about the prompt.
+    """
+    text = body.lower()
+    if "must contain the word" in text:
+        return False
+    return "response_format" in text or "json_object" in text
+
+
+def use_json_mode(provider: str, request: LLMRequest, base_url: str) -> bool:
+    """Whether to send ``request`` in JSON mode: only JSON requests, and never to a model known to reject it."""
+    if request.response_format != "json":
+        return False
+    if json_mode(provider, request.model, base_url) is False:
+        _metrics["text_mode_direct"] += 1
+        return False
+    return True
+
+
+def record_json_mode(provider: str, model: str, base_url: str, supported: bool) -> None:
+    key = (provider, model, base_url)
+    entry = _json_mode.get(key)
+    if entry is not None and entry["supported"] == supported:
+        return
+    if not supported:
+        _metrics["json_mode_fallbacks"] += 1
+        logger.info("%s model %s at %s does not support JSON mode; using text mode from now on", provider, model, base_url)
+    _json_mode[key] = {"supported": supported, "learned_at": datetime.utcnow()}
+
+
+def reset(provider: Optional[str] = None) -> int:
+    """Forget learned capabilities (for one provider, or all); returns how many entries were removed."""
+    keys = [key for key in _json_mode if provider is None or key[0] == provider]
+    for key in keys:
+        del _json_mode[key]
+    return len(keys)
+
+
+async def _run_probes(probes: List[Tuple[LLMProvider, LLMRequest]]) -> None:
+    # Each provider records what it learns while handling the request; failures only mean nothing was learned.
+    results = await asyncio.gather(*(provider.generate(request) for provider, request in probes), return_exceptions=True)
+    for (provider, request), result in zip(probes, results):
+        if isinstance(result, Exception):
+            logger.warning("JSON mode probe for %s model %s failed: %s", provider.name, request.model, result)
+
+
+def start_probe(probes: Iterable[Tuple[LLMProvider, LLMRequest]]) -> None:
+    """Probe JSON-mode support in the background so startup is not held up by provider round trips."""
+    global _probe
+    probes = list(probes)
+    if _probe is not None or not probes:
+        return
+    _probe = asyncio.create_task(_run_probes(probes))
+
+
+async def stop() -> None:
+    global _probe
+    if _probe is not None:
+        _probe.cancel()
+        await asyncio.gather(_probe, return_exceptions=True)
+    _probe = None
+
+
+def get_metrics() -> Dict[str, Any]:
+    return {
+        **_metrics,
+        "probe_running": _probe is not None and not _probe.done(),
+        "json_mode": [
+            {"provider": provider, "model": model, "base_url": base_url, **entry}
+            for (provider, model, base_url), entry in sorted(_json_mode.items())
+        ],
+    }
@@ -0,0 +1,329 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import os
+import random
+import re
+import tempfile
+from dataclasses import replace
+from datetime import datetime
+from typing import Any, AsyncGenerator, Dict, List, Mapping, Optional, Tuple
+
+import httpx
+
+from app.core.config import settings
+
+from .base import LLMProvider, LLMRequest
+
+# Keys of ``extra_payload`` that configure the fake provider; they are stripped before calling an upstream.
+#   fake_mode               "synthetic" (default), "record" or "replay"
+#   fake_latency_ms         delay before the response (or the first streamed chunk), at most LLM_FAKE_MAX_LATENCY_MS
+#   fake_tokens_per_second  pace of streamed chunks and of the non-streamed body, at least
+#                           LLM_FAKE_MIN_TOKENS_PER_SECOND; 0 disables pacing
+#   fake_error_rate         probability (0-1) that a call fails
+#   fake_error_status       HTTP status of injected failures (default 503), or "timeout"
+#   fake_cassette           cassette name for record/replay (default "default")
+#   fake_upstream           provider whose real responses are recorded, e.g. "openai"
+FAKE_KEYS = {
+    "fake_mode",
+    "fake_latency_ms",
+    "fake_tokens_per_second",
+    "fake_error_rate",
+    "fake_error_status",
+    "fake_cassette",
+    "fake_upstream",
+}
+
+# Top-level keys the workflow parses per step, in the order they are checked against the instruction.
+_STEP_KEYS = (
+    "core_skills",
+    "candidate_analysis",
+    "ranked_shortlist",
+    "detailed_readout",
+    "engagement_plan",
+    "fairness_guidance",
+    "interview_preparation",
+)
+
+_TOKEN = re.compile(r"\S+\s*|\s+")
+
+
+class FakeProvider(LLMProvider):
+    """Offline provider for load tests and demos: synthetic step JSON, paced streams, injected errors and cassettes.
+
+    ``upstreams`` is the orchestrator's provider registry; record mode calls the real provider named by
+    ``fake_upstream`` with the same request and stores its answer.
+    """
+
+    name = "fake"
+
+    def __init__(self, upstreams: Optional[Mapping[str, LLMProvider]] = None) -> None:
+        self._upstreams = upstreams if upstreams is not None else {}
+        self._cassette_lock = asyncio.Lock()
+
+    async def generate(self, request: LLMRequest) -> str:
+        options = request.extra_payload
+        mode = options.get("fake_mode", "synthetic")
+        if mode == "record":
+            return await self._record(request)
+
+        await asyncio.sleep(_latency_seconds(options))
+        self._maybe_fail(request)
+        text = await self._replay(request) if mode == "replay" else _synthetic_response(request)
+        pace = _pace(options)
+        if pace > 0:
+            await asyncio.sleep(len(_TOKEN.findall(text)) / pace)
+        return text
+
+    async def generate_stream(self, request: LLMRequest) -> AsyncGenerator[str, None]:
+        options = request.extra_payload
+        mode = options.get("fake_mode", "synthetic")
+        if mode == "record":
+            chunks: List[str] = []
+            async for chunk in self._upstream(request).generate_stream(_upstream_request(request)):
+                chunks.append(chunk)
+                yield chunk
+            await self._store(request, "".join(chunks), chunks)
+            return
+
+        await asyncio.sleep(_latency_seconds(options))
+        self._maybe_fail(request)
+        if mode == "replay":
+            entry = await self._lookup(request)
+            chunks = entry.get("chunks") or _TOKEN.findall(entry["response"])
+        else:
+            chunks = _TOKEN.findall(_synthetic_response(request))
+        pace = _pace(options)
+        for chunk in chunks:
+            if pace > 0:
+                await asyncio.sleep(1 / pace)
+            yield chunk
+
+    def supports_response_format(self, response_format: str) -> bool:
+        return True
+
+    def _maybe_fail(self, request: LLMRequest) -> None:
+        rate = float(request.extra_payload.get("fake_error_rate", 0))
+        if rate <= 0 or random.random() >= rate:
+            return
+        status = request.extra_payload.get("fake_error_status", 503)
+        fake_request = httpx.Request("POST", f"https://fake.invalid/{request.model}")
+        if status == "timeout":
+            raise httpx.ReadTimeout("Injected fake provider timeout", request=fake_request)
+        response = httpx.Response(int(status), request=fake_request, headers={"retry-after": "1"})
+        raise httpx.HTTPStatusError(f"Injected fake provider error {status}", request=fake_request, response=response)
+
+    # Record / replay
+
+    def _upstream(self, request: LLMRequest) -> LLMProvider:
+        name = request.extra_payload.get("fake_upstream")
+        upstream = self._upstreams.get(name) if name else None
+        if upstream is None or upstream is self:
+            raise ValueError("Fake provider record mode needs 'fake_upstream' set to a real provider")
+        return upstream
+
+    async def _record(self, request: LLMRequest) -> str:
+        text = await self._upstream(request).generate(_upstream_request(request))
+        await self._store(request, text, None)
+        return text
+
+    async def _replay(self, request: LLMRequest) -> str:
+        return (await self._lookup(request))["response"]
+
+    async def _lookup(self, request: LLMRequest) -> Dict[str, Any]:
+        cassette = await asyncio.to_thread(_load_cassette, _cassette_path(request))
+        entry = cassette.get(_interaction_key(request))
+        if entry is None:
+            raise RuntimeError(
+                f"No recorded response in cassette '{request.extra_payload.get('fake_cassette', 'default')}' for this request"
+            )
+        return entry
+
+    async def _store(self, request: LLMRequest, text: str, chunks: Optional[List[str]]) -> None:
+        path = _cassette_path(request)
+        entry = {
+            "model": request.model,
+            "response": text,
+            "chunks": chunks,
+            "recorded_at": datetime.utcnow().isoformat(),
+        }
+        async with self._cassette_lock:
+            await asyncio.to_thread(_write_interaction, path, _interaction_key(request), entry)
+
+
+def _latency_seconds(options: Mapping[str, Any]) -> float:
+    latency_ms = min(max(float(options.get("fake_latency_ms", 0)), 0.0), settings.LLM_FAKE_MAX_LATENCY_MS)
+    return latency_ms / 1000
+
+
+def _pace(options: Mapping[str, Any]) -> float:
+    """Tokens per second to pace output at, or 0 for no pacing."""
+    pace = float(options.get("fake_tokens_per_second", 0))
+    if pace <= 0:
+        return 0.0
+    return max(pace, settings.LLM_FAKE_MIN_TOKENS_PER_SECOND)
+
+
+def _upstream_request(request: LLMRequest) -> LLMRequest:
+    # The fake config's base_url is never validated against the upstream's allowed hosts, so record mode always
+    # calls the upstream's default endpoint.
+    return replace(
+        request,
+        base_url=None,
+        extra_payload={key: value for key, value in request.extra_payload.items() if key not in FAKE_KEYS},
+        usage={},
+    )
+
+
+def _interaction_key(request: LLMRequest) -> str:
+    """Everything that determines the upstream answer, so a replay matches only the same call."""
+    material = {
+        "model": request.model,
+        "messages": [[message.role, message.content] for message in request.messages],
+        "temperature": request.temperature,
+        "max_tokens": request.max_tokens,
+        "response_format": request.response_format,
+    }
+    encoded = json.dumps(material, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def _cassette_path(request: LLMRequest) -> str:
+    name = str(request.extra_payload.get("fake_cassette", "default"))
+    if not re.fullmatch(r"[A-Za-z0-9_.-]+", name) or name.startswith("."):
+        raise ValueError(f"Invalid cassette name '{name}'")
+    return os.path.join(settings.LLM_FAKE_CASSETTE_DIR, f"{name}.json")
+
+
+def _load_cassette(path: str) -> Dict[str, Any]:
+    try:
+        with open(path, encoding="utf-8") as handle:
+            return json.load(handle)
+    except FileNotFoundError:
+        return {}
+
+
+def _write_interaction(path: str, key: str, entry: Dict[str, Any]) -> None:
+    cassette = _load_cassette(path)
+    cassette[key] = entry
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    # Write to a temporary file first so a crash never leaves a half-written cassette.
+    handle, temporary = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    with os.fdopen(handle, "w", encoding="utf-8") as stream:
+        json.dump(cassette, stream, ensure_ascii=False, indent=1, sort_keys=True)
+    os.replace(temporary, path)
+
+
+# Synthetic responses
+
+
+def _split_prompt(request: LLMRequest) -> Tuple[str, Dict[str, Any]]:
+    """The last user message's instruction and the workflow JSON context that follows it (if any)."""
+    content = next((message.content for message in reversed(request.messages) if message.role == "user"), "")
+    instruction, separator, tail = content.rpartition("\n{")
+    if not separator:
+        return content, {}
+    try:
+        context = json.loads("{" + tail)
+    except json.JSONDecodeError:
+        return content, {}
+    return instruction, context if isinstance(context, dict) else {}
+
+
+def _candidates(context: Dict[str, Any]) -> List[Tuple[str, str]]:
+    candidates = []
+    for index, item in enumerate(context.get("candidates") or []):
+        if not isinstance(item, dict):
+            continue
+        candidate_id = item.get("candidate_id") or item.get("resume_id") or f"candidate-{index + 1}"
+        candidates.append((str(candidate_id), str(item.get("candidate_name") or f"Candidate {index + 1}")))
+    return candidates or [("candidate-1", "Candidate 1")]
+
+
+def _synthetic_response(request: LLMRequest) -> str:
+    instruction, context = _split_prompt(request)
+    # Seeded by the prompt so identical calls get identical answers (and cache keys stay meaningful).
+    rng = random.Random(hashlib.sha256(instruction.encode("utf-8") + json.dumps(context, sort_keys=True).encode("utf-8")).digest())
+    step = next((key for key in _STEP_KEYS if key in instruction), None)
+    if step is None and (request.response_format == "text" or "markdown" in instruction.lower()):
+        return _markdown(context, rng)
+    return json.dumps(_step_payload(step, context, rng), ensure_ascii=False)
+
+
+def _markdown(context: Dict[str, Any], rng: random.Random) -> str:
+    title = (context.get("job") or {}).get("title") or "the role"
+    lines = [f"## Summary for {title}", "", "Synthetic analysis generated by the fake LLM provider.", "", "## Candidates", ""]
+    for _, name in _candidates(context):
+        lines.append(f"- **{name}**: fit score {rng.randint(55, 95)}; strengths in delivery and collaboration.")
+    lines += ["", "## Recommendations", "", "Advance the top candidates to a structured interview."]
+    return "\n".join(lines)
+
+
+def _step_payload(step: Optional[str], context: Dict[str, Any], rng: random.Random) -> Dict[str, Any]:
+    candidates = _candidates(context)
+    skills = ["Python", "System design", "Stakeholder communication"]
+    if step == "core_skills":
+        return {"core_skills": [{"name": skill, "reason": f"{skill} is central to the role."} for skill in skills]}
+    if step == "candidate_analysis":
+        return {
+            "ai_analysis_markdown": _markdown(context, rng),
+            "candidate_analysis": [
+                {
+                    "candidate_id": candidate_id,
+                    "name": name,
+                    "match_score": rng.randint(55, 95),
+                    "bias_free_score": rng.randint(55, 95),
+                    "summary": f"{name} meets most of the core requirements.",
+                    "highlights": ["Relevant experience", "Strong delivery record"],
+                    "skill_alignment": [
+                        {"skill": skill, "status": rng.choice(["Yes", "Partial", "No"]), "evidence": "Resume history"}
+                        for skill in skills
+                    ],
+                }
+                for candidate_id, name in candidates
+            ],
+        }
+    if step == "ranked_shortlist":
+        return {
+            "ranked_shortlist": [
+                {
+                    "candidate_id": candidate_id,
+                    "rank": rank,
+                    "priority": "High" if rank == 1 else "Medium",
+                    "status": "Advance" if rank <= 2 else "Hold",
+                    "availability": "Two weeks",
+                    "notes": f"{name} ranked {rank}.",
+                }
+                for rank, (candidate_id, name) in enumerate(candidates, start=1)
+            ]
+        }
+    if step == "detailed_readout":
+        return {
+            "detailed_readout": [
+                {
+                    "candidate_id": candidate_id,
+                    "strengths": ["Hands-on delivery"],
+                    "risks": ["Limited domain exposure"],
+                    "recommended_actions": ["Probe system design depth"],
+                }
+                for candidate_id, _ in candidates
+            ]
+        }
+    if step in ("engagement_plan", "fairness_guidance"):
+        return {
+            step: [
+                {"label": f"Action {index}", "value": f"Synthetic {step.replace('_', ' ')} item {index}", "helper": None}
+                for index in range(1, 4)
+            ]
+        }
+    if step == "interview_preparation":
+        return {
+            "interview_preparation": [
+                {"question": f"Walk us through a project that used {skill}.", "rationale": f"Checks depth in {skill}."}
+                for skill in skills
+            ]
+        }
+    return {"result": "ok", "candidates": [candidate_id for candidate_id, _ in candidates]}
@@ -1,15 +1,17 @@
 from __future__ import annotations
 
-from typing import Any, Dict, List
+import json
+from typing import Any, AsyncGenerator, Dict, List
 
-import httpx
-
-from .base import LLMProvider, LLMRequest, ProviderNotConfiguredError, ensure_api_key
+from . import http_clients
+from .base import LLMProvider, LLMRequest, ProviderNotConfiguredError, ensure_api_key, iter_sse_data, record_usage
 
 
 class GoogleGenerativeAIProvider(LLMProvider):
     name = "google"
-    _endpoint = "https://generativelanguage.googleapis.com/v1beta/models/{model}:generateContent"
+    default_base_url = "https://generativelanguage.googleapis.com"
+    _endpoint = default_base_url + "/v1beta/models/{model}:generateContent"
+    _stream_endpoint = default_base_url + "/v1beta/models/{model}:streamGenerateContent"
 
     async def generate(self, request: LLMRequest) -> str:
         ensure_api_key(request)
@@ -21,16 +23,45 @@ class GoogleGenerativeAIProvider(LLMProvider):
 
         payload = self._build_payload(request)
 
-        async with httpx.AsyncClient(timeout=httpx.Timeout(60.0)) as client:
-            response = await client.post(url, params=params, headers=headers, json=payload)
+        client = http_clients.get_client(self.name, url)
+        response = await client.post(url, params=params, headers=headers, json=payload)
 
         if response.status_code == 401 or response.status_code == 403:
             raise ProviderNotConfiguredError("Google Generative AI rejected the API key or model access")
 
         response.raise_for_status()
         data = response.json()
+        record_usage(request, data.get("usageMetadata"), "promptTokenCount", "candidatesTokenCount")
         return self._extract_text(data)
 
+    async def generate_stream(self, request: LLMRequest) -> AsyncGenerator[str, None]:
+        """Stream text parts from ``streamGenerateContent`` using its server-sent events mode."""
+        ensure_api_key(request)
+
+        url = self._stream_endpoint.format(model=request.model)
+        params = {"key": request.api_key, "alt": "sse"}
+        headers = {"Content-Type": "application/json"}
+        headers.update(request.extra_headers)
+
+        payload = self._build_payload(request)
+
+        client = http_clients.get_client(self.name, url)
+        async with client.stream("POST", url, params=params, headers=headers, json=payload) as response:
+            if response.status_code == 401 or response.status_code == 403:
+                raise ProviderNotConfiguredError("Google Generative AI rejected the API key or model access")
+
+            response.raise_for_status()
+
+            async for raw in iter_sse_data(response):
+                try:
+                    data = json.loads(raw)
+                except json.JSONDecodeError:
+                    continue
+                for candidate in data.get("candidates", [])[:1]:
+                    for part in candidate.get("content", {}).get("parts", []):
+                        if part.get("text"):
+                            yield part["text"]
+
     def _build_payload(self, request: LLMRequest) -> Dict[str, Any]:
         system_prompt_parts: List[str] = [message.content for message in request.messages if message.role == "system"]
         user_messages: List[Dict[str, Any]] = []
@@ -0,0 +1,173 @@
+from __future__ import annotations
+
+import logging
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+from urllib.parse import urlsplit
+
+import httpx
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+try:  # HTTP/2 needs the optional ``h2`` package (``httpx[http2]``)
+    import h2  # noqa: F401
+
+    _HTTP2_AVAILABLE = True
+except ImportError:  # pragma: no cover - depends on the environment
+    _HTTP2_AVAILABLE = False
+
+ClientKey = Tuple[str, str]
+
+
+def _origin(url: str) -> str:
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}".lower()
+
+
+class _ClientStats:
+    """Counters fed by httpcore's ``trace`` extension for one pooled client."""
+
+    def __init__(self) -> None:
+        self.requests = 0
+        self.connections_opened = 0
+        self.tls_handshakes = 0
+        self.http2_requests = 0
+        self.errors = 0
+
+    async def on_request(self, request: httpx.Request) -> None:
+        self.requests += 1
+        request.extensions["trace"] = self._trace
+
+    async def _trace(self, event: str, info: Dict[str, Any]) -> None:
+        if event == "connection.connect_tcp.complete":
+            self.connections_opened += 1
+        elif event == "connection.start_tls.complete":
+            self.tls_handshakes += 1
+        elif event == "http2.send_request_headers.started":
+            self.http2_requests += 1
+        elif event.endswith(".failed"):
+            self.errors += 1
+
+    def as_dict(self) -> Dict[str, Any]:
+        reused = max(self.requests - self.connections_opened, 0)
+        return {
+            "requests": self.requests,
+            "connections_opened": self.connections_opened,
+            "reused_requests": reused,
+            "reuse_ratio": round(reused / self.requests, 3) if self.requests else None,
+            "tls_handshakes": self.tls_handshakes,
+            "http2_requests": self.http2_requests,
+            "errors": self.errors,
+        }
+
+
+class LLMHTTPClients:
+    """Long-lived ``httpx.AsyncClient`` instances shared by the LLM providers.
+
+    One client is kept per (provider, base URL origin) so keep-alive connections, TLS sessions and
+    HTTP/2 streams are reused across workflow calls. Clients are created at startup for the
+    configured providers, lazily for anything else (admin-supplied base URLs, scripts), and closed
+    on shutdown. ``transport`` lets tests route every client to an in-process app.
+    """
+
+    def __init__(
+        self,
+        *,
+        connect_timeout: float,
+        read_timeout: float,
+        max_connections: int,
+        max_keepalive_connections: int,
+        keepalive_expiry: float,
+        http2: bool,
+        transport_factory: Optional[Callable[[], httpx.AsyncBaseTransport]] = None,
+    ) -> None:
+        self.timeout = httpx.Timeout(read_timeout, connect=connect_timeout)
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self.http2 = http2 and _HTTP2_AVAILABLE
+        if http2 and not _HTTP2_AVAILABLE:
+            logger.warning("LLM_HTTP2 is enabled but the 'h2' package is missing; falling back to HTTP/1.1")
+        self.transport_factory = transport_factory
+        self._clients: Dict[ClientKey, httpx.AsyncClient] = {}
+        self._stats: Dict[ClientKey, _ClientStats] = {}
+
+    def get(self, provider: str, url: str) -> httpx.AsyncClient:
+        """Return the shared client for ``provider`` talking to ``url``'s origin."""
+        key = (provider, _origin(url))
+        client = self._clients.get(key)
+        if client is None or client.is_closed:
+            stats = self._stats.setdefault(key, _ClientStats())
+            client = httpx.AsyncClient(
+                timeout=self.timeout,
+                limits=self.limits,
+                http2=self.http2,
+                transport=self.transport_factory() if self.transport_factory else None,
+                event_hooks={"request": [stats.on_request]},
+            )
+            self._clients[key] = client
+        return client
+
+    def start(self, endpoints: Iterable[Tuple[str, str]]) -> None:
+        for provider, url in endpoints:
+            self.get(provider, url)
+
+    async def aclose(self) -> None:
+        clients, self._clients = list(self._clients.values()), {}
+        for client in clients:
+            await client.aclose()
+
+    def get_metrics(self) -> Dict[str, Any]:
+        return {
+            "http2": self.http2,
+            "timeout": {"connect": self.timeout.connect, "read": self.timeout.read},
+            "limits": {
+                "max_connections": self.limits.max_connections,
+                "max_keepalive_connections": self.limits.max_keepalive_connections,
+                "keepalive_expiry": self.limits.keepalive_expiry,
+            },
+            "clients": [
+                {
+                    "provider": provider,
+                    "origin": origin,
+                    "open": (provider, origin) in self._clients,
+                    **stats.as_dict(),
+                }
+                for (provider, origin), stats in sorted(self._stats.items())
+            ],
+        }
+
+
+_clients = LLMHTTPClients(
+    connect_timeout=settings.LLM_HTTP_CONNECT_TIMEOUT_SECONDS,
+    read_timeout=settings.LLM_HTTP_READ_TIMEOUT_SECONDS,
+    max_connections=settings.LLM_HTTP_MAX_CONNECTIONS,
+    max_keepalive_connections=settings.LLM_HTTP_MAX_KEEPALIVE_CONNECTIONS,
+    keepalive_expiry=settings.LLM_HTTP_KEEPALIVE_EXPIRY_SECONDS,
+    http2=settings.LLM_HTTP2,
+)
+
+
+def get_client(provider: str, url: str) -> httpx.AsyncClient:
+    return _clients.get(provider, url)
+
+
+def start(endpoints: Iterable[Tuple[str, str]]) -> None:
+    """Create the clients for ``(provider, url)`` pairs up front."""
+    _clients.start(endpoints)
+
+
+async def aclose() -> None:
+    await _clients.aclose()
+
+
+def get_metrics() -> Dict[str, Any]:
+    return _clients.get_metrics()
+
+
+def set_transport_factory(factory: Optional[Callable[[], httpx.AsyncBaseTransport]]) -> None:
+    """Route newly created clients through ``factory()`` (tests); existing clients are unaffected."""
+    _clients.transport_factory = factory
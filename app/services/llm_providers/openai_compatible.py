@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+import json
+from typing import Any, AsyncGenerator, Dict, List
+
+import httpx
+
+from . import capabilities, http_clients
+from .base import LLMProvider, LLMRequest, ProviderNotConfiguredError, ensure_api_key, iter_sse_data, record_usage
+
+
+class OpenAICompatibleProvider(LLMProvider):
+    """Chat Completions API client shared by OpenAI and the providers that mirror its wire format.
+
+    Subclasses set ``name``, ``label`` and ``default_base_url``. JSON requests use ``response_format=json_object``
+    and fall back to text mode when a model rejects it.
+    """
+
+    name: str
+    # Human-readable provider name for error messages.
+    label: str
+    default_base_url: str
+
+    async def generate(self, request: LLMRequest) -> str:
+        ensure_api_key(request)
+
+        base_url = request.base_url or self.default_base_url
+        url = f"{base_url.rstrip('/')}/chat/completions"
+        headers = {
+            "Authorization": f"Bearer {request.api_key}",
+            "Content-Type": "application/json",
+        }
+        headers.update(request.extra_headers)
+
+        json_mode = capabilities.use_json_mode(self.name, request, base_url)
+        payload = self._build_payload(request, force_text=not json_mode)
+
+        client = http_clients.get_client(self.name, url)
+        response = await client.post(url, headers=headers, json=payload)
+
+        if response.status_code == 401:
+            raise ProviderNotConfiguredError(f"Invalid {self.label} API key provided")
+
+        if response.status_code == 400 and json_mode:
+            # Retry without JSON mode; only remember the model when the error was about response_format itself.
+            fallback_payload = self._build_payload(request, force_text=True)
+            retry_response = await client.post(url, headers=headers, json=fallback_payload)
+            retry_response.raise_for_status()
+            if capabilities.rejects_json_mode(response.text):
+                capabilities.record_json_mode(self.name, request.model, base_url, False)
+            retry_data = retry_response.json()
+            record_usage(request, retry_data.get("usage"), "prompt_tokens", "completion_tokens")
+            return self._extract_text(retry_data)
+
+        response.raise_for_status()
+        data = response.json()
+        record_usage(request, data.get("usage"), "prompt_tokens", "completion_tokens")
+
+        if json_mode:
+            capabilities.record_json_mode(self.name, request.model, base_url, True)
+            return self._extract_json(data)
+        return self._extract_text(data)
+
+    async def generate_stream(self, request: LLMRequest) -> AsyncGenerator[str, None]:
+        """Generate content with streaming support (token by token)."""
+        ensure_api_key(request)
+
+        base_url = request.base_url or self.default_base_url
+        url = f"{base_url.rstrip('/')}/chat/completions"
+        headers = {
+            "Authorization": f"Bearer {request.api_key}",
+            "Content-Type": "application/json",
+        }
+        headers.update(request.extra_headers)
+
+        json_mode = capabilities.use_json_mode(self.name, request, base_url)
+        payload = self._build_payload(request, force_text=not json_mode)
+        payload["stream"] = True  # Enable streaming
+
+        client = http_clients.get_client(self.name, url)
+        async with client.stream("POST", url, headers=headers, json=payload) as response:
+            if response.status_code == 401:
+                raise ProviderNotConfiguredError(f"Invalid {self.label} API key provided")
+
+            if not (response.status_code == 400 and json_mode):
+                response.raise_for_status()
+                if json_mode:
+                    capabilities.record_json_mode(self.name, request.model, base_url, True)
+                async for content in self._iter_deltas(response):
+                    yield content
+                return
+            rejected = capabilities.rejects_json_mode((await response.aread()).decode("utf-8", "replace"))
+
+        # Retry without JSON mode; only remember the model when the error was about response_format itself.
+        fallback_payload = {**self._build_payload(request, force_text=True), "stream": True}
+        async with client.stream("POST", url, headers=headers, json=fallback_payload) as response:
+            response.raise_for_status()
+            if rejected:
+                capabilities.record_json_mode(self.name, request.model, base_url, False)
+            async for content in self._iter_deltas(response):
+                yield content
+
+    async def _iter_deltas(self, response: httpx.Response) -> AsyncGenerator[str, None]:
+        async for raw in iter_sse_data(response):
+            try:
+                data = json.loads(raw)
+            except json.JSONDecodeError:
+                continue
+            choices = data.get("choices", [])
+            if choices:
+                content = choices[0].get("delta", {}).get("content", "")
+                if content:
+                    yield content
+
+    def _build_payload(self, request: LLMRequest, *, force_text: bool = False) -> Dict[str, Any]:
+        messages: List[Dict[str, str]] = [
+            {"role": message.role, "content": message.content} for message in request.messages
+        ]
+        payload: Dict[str, Any] = {
+            "model": request.model,
+            "messages": messages,
+            "temperature": request.temperature,
+        }
+        if request.max_tokens is not None:
+            payload["max_tokens"] = request.max_tokens
+
+        if request.response_format == "json" and not force_text:
+            payload["response_format"] = {"type": "json_object"}
+
+        if request.extra_payload:
+            payload.update(request.extra_payload)
+        return payload
+
+    def _extract_json(self, data: Dict[str, Any]) -> str:
+        choice = data.get("choices", [{}])[0]
+        message = choice.get("message", {})
+        content = message.get("content")
+        if not content:
+            raise RuntimeError(f"{self.label} response missing JSON content")
+        return content
+
+    def _extract_text(self, data: Dict[str, Any]) -> str:
+        choice = data.get("choices", [{}])[0]
+        message = choice.get("message", {})
+        content = message.get("content")
+        if content is None:
+            raise RuntimeError(f"{self.label} response missing text content")
+        if isinstance(content, list):
+            # Some responses stream chunks; concatenate text segments.
+            return "".join(part.get("text", "") for part in content if isinstance(part, dict))
+        return str(content)
@@ -0,0 +1,214 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, AsyncIterator, Dict, Optional, Tuple
+
+from app.core.config import settings
+
+LimiterKey = Tuple[str, str, str]
+
+
+class RateLimitTimeoutError(RuntimeError):
+    """Raised when a caller waits longer than the queue timeout for provider capacity."""
+
+
+@dataclass(frozen=True)
+class ProviderLimits:
+    concurrency: int
+    requests_per_minute: int  # 0 disables the budget
+    tokens_per_minute: int  # 0 disables the budget
+    queue_timeout: float
+
+
+class _TokenBucket:
+    """Continuously refilling bucket holding at most one minute of budget."""
+
+    def __init__(self, per_minute: int) -> None:
+        self.capacity = float(per_minute)
+        self.available = float(per_minute)
+        self._refill_per_second = per_minute / 60.0
+        self._updated = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.available = min(self.capacity, self.available + (now - self._updated) * self._refill_per_second)
+        self._updated = now
+
+    def delay_for(self, amount: float) -> float:
+        """Seconds until ``amount`` is available (0 when it already is)."""
+        self._refill()
+        shortfall = min(amount, self.capacity) - self.available
+        return max(shortfall / self._refill_per_second, 0.0)
+
+    def take(self, amount: float) -> None:
+        self._refill()
+        self.available -= min(amount, self.capacity)
+
+
+class _KeyLimiter:
+    """Concurrency slots and RPM/TPM buckets for one (provider, model, org).
+
+    Admission is serialised by an ``asyncio.Lock`` whose waiters are woken in FIFO order, so the
+    caller at the head of the queue waits for a slot and budget while later callers wait behind it
+    instead of overtaking it whenever a smaller request would fit.
+    """
+
+    def __init__(self, limits: ProviderLimits) -> None:
+        self.limits = limits
+        self._admission = asyncio.Lock()
+        self._slots = asyncio.Semaphore(limits.concurrency)
+        self._requests = _TokenBucket(limits.requests_per_minute) if limits.requests_per_minute else None
+        self._tokens = _TokenBucket(limits.tokens_per_minute) if limits.tokens_per_minute else None
+        self.blocked_until = 0.0
+        self.waiting = 0
+        self.in_flight = 0
+        self.metrics: Dict[str, float] = {
+            "admitted": 0,
+            "timeouts": 0,
+            "throttled": 0,
+            "total_wait_ms": 0.0,
+            "max_wait_ms": 0.0,
+        }
+
+    async def _admit(self, tokens: int) -> None:
+        async with self._admission:
+            await self._slots.acquire()
+            try:
+                while True:
+                    delay = max(self.blocked_until - time.monotonic(), 0.0)
+                    if self._requests:
+                        delay = max(delay, self._requests.delay_for(1))
+                    if self._tokens:
+                        delay = max(delay, self._tokens.delay_for(tokens))
+                    if delay <= 0:
+                        break
+                    await asyncio.sleep(delay)
+            except BaseException:
+                self._slots.release()
+                raise
+            if self._requests:
+                self._requests.take(1)
+            if self._tokens:
+                self._tokens.take(tokens)
+
+    @asynccontextmanager
+    async def slot(self, tokens: int) -> AsyncIterator[None]:
+        started = time.perf_counter()
+        self.waiting += 1
+        try:
+            await asyncio.wait_for(self._admit(tokens), timeout=self.limits.queue_timeout)
+        except asyncio.TimeoutError as exc:
+            self.metrics["timeouts"] += 1
+            raise RateLimitTimeoutError(
+                f"Timed out after {self.limits.queue_timeout:.0f}s waiting for LLM provider capacity"
+            ) from exc
+        finally:
+            self.waiting -= 1
+        waited_ms = (time.perf_counter() - started) * 1000
+        self.metrics["admitted"] += 1
+        self.metrics["total_wait_ms"] += waited_ms
+        self.metrics["max_wait_ms"] = max(self.metrics["max_wait_ms"], waited_ms)
+
+        self.in_flight += 1
+        try:
+            yield
+        finally:
+            self.in_flight -= 1
+            self._slots.release()
+
+    def block_for(self, seconds: float) -> None:
+        """Hold back new admissions after the provider answered 429."""
+        self.metrics["throttled"] += 1
+        self.blocked_until = max(self.blocked_until, time.monotonic() + seconds)
+
+    def snapshot(self) -> Dict[str, Any]:
+        admitted = self.metrics["admitted"]
+        return {
+            "concurrency": self.limits.concurrency,
+            "requests_per_minute": self.limits.requests_per_minute,
+            "tokens_per_minute": self.limits.tokens_per_minute,
+            "queue_depth": self.waiting,
+            "in_flight": self.in_flight,
+            "admitted": int(admitted),
+            "timeouts": int(self.metrics["timeouts"]),
+            "throttled": int(self.metrics["throttled"]),
+            "avg_wait_ms": round(self.metrics["total_wait_ms"] / admitted, 1) if admitted else 0.0,
+            "max_wait_ms": round(self.metrics["max_wait_ms"], 1),
+            "blocked_for_seconds": round(max(self.blocked_until - time.monotonic(), 0.0), 1),
+        }
+
+
+def _configured_overrides() -> Dict[str, Dict[str, Any]]:
+    if not settings.LLM_RATE_LIMITS:
+        return {}
+    return json.loads(settings.LLM_RATE_LIMITS)
+
+
+def limits_for(provider: str, model: str) -> ProviderLimits:
+    """Defaults from settings, overridden by ``LLM_RATE_LIMITS`` entries for ``provider`` then ``provider:model``."""
+    values: Dict[str, Any] = {
+        "concurrency": settings.LLM_MAX_CONCURRENCY,
+        "requests_per_minute": settings.LLM_REQUESTS_PER_MINUTE,
+        "tokens_per_minute": settings.LLM_TOKENS_PER_MINUTE,
+        "queue_timeout": settings.LLM_QUEUE_TIMEOUT_SECONDS,
+    }
+    overrides = _configured_overrides()
+    for name in (provider, f"{provider}:{model}"):
+        values.update(overrides.get(name, {}))
+    return ProviderLimits(**values)
+
+
+def parse_retry_after(value: Optional[str], default: float) -> float:
+    """Seconds to wait from a ``Retry-After`` header (delta-seconds or HTTP date)."""
+    if not value:
+        return default
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return default
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max((retry_at - datetime.now(timezone.utc)).total_seconds(), 0.0)
+
+
+_limiters: Dict[LimiterKey, _KeyLimiter] = {}
+
+
+def _limiter(provider: str, model: str, org_id: Optional[str]) -> _KeyLimiter:
+    key = (provider, model, org_id or "-")
+    limiter = _limiters.get(key)
+    if limiter is None:
+        limiter = _limiters[key] = _KeyLimiter(limits_for(provider, model))
+    return limiter
+
+
+def slot(provider: str, model: str, org_id: Optional[str], tokens: int):
+    """Async context manager holding a concurrency slot and RPM/TPM budget for one provider call."""
+    return _limiter(provider, model, org_id).slot(tokens)
+
+
+def block_for(provider: str, model: str, org_id: Optional[str], seconds: float) -> None:
+    _limiter(provider, model, org_id).block_for(seconds)
+
+
+def get_metrics() -> Dict[str, Any]:
+    return {
+        "limiters": [
+            {"provider": provider, "model": model, "org_id": None if org == "-" else org, **limiter.snapshot()}
+            for (provider, model, org), limiter in sorted(_limiters.items())
+        ]
+    }
+
+
+def reset() -> None:
+    _limiters.clear()
@@ -0,0 +1,190 @@
+from __future__ import annotations
+
+import random
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Deque, Dict, Optional
+
+import httpx
+from botocore.exceptions import ClientError, ConnectionError as BotoConnectionError, ReadTimeoutError
+
+from app.core.config import settings
+
+# Bedrock error codes worth retrying; throttling is left to the rate limiter's 429 handling.
+_TRANSIENT_BEDROCK_CODES = {
+    "InternalServerException",
+    "ModelTimeoutException",
+    "ServiceUnavailableException",
+    "ModelNotReadyException",
+}
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised without calling the provider while its circuit breaker is open."""
+
+
+def is_transient(exc: BaseException) -> bool:
+    """Timeouts, connection failures and 5xx responses: worth retrying and counted by the breaker."""
+    if isinstance(exc, httpx.HTTPStatusError):
+        return exc.response.status_code >= 500 or exc.response.status_code == 408
+    if isinstance(exc, (httpx.TimeoutException, httpx.TransportError)):
+        return True
+    if isinstance(exc, ClientError):
+        return exc.response.get("Error", {}).get("Code") in _TRANSIENT_BEDROCK_CODES
+    return isinstance(exc, (BotoConnectionError, ReadTimeoutError))
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    max_attempts: int
+    base_delay: float
+    max_delay: float
+
+    def delay(self, retry: int) -> float:
+        """Full-jitter exponential backoff for the ``retry``-th retry (1-based)."""
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (retry - 1)))
+
+
+class RetryBudget:
+    """Caps retries at ``min_retries`` plus ``ratio`` of the calls made in the last ``window`` seconds.
+
+    While a provider is failing broadly, most calls stop retrying instead of multiplying its load.
+    """
+
+    def __init__(self, *, ratio: float, min_retries: int, window: float = 60.0) -> None:
+        self.ratio = ratio
+        self.min_retries = min_retries
+        self.window = window
+        self._calls: Deque[float] = deque()
+        self._retries: Deque[float] = deque()
+        self.exhausted = 0
+
+    def _trim(self, now: float) -> None:
+        for events in (self._calls, self._retries):
+            while events and events[0] < now - self.window:
+                events.popleft()
+
+    def record_call(self) -> None:
+        self._calls.append(time.monotonic())
+
+    def try_spend(self) -> bool:
+        now = time.monotonic()
+        self._trim(now)
+        if len(self._retries) >= self.min_retries + self.ratio * len(self._calls):
+            self.exhausted += 1
+            return False
+        self._retries.append(now)
+        return True
+
+    def snapshot(self) -> Dict[str, Any]:
+        self._trim(time.monotonic())
+        return {"calls": len(self._calls), "retries": len(self._retries), "exhausted": self.exhausted}
+
+
+class CircuitBreaker:
+    """Closed -> open after ``failure_threshold`` consecutive transient failures -> half-open after ``reset_timeout``.
+
+    Half-open lets a single probe call through; its success closes the circuit, its failure re-opens it.
+    """
+
+    def __init__(self, *, failure_threshold: int, reset_timeout: float) -> None:
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = "closed"
+        self.consecutive_failures = 0
+        self.opened_at: Optional[float] = None
+        self.times_opened = 0
+        self.rejected = 0
+        self.last_error: Optional[str] = None
+        self._probe_in_flight = False
+
+    def before_call(self, provider: str) -> None:
+        if self.state == "open":
+            if time.monotonic() - (self.opened_at or 0.0) < self.reset_timeout:
+                self.rejected += 1
+                raise CircuitOpenError(f"Provider '{provider}' is unavailable (circuit open after repeated failures)")
+            self.state = "half_open"
+        if self.state == "half_open":
+            if self._probe_in_flight:
+                self.rejected += 1
+                raise CircuitOpenError(f"Provider '{provider}' is recovering; a probe request is in flight")
+            self._probe_in_flight = True
+
+    def record_success(self) -> None:
+        self.state = "closed"
+        self.consecutive_failures = 0
+        self._probe_in_flight = False
+
+    def record_failure(self, exc: BaseException) -> None:
+        self.consecutive_failures += 1
+        self.last_error = f"{type(exc).__name__}: {exc}"[:300]
+        if self.state == "half_open" or self.consecutive_failures >= self.failure_threshold:
+            if self.state != "open":
+                self.times_opened += 1
+            self.state = "open"
+            self.opened_at = time.monotonic()
+        self._probe_in_flight = False
+
+    def release(self) -> None:
+        """End a call that neither succeeded nor failed transiently (e.g. a 4xx) without changing state."""
+        self._probe_in_flight = False
+
+    def snapshot(self) -> Dict[str, Any]:
+        retry_in = None
+        if self.state == "open" and self.opened_at is not None:
+            retry_in = round(max(self.reset_timeout - (time.monotonic() - self.opened_at), 0.0), 1)
+        return {
+            "state": self.state,
+            "consecutive_failures": self.consecutive_failures,
+            "times_opened": self.times_opened,
+            "rejected": self.rejected,
+            "retry_in_seconds": retry_in,
+            "last_error": self.last_error,
+        }
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_budgets: Dict[str, RetryBudget] = {}
+
+
+def retry_policy() -> RetryPolicy:
+    return RetryPolicy(
+        max_attempts=settings.LLM_RETRY_MAX_ATTEMPTS,
+        base_delay=settings.LLM_RETRY_BASE_DELAY_SECONDS,
+        max_delay=settings.LLM_RETRY_MAX_DELAY_SECONDS,
+    )
+
+
+def breaker(provider: str) -> CircuitBreaker:
+    if provider not in _breakers:
+        _breakers[provider] = CircuitBreaker(
+            failure_threshold=settings.LLM_CIRCUIT_FAILURE_THRESHOLD,
+            reset_timeout=settings.LLM_CIRCUIT_RESET_SECONDS,
+        )
+    return _breakers[provider]
+
+
+def budget(provider: str) -> RetryBudget:
+    if provider not in _budgets:
+        _budgets[provider] = RetryBudget(ratio=settings.LLM_RETRY_BUDGET_RATIO, min_retries=settings.LLM_RETRY_BUDGET_MIN)
+    return _budgets[provider]
+
+
+def get_metrics() -> Dict[str, Any]:
+    providers = sorted(set(_breakers) | set(_budgets))
+    return {
+        "providers": [
+            {"provider": name, "circuit": breaker(name).snapshot(), "retry_budget": budget(name).snapshot()}
+            for name in providers
+        ]
+    }
+
+
+def reset(provider: Optional[str] = None) -> None:
+    """Close the breaker and forget retry history for ``provider`` (or every provider)."""
+    for registry in (_breakers, _budgets):
+        if provider is None:
+            registry.clear()
+        else:
+            registry.pop(provider, None)
@@ -126,6 +126,8 @@ def _config_from_env(provider: str | None = None) -> LLMProviderConfig:
         )
         _validate_base_url(config.provider, config.base_url)
         return config
+    if target == "fake":
+        return LLMProviderConfig(provider="fake", model=settings.LLM_FAKE_MODEL)
     raise ValueError(f"Unsupported LLM provider '{target}' in environment configuration")
 
 
@@ -191,6 +193,10 @@ def _merge_config(new_config: LLMProviderConfig, existing: LLMProviderConfig | N
         max_tokens=_normalise_max_tokens(new_config.max_tokens),
         extra_headers={**existing.extra_headers, **new_config.extra_headers},
         extra_payload=merged_payload,
+        cache_enabled=new_config.cache_enabled,
+        cache_ttl_seconds=new_config.cache_ttl_seconds,
+        fallbacks=new_config.fallbacks,
+        hedge_after_ms=new_config.hedge_after_ms,
     )
     _validate_base_url(merged_config.provider, merged_config.base_url)
     return merged_config
@@ -229,6 +235,10 @@ def _config_from_document(document: Dict[str, Any]) -> LLMProviderConfig:
         max_tokens=data.get("max_tokens"),
         extra_headers=data.get("extra_headers", {}),
         extra_payload=extra_payload,
+        cache_enabled=data.get("cache_enabled", False),
+        cache_ttl_seconds=data.get("cache_ttl_seconds"),
+        fallbacks=data.get("fallbacks", []),
+        hedge_after_ms=data.get("hedge_after_ms"),
     )
     _validate_base_url(config.provider, config.base_url)
     return config
@@ -239,13 +249,15 @@ _ALLOWED_BASE_HOST_SUFFIXES: Dict[str, tuple[str, ...]] = {
     "anthropic": ("api.anthropic.com",),
     "google": ("generativelanguage.googleapis.com",),
     "deepseek": ("api.deepseek.com",),
-    # Bedrock uses the AWS SDK instead of HTTP base URLs, so we ignore base_url.
+    # Bedrock uses the AWS SDK and the fake provider only calls upstreams at their default endpoints, so base_url is
+    # ignored for both.
     "bedrock": tuple(),
+    "fake": tuple(),
 }
 
 
 def _validate_base_url(provider: str, base_url: Optional[str]) -> None:
-    if not base_url or provider == "bedrock":
+    if not base_url or provider in {"bedrock", "fake"}:
         return
 
     parsed = urlparse(base_url)
@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional
+
+from app.services import llm_cache
+from app.services.llm_providers.base import LLMRequest
+
+_metrics: Dict[str, int] = {
+    "calls_led": 0,
+    "calls_coalesced": 0,
+    "streams_led": 0,
+    "streams_coalesced": 0,
+}
+
+
+def flight_key(provider: str, request: LLMRequest, prompt_version: Optional[str], org_id: Optional[str]) -> str:
+    """Identical calls share a flight only within one org, endpoint and credential, so nobody is billed for
+    another's request. The cache key already carries that scope."""
+    return llm_cache.cache_key(provider, request, prompt_version, org_id)
+
+
+class _Flight:
+    def __init__(self, task: "asyncio.Future[str]") -> None:
+        self.task = task
+        self.waiters = 0
+
+
+class _Broadcast:
+    """Runs one token stream in a task and replays it to every subscriber, including late joiners."""
+
+    def __init__(self, source: AsyncIterator[str]) -> None:
+        self.chunks: List[str] = []
+        self.done = False
+        self.error: Optional[BaseException] = None
+        self.subscribers = 0
+        self._updated = asyncio.Event()
+        self.task = asyncio.ensure_future(self._pump(source))
+
+    def _notify(self) -> None:
+        self._updated.set()
+        self._updated = asyncio.Event()
+
+    async def _pump(self, source: AsyncIterator[str]) -> None:
+        try:
+            async for chunk in source:
+                self.chunks.append(chunk)
+                self._notify()
+        except BaseException as exc:  # noqa: BLE001 - handed to every subscriber instead
+            self.error = exc
+        finally:
+            self.done = True
+            self._notify()
+
+    async def subscribe(self) -> AsyncIterator[str]:
+        index = 0
+        while True:
+            while index < len(self.chunks):
+                yield self.chunks[index]
+                index += 1
+            if self.done:
+                if self.error is not None:
+                    raise self.error
+                return
+            await self._updated.wait()
+
+
+_calls: Dict[str, _Flight] = {}
+_streams: Dict[str, _Broadcast] = {}
+
+
+def _forget(registry: Dict[str, Any], key: str, entry: Any) -> None:
+    if registry.get(key) is entry:
+        del registry[key]
+
+
+async def do(key: str, factory: Callable[[], Awaitable[str]]) -> str:
+    """Run ``factory()`` once for concurrent callers with the same ``key``; all of them get its result or error.
+
+    A caller that is cancelled leaves the others waiting; the call is only cancelled once every caller has gone.
+    """
+    flight = _calls.get(key)
+    if flight is None:
+        flight = _calls[key] = _Flight(asyncio.ensure_future(factory()))
+        flight.task.add_done_callback(lambda _: _forget(_calls, key, flight))
+        _metrics["calls_led"] += 1
+    else:
+        _metrics["calls_coalesced"] += 1
+
+    flight.waiters += 1
+    try:
+        return await asyncio.shield(flight.task)
+    finally:
+        flight.waiters -= 1
+        if flight.waiters == 0 and not flight.task.done():
+            flight.task.cancel()
+
+
+async def stream(key: str, factory: Callable[[], AsyncIterator[str]]) -> AsyncIterator[str]:
+    """Fan one ``factory()`` token stream out to every concurrent subscriber with the same ``key``."""
+    broadcast = _streams.get(key)
+    if broadcast is None:
+        broadcast = _streams[key] = _Broadcast(factory())
+        broadcast.task.add_done_callback(lambda _: _forget(_streams, key, broadcast))
+        _metrics["streams_led"] += 1
+    else:
+        _metrics["streams_coalesced"] += 1
+
+    broadcast.subscribers += 1
+    try:
+        async for chunk in broadcast.subscribe():
+            yield chunk
+    finally:
+        broadcast.subscribers -= 1
+        if broadcast.subscribers == 0 and not broadcast.task.done():
+            broadcast.task.cancel()
+
+
+def get_metrics() -> Dict[str, Any]:
+    return {
+        **_metrics,
+        "calls_in_flight": len(_calls),
+        "streams_in_flight": len(_streams),
+        "stream_subscribers": sum(broadcast.subscribers for broadcast in _streams.values()),
+    }
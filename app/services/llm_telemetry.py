@@ -0,0 +1,296 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+from collections import deque
+from datetime import datetime, timedelta
+from functools import lru_cache
+from typing import Any, Deque, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import httpx
+from pymongo import ASCENDING, UpdateOne
+
+from app.core.config import settings
+from app.core.database import db
+
+logger = logging.getLogger(__name__)
+
+DIMENSIONS = ("provider", "model", "step", "org_id")
+
+# USD per million (input, output) tokens by (provider, model prefix); the first matching prefix wins.
+_PRICES: Dict[str, List[Tuple[str, Tuple[float, float]]]] = {
+    "openai": [
+        ("gpt-4o-mini", (0.15, 0.60)),
+        ("gpt-4o", (2.50, 10.00)),
+        ("gpt-4.1-nano", (0.10, 0.40)),
+        ("gpt-4.1-mini", (0.40, 1.60)),
+        ("gpt-4.1", (2.00, 8.00)),
+        ("gpt-3.5-turbo", (0.50, 1.50)),
+    ],
+    "anthropic": [
+        ("claude-3-5-haiku", (0.80, 4.00)),
+        ("claude-3-haiku", (0.25, 1.25)),
+        ("claude-3-opus", (15.00, 75.00)),
+        ("claude-3", (3.00, 15.00)),
+    ],
+    "google": [("gemini-1.5-flash", (0.075, 0.30)), ("gemini-1.5-pro", (1.25, 5.00))],
+    "deepseek": [("deepseek-chat", (0.27, 1.10)), ("deepseek-reasoner", (0.55, 2.19))],
+    "bedrock": [
+        ("anthropic.claude-3-haiku", (0.25, 1.25)),
+        ("anthropic.claude-3-opus", (15.00, 75.00)),
+        ("anthropic.claude-3", (3.00, 15.00)),
+    ],
+}
+
+_buffer: Deque[Dict[str, Any]] = deque(maxlen=settings.LLM_TELEMETRY_BUFFER_SIZE)
+_wakeup: Optional[asyncio.Event] = None
+_writer: Optional[asyncio.Task] = None
+_metrics: Dict[str, int] = {"recorded": 0, "written": 0, "dropped": 0, "flush_failures": 0}
+
+
+def _collection():
+    return db.llm_telemetry
+
+
+async def ensure_indexes() -> None:
+    await _collection().create_index(
+        [("bucket", ASCENDING), *((name, ASCENDING) for name in DIMENSIONS)], unique=True
+    )
+    await _collection().create_index(
+        [("bucket", ASCENDING)], expireAfterSeconds=settings.LLM_TELEMETRY_RETENTION_DAYS * 86400, name="bucket_ttl"
+    )
+
+
+@lru_cache(maxsize=4)
+def _parse_prices(raw: Optional[str]) -> Dict[str, List[float]]:
+    return json.loads(raw) if raw else {}
+
+
+def _configured_prices() -> Dict[str, List[float]]:
+    # Keyed by the raw setting, so it is parsed once per value rather than on every call.
+    return _parse_prices(settings.LLM_PRICES)
+
+
+def cost_usd(provider: str, model: str, prompt_tokens: int, completion_tokens: int) -> float:
+    """Call cost from ``LLM_PRICES`` (``provider:model`` then ``provider``) or the built-in list; 0 when unknown."""
+    overrides = _configured_prices()
+    prices = next((overrides[name] for name in (f"{provider}:{model}", provider) if name in overrides), None)
+    if prices is None:
+        prices = next((price for prefix, price in _PRICES.get(provider, []) if model.startswith(prefix)), (0.0, 0.0))
+    return (prompt_tokens * prices[0] + completion_tokens * prices[1]) / 1_000_000
+
+
+def error_class(exc: BaseException) -> str:
+    """Stable label for grouping failures, with the status code for HTTP errors."""
+    if isinstance(exc, httpx.HTTPStatusError):
+        return f"HTTPStatusError({exc.response.status_code})"
+    return type(exc).__name__
+
+
+def record(
+    *,
+    provider: str,
+    model: str,
+    step: Optional[str],
+    org_id: Optional[str],
+    latency_ms: float,
+    ttfb_ms: Optional[float] = None,
+    prompt_tokens: int = 0,
+    completion_tokens: int = 0,
+    cache_hit: bool = False,
+    error: Optional[BaseException] = None,
+) -> None:
+    """Queue one call record for the background writer; never blocks and never raises."""
+    if not settings.LLM_TELEMETRY_ENABLED:
+        return
+    if len(_buffer) == _buffer.maxlen:
+        _metrics["dropped"] += 1
+    _buffer.append(
+        {
+            "at": datetime.utcnow(),
+            "provider": provider,
+            "model": model,
+            "step": step,
+            "org_id": org_id,
+            "latency_ms": round(latency_ms, 1),
+            "ttfb_ms": round(ttfb_ms, 1) if ttfb_ms is not None else None,
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "cost_usd": cost_usd(provider, model, prompt_tokens, completion_tokens),
+            "cache_hit": cache_hit,
+            "error": error_class(error) if error is not None else None,
+        }
+    )
+    _metrics["recorded"] += 1
+    if _wakeup is not None and len(_buffer) >= settings.LLM_TELEMETRY_BATCH_SIZE:
+        _wakeup.set()
+
+
+def _bucket_start(moment: datetime) -> datetime:
+    minutes = settings.LLM_TELEMETRY_BUCKET_MINUTES
+    minute_of_day = moment.hour * 60 + moment.minute
+    start = moment.replace(hour=0, minute=0, second=0, microsecond=0)
+    return start + timedelta(minutes=minute_of_day - minute_of_day % minutes)
+
+
+def _bucket_updates(batch: Iterable[Dict[str, Any]]) -> List[Tuple[Dict[str, Any], Dict[str, Any]]]:
+    """One upsert per (bucket, provider, model, step, org): counters are incremented and samples appended."""
+    grouped: Dict[Tuple[Any, ...], List[Dict[str, Any]]] = {}
+    for item in batch:
+        key = (_bucket_start(item["at"]), *(item[name] for name in DIMENSIONS))
+        grouped.setdefault(key, []).append(item)
+
+    updates = []
+    for (bucket, *dimensions), items in grouped.items():
+        error_counts: Dict[str, int] = {}
+        for item in items:
+            if item["error"]:
+                error_counts[item["error"]] = error_counts.get(item["error"], 0) + 1
+        updates.append(
+            (
+                {"bucket": bucket, **dict(zip(DIMENSIONS, dimensions))},
+                {
+                    "$inc": {
+                        "calls": len(items),
+                        "cache_hits": sum(1 for item in items if item["cache_hit"]),
+                        "errors": sum(error_counts.values()),
+                        "prompt_tokens": sum(item["prompt_tokens"] for item in items),
+                        "completion_tokens": sum(item["completion_tokens"] for item in items),
+                        "cost_usd": sum(item["cost_usd"] for item in items),
+                        **{f"error_classes.{name}": count for name, count in error_counts.items()},
+                    },
+                    "$push": {
+                        "samples": {
+                            "$each": [
+                                {key: item[key] for key in ("at", "latency_ms", "ttfb_ms", "cache_hit", "error")}
+                                for item in items
+                            ],
+                            "$slice": -settings.LLM_TELEMETRY_MAX_SAMPLES_PER_BUCKET,
+                        }
+                    },
+                },
+            )
+        )
+    return updates
+
+
+async def flush() -> int:
+    """Write everything buffered so far; returns the number of records written."""
+    batch = []
+    while _buffer:
+        batch.append(_buffer.popleft())
+    if not batch:
+        return 0
+    operations = [UpdateOne(query, update, upsert=True) for query, update in _bucket_updates(batch)]
+    try:
+        await _collection().bulk_write(operations, ordered=False)
+    except Exception as exc:  # noqa: BLE001 - telemetry must never take the writer (or a request) down
+        logger.warning("Dropping %s LLM telemetry records: %s", len(batch), exc)
+        _metrics["flush_failures"] += 1
+        _metrics["dropped"] += len(batch)
+        return 0
+    _metrics["written"] += len(batch)
+    return len(batch)
+
+
+async def _run() -> None:
+    assert _wakeup is not None
+    while True:
+        try:
+            await asyncio.wait_for(_wakeup.wait(), timeout=settings.LLM_TELEMETRY_FLUSH_SECONDS)
+        except asyncio.TimeoutError:
+            pass
+        _wakeup.clear()
+        await flush()
+
+
+def start() -> None:
+    """Start the background writer that flushes every few seconds or once a batch has filled."""
+    global _wakeup, _writer
+    if _writer is not None:
+        return
+    _wakeup = asyncio.Event()
+    _writer = asyncio.create_task(_run())
+
+
+async def stop() -> None:
+    global _wakeup, _writer
+    if _writer is not None:
+        _writer.cancel()
+        await asyncio.gather(_writer, return_exceptions=True)
+    _writer = None
+    _wakeup = None
+    await flush()
+
+
+def _percentile(values: Sequence[float], fraction: float) -> Optional[float]:
+    if not values:
+        return None
+    ordered = sorted(values)
+    return round(ordered[min(int(fraction * len(ordered)), len(ordered) - 1)], 1)
+
+
+def summarise(documents: Iterable[Dict[str, Any]], group_by: Sequence[str]) -> List[Dict[str, Any]]:
+    """Fold bucket documents into one row per ``group_by`` combination, most expensive first."""
+    groups: Dict[Tuple[Any, ...], Dict[str, Any]] = {}
+    for document in documents:
+        key = tuple(document.get(name) for name in group_by)
+        group = groups.setdefault(
+            key,
+            {
+                "calls": 0,
+                "cache_hits": 0,
+                "errors": 0,
+                "prompt_tokens": 0,
+                "completion_tokens": 0,
+                "cost_usd": 0.0,
+                "error_classes": {},
+                "latency": [],
+                "ttfb": [],
+            },
+        )
+        for counter in ("calls", "cache_hits", "errors", "prompt_tokens", "completion_tokens", "cost_usd"):
+            group[counter] += document.get(counter, 0)
+        for name, count in (document.get("error_classes") or {}).items():
+            group["error_classes"][name] = group["error_classes"].get(name, 0) + count
+        for sample in document.get("samples", []):
+            if sample.get("cache_hit") or sample.get("error"):
+                continue
+            group["latency"].append(sample["latency_ms"])
+            if sample.get("ttfb_ms") is not None:
+                group["ttfb"].append(sample["ttfb_ms"])
+
+    rows = []
+    for key, group in groups.items():
+        latency, ttfb = group.pop("latency"), group.pop("ttfb")
+        calls = group["calls"]
+        rows.append(
+            {
+                **dict(zip(group_by, key)),
+                **group,
+                "cost_usd": round(group["cost_usd"], 6),
+                "error_rate": round(group["errors"] / calls, 4) if calls else 0.0,
+                "cache_hit_rate": round(group["cache_hits"] / calls, 4) if calls else 0.0,
+                "latency_p50_ms": _percentile(latency, 0.5),
+                "latency_p95_ms": _percentile(latency, 0.95),
+                "ttfb_p50_ms": _percentile(ttfb, 0.5),
+                "ttfb_p95_ms": _percentile(ttfb, 0.95),
+            }
+        )
+    return sorted(rows, key=lambda row: row["cost_usd"], reverse=True)
+
+
+async def aggregate(*, group_by: Sequence[str], since: datetime, until: Optional[datetime] = None) -> List[Dict[str, Any]]:
+    unknown = [name for name in group_by if name not in DIMENSIONS]
+    if unknown:
+        raise ValueError(f"Unknown telemetry dimension(s): {', '.join(unknown)}; use {', '.join(DIMENSIONS)}")
+    window: Dict[str, Any] = {"$gte": _bucket_start(since)}
+    if until is not None:
+        window["$lt"] = until
+    documents = await _collection().find({"bucket": window}).to_list(length=None)
+    return summarise(documents, group_by)
+
+
+def get_metrics() -> Dict[str, Any]:
+    return {**_metrics, "buffered": len(_buffer), "writer_running": _writer is not None}
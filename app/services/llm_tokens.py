@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import json
+import math
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from app.core.config import settings
+from app.services.llm_providers.base import LLMMessage
+
+
+class ContextWindowExceededError(ValueError):
+    """Raised when a prompt cannot fit a model's context window even after trimming."""
+
+
+@dataclass(frozen=True)
+class _FamilyProfile:
+    letters_per_token: float  # average letters per token inside ASCII words
+    symbols_per_token: float  # punctuation runs such as ``":"`` or ``},{`` merge into fewer tokens
+    digits_per_token: int
+    message_overhead: int  # role markers and separators added around each message
+    reply_overhead: int  # tokens priming the assistant turn
+
+
+# Rough fits to each vendor's tokenizer on resume and job description JSON, rounded towards over-counting.
+_FAMILIES: Dict[str, _FamilyProfile] = {
+    "openai": _FamilyProfile(letters_per_token=4.2, symbols_per_token=2.0, digits_per_token=3, message_overhead=4, reply_overhead=3),
+    "anthropic": _FamilyProfile(letters_per_token=3.6, symbols_per_token=1.5, digits_per_token=1, message_overhead=5, reply_overhead=3),
+    "google": _FamilyProfile(letters_per_token=4.0, symbols_per_token=1.5, digits_per_token=1, message_overhead=4, reply_overhead=2),
+    "deepseek": _FamilyProfile(letters_per_token=3.8, symbols_per_token=1.5, digits_per_token=1, message_overhead=4, reply_overhead=3),
+}
+
+# Context windows by (provider, model prefix); the first matching prefix wins, so more specific ones come first.
+_CONTEXT_WINDOWS: Dict[str, List[Tuple[str, int]]] = {
+    "openai": [
+        ("gpt-4.1", 1_047_576),
+        ("gpt-4o", 128_000),
+        ("gpt-4-turbo", 128_000),
+        ("gpt-4-32k", 32_768),
+        ("gpt-4", 8_192),
+        ("gpt-3.5-turbo", 16_385),
+        ("o1", 200_000),
+        ("o3", 200_000),
+        ("o4", 200_000),
+        ("", 128_000),
+    ],
+    "anthropic": [("claude-2.0", 100_000), ("", 200_000)],
+    "google": [("gemini-1.5-pro", 2_097_152), ("gemini-1.0", 32_760), ("", 1_048_576)],
+    "deepseek": [("", 64_000)],
+    "bedrock": [("anthropic.", 200_000), ("meta.llama3", 8_192), ("amazon.titan", 8_192), ("", 32_000)],
+}
+
+_WORD = re.compile(r"[A-Za-z]+|\d+|[^\sA-Za-z\d]+|\s+")
+
+
+def family(provider: str, model: str = "") -> str:
+    """Tokenizer family of a provider; Bedrock models are counted with their vendor's tokenizer."""
+    if provider == "bedrock":
+        return "anthropic" if "anthropic." in model else "openai"
+    return provider if provider in _FAMILIES else "openai"
+
+
+def estimate_tokens(text: str, provider: str, model: str = "") -> int:
+    """Local, dependency-free token estimate of ``text`` for a provider family."""
+    profile = _FAMILIES[family(provider, model)]
+    tokens = 0
+    for piece in _WORD.findall(text):
+        head = piece[0]
+        if head.isspace():
+            # A single space is folded into the next word; newlines and indentation cost tokens.
+            tokens += 0 if piece == " " else math.ceil(len(piece) / 4)
+        elif head.isascii() and head.isalpha():
+            tokens += max(1, round(len(piece) / profile.letters_per_token))
+        elif head.isdigit():
+            tokens += math.ceil(len(piece) / profile.digits_per_token)
+        else:
+            ascii_symbols = sum(1 for char in piece if char.isascii())
+            # Non-ASCII letters (accents, CJK) run close to one token per character.
+            tokens += math.ceil(ascii_symbols / profile.symbols_per_token) + (len(piece) - ascii_symbols)
+    return tokens
+
+
+def count_messages(messages: Iterable[LLMMessage], provider: str, model: str = "") -> int:
+    profile = _FAMILIES[family(provider, model)]
+    total = profile.reply_overhead
+    for message in messages:
+        total += profile.message_overhead + estimate_tokens(message.content, provider, model)
+    return total
+
+
+@lru_cache(maxsize=4)
+def _parse_windows(raw: Optional[str]) -> Dict[str, int]:
+    return json.loads(raw) if raw else {}
+
+
+def _configured_windows() -> Dict[str, int]:
+    # Keyed by the raw setting, so it is parsed once per value rather than on every call.
+    return _parse_windows(settings.LLM_CONTEXT_WINDOWS)
+
+
+def context_window(provider: str, model: str) -> int:
+    """Context window in tokens, overridden by ``LLM_CONTEXT_WINDOWS`` entries for ``provider:model`` then ``provider``."""
+    overrides = _configured_windows()
+    for name in (f"{provider}:{model}", provider):
+        if name in overrides:
+            return int(overrides[name])
+    for prefix, window in _CONTEXT_WINDOWS.get(provider, [("", 32_000)]):
+        if model.startswith(prefix):
+            return window
+    return 32_000
+
+
+def completion_reserve(max_tokens: Optional[int]) -> int:
+    """Tokens kept free for the response: the call's ``max_tokens`` or ``LLM_COMPLETION_RESERVE_TOKENS``."""
+    return max_tokens or settings.LLM_COMPLETION_RESERVE_TOKENS
+
+
+def prompt_budget(provider: str, model: str, max_tokens: Optional[int]) -> int:
+    """Tokens a prompt may use once the completion is reserved."""
+    return context_window(provider, model) - completion_reserve(max_tokens)
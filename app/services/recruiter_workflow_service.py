@@ -4,8 +4,10 @@ import asyncio
 import json
 import logging
 import re
-from typing import AsyncGenerator, Dict, Iterable, List, Optional
+from dataclasses import replace
+from typing import Any, AsyncGenerator, Dict, Iterable, List, Optional, Tuple
 
+from app.core.config import settings
 from app.models.llm_model import LLMProviderConfig, LLMWorkflowSettings
 from app.models.recruiter_workflow import (
     CandidateAnalysis,
@@ -21,7 +23,9 @@ from app.models.recruiter_workflow import (
     SkillAlignment,
 )
 from app.services import candidate_service, resume_service
-from app.services.llm_orchestrator import LLMOrchestrator
+from app.services.documents import summarise_resume
+from app.services.llm_context_budget import ContextBudget, FitReport
+from app.services.llm_orchestrator import LLMCallOptions, LLMOrchestrator
 from app.services.llm_providers.base import LLMMessage
 from app.services.prompt_service import get_prompt_by_name
 from app.services import llm_settings_service
@@ -45,28 +49,54 @@ _STEP_ORDER = [
     "interview_preparation",
 ]
 
+# Applied to every candidate, in order, until the context fits the smallest step model: least useful fields first.
+_CONTEXT_TRIMS = [
+    ("resume_updated_at", None),
+    ("candidate_preferences", None),
+    ("resume_sections", 600),
+    ("candidate_skills", 20),
+    ("resume_skills", 30),
+    ("resume_sections", 200),
+    ("resume_preview", 800),
+    ("resume_summary", 600),
+    ("resume_sections", None),
+    ("resume_preview", None),
+]
+
 
-async def generate_workflow(payload: RecruiterWorkflowRequest) -> RecruiterWorkflowResponse:
+async def generate_workflow(
+    payload: RecruiterWorkflowRequest,
+    *,
+    orchestrator: LLMOrchestrator,
+    bypass_cache: bool = False,
+    org_id: Optional[str] = None,
+    authenticated: bool = False,
+) -> RecruiterWorkflowResponse:
     if not payload.job_description.strip():
         raise ValueError("job_description is required")
     if not payload.resumes:
         raise ValueError("At least one resume must be provided")
 
-    orchestrator = LLMOrchestrator()
-    workflow_settings = await llm_settings_service.get_settings()
+    workflow_settings = await llm_settings_service.get_settings(org_id=org_id)
+    run_options = LLMCallOptions(
+        bypass_cache=bypass_cache,
+        org_id=org_id,
+        credentials=(workflow_settings.default, *workflow_settings.steps.values()),
+    )
 
     resume_contexts = await _load_resume_context(payload.resumes)
-    context_json = _render_context(payload.job_metadata, payload.job_description, resume_contexts)
-
-    step_configs = _resolve_step_configs(payload, workflow_settings)
+    step_configs = _resolve_step_configs(payload, workflow_settings, authenticated=authenticated)
+    context_json, _ = _render_context(
+        payload.job_metadata, payload.job_description, resume_contexts, _context_budget(orchestrator, step_configs)
+    )
 
-    core_result = await _invoke_core_skills(orchestrator, step_configs["core_skills"], context_json)
-    analysis_result = await _invoke_ai_analysis(orchestrator, step_configs["ai_analysis"], context_json)
-    shortlist_result = await _invoke_ranked_shortlist(orchestrator, step_configs["ranked_shortlist"], context_json)
-    readout_result = await _invoke_detailed_readout(orchestrator, step_configs["detailed_readout"], context_json)
-    engagement_result = await _invoke_engagement_plan(orchestrator, step_configs["engagement_plan"], context_json)
-    fairness_result = await _invoke_fairness_guidance(orchestrator, step_configs["fairness_guidance"], context_json)
-    interview_result = await _invoke_interview_pack(orchestrator, step_configs["interview_preparation"], context_json)
+    core_result = await _invoke_core_skills(orchestrator, step_configs["core_skills"], context_json, run_options)
+    analysis_result = await _invoke_ai_analysis(orchestrator, step_configs["ai_analysis"], context_json, run_options)
+    shortlist_result = await _invoke_ranked_shortlist(orchestrator, step_configs["ranked_shortlist"], context_json, run_options)
+    readout_result = await _invoke_detailed_readout(orchestrator, step_configs["detailed_readout"], context_json, run_options)
+    engagement_result = await _invoke_engagement_plan(orchestrator, step_configs["engagement_plan"], context_json, run_options)
+    fairness_result = await _invoke_fairness_guidance(orchestrator, step_configs["fairness_guidance"], context_json, run_options)
+    interview_result = await _invoke_interview_pack(orchestrator, step_configs["interview_preparation"], context_json, run_options)
 
     return RecruiterWorkflowResponse(
         job=payload.job_metadata,
@@ -81,25 +111,44 @@ async def generate_workflow(payload: RecruiterWorkflowRequest) -> RecruiterWorkf
     )
 
 
-async def generate_workflow_stream(payload: RecruiterWorkflowRequest) -> AsyncGenerator[Dict, None]:
+async def generate_workflow_stream(
+    payload: RecruiterWorkflowRequest,
+    *,
+    orchestrator: LLMOrchestrator,
+    bypass_cache: bool = False,
+    org_id: Optional[str] = None,
+    authenticated: bool = False,
+) -> AsyncGenerator[Dict, None]:
     """Generate workflow with streaming updates for each step."""
     if not payload.job_description.strip():
         raise ValueError("job_description is required")
     if not payload.resumes:
         raise ValueError("At least one resume must be provided")
 
-    orchestrator = LLMOrchestrator()
-    workflow_settings = await llm_settings_service.get_settings()
+    workflow_settings = await llm_settings_service.get_settings(org_id=org_id)
+    run_options = LLMCallOptions(
+        bypass_cache=bypass_cache,
+        org_id=org_id,
+        credentials=(workflow_settings.default, *workflow_settings.steps.values()),
+    )
 
     yield {"type": "status", "step": "loading", "message": "Loading resume contexts..."}
     resume_contexts = await _load_resume_context(payload.resumes)
-    context_json = _render_context(payload.job_metadata, payload.job_description, resume_contexts)
-    step_configs = _resolve_step_configs(payload, workflow_settings)
+    step_configs = _resolve_step_configs(payload, workflow_settings, authenticated=authenticated)
+    context_json, fit_report = _render_context(
+        payload.job_metadata, payload.job_description, resume_contexts, _context_budget(orchestrator, step_configs)
+    )
+    if fit_report.dropped_items:
+        yield {
+            "type": "status",
+            "step": "loading",
+            "message": f"Left out the last {fit_report.dropped_items} resumes to fit the model's context window",
+        }
 
     # Step 1: Core Skills
     yield {"type": "status", "step": "core_skills", "message": "Analyzing core must-have skills..."}
     await asyncio.sleep(0.5)  # Small delay for visual feedback
-    core_result = await _invoke_core_skills(orchestrator, step_configs["core_skills"], context_json)
+    core_result = await _invoke_core_skills(orchestrator, step_configs["core_skills"], context_json, run_options)
     yield {"type": "result", "step": "core_skills", "data": [skill.dict() for skill in core_result]}
     await asyncio.sleep(0.3)
 
@@ -120,8 +169,10 @@ async def generate_workflow_stream(payload: RecruiterWorkflowRequest) -> AsyncGe
     
     # Collect streamed markdown chunks
     accumulated_text = ""
-    response_format = "text" if step_configs["ai_analysis"].provider == "deepseek" else "json"
-    async for chunk in orchestrator.generate_stream(markdown_llm_messages, step_configs["ai_analysis"], response_format=response_format):
+    markdown_options = replace(run_options, step="ai_analysis", prompt_version="ai_analysis_markdown@builtin")
+    async for chunk in orchestrator.generate_stream(
+        markdown_llm_messages, step_configs["ai_analysis"], response_format="text", options=markdown_options
+    ):
         accumulated_text += chunk
         yield {
             "type": "partial",
@@ -149,7 +200,7 @@ async def generate_workflow_stream(payload: RecruiterWorkflowRequest) -> AsyncGe
         "candidates": [],
     }
     try:
-        analysis_result = await _invoke_ai_analysis(orchestrator, step_configs["ai_analysis"], context_json)
+        analysis_result = await _invoke_ai_analysis(orchestrator, step_configs["ai_analysis"], context_json, run_options)
         yield {
             "type": "result",
             "step": "ai_analysis",
@@ -174,21 +225,21 @@ async def generate_workflow_stream(payload: RecruiterWorkflowRequest) -> AsyncGe
     # Step 3: Ranked Shortlist
     yield {"type": "status", "step": "ranked_shortlist", "message": "Creating ranked shortlist..."}
     await asyncio.sleep(0.5)
-    shortlist_result = await _invoke_ranked_shortlist(orchestrator, step_configs["ranked_shortlist"], context_json)
+    shortlist_result = await _invoke_ranked_shortlist(orchestrator, step_configs["ranked_shortlist"], context_json, run_options)
     yield {"type": "result", "step": "ranked_shortlist", "data": [item.dict() for item in shortlist_result]}
     await asyncio.sleep(0.3)
 
     # Step 4: Detailed Readout
     yield {"type": "status", "step": "detailed_readout", "message": "Generating detailed candidate readouts..."}
     await asyncio.sleep(0.5)
-    readout_result = await _invoke_detailed_readout(orchestrator, step_configs["detailed_readout"], context_json)
+    readout_result = await _invoke_detailed_readout(orchestrator, step_configs["detailed_readout"], context_json, run_options)
     yield {"type": "result", "step": "detailed_readout", "data": [item.dict() for item in readout_result]}
     await asyncio.sleep(0.3)
 
     # Step 5: Engagement Plan (stream items one by one)
     yield {"type": "status", "step": "engagement_plan", "message": "Creating engagement plan..."}
     await asyncio.sleep(0.5)
-    engagement_result = await _invoke_engagement_plan(orchestrator, step_configs["engagement_plan"], context_json)
+    engagement_result = await _invoke_engagement_plan(orchestrator, step_configs["engagement_plan"], context_json, run_options)
     accumulated_engagement = []
     for item in engagement_result:
         accumulated_engagement.append(item.dict())
@@ -200,7 +251,7 @@ async def generate_workflow_stream(payload: RecruiterWorkflowRequest) -> AsyncGe
     # Step 6: Fairness Guidance (stream items one by one)
     yield {"type": "status", "step": "fairness_guidance", "message": "Generating fairness & panel guidance..."}
     await asyncio.sleep(0.5)
-    fairness_result = await _invoke_fairness_guidance(orchestrator, step_configs["fairness_guidance"], context_json)
+    fairness_result = await _invoke_fairness_guidance(orchestrator, step_configs["fairness_guidance"], context_json, run_options)
     accumulated_fairness = []
     for item in fairness_result:
         accumulated_fairness.append(item.dict())
@@ -212,7 +263,7 @@ async def generate_workflow_stream(payload: RecruiterWorkflowRequest) -> AsyncGe
     # Step 7: Interview Preparation (stream items one by one)
     yield {"type": "status", "step": "interview_preparation", "message": "Preparing interview pack..."}
     await asyncio.sleep(0.5)
-    interview_result = await _invoke_interview_pack(orchestrator, step_configs["interview_preparation"], context_json)
+    interview_result = await _invoke_interview_pack(orchestrator, step_configs["interview_preparation"], context_json, run_options)
     accumulated_interview = []
     for item in interview_result:
         accumulated_interview.append(item.dict())
@@ -260,6 +311,7 @@ async def _load_resume_context(resume_refs: Iterable[ResumeReference]) -> List[D
 
     for resume, candidate_id in resume_payloads:
         candidate_profile = candidate_profiles.get(candidate_id or "")
+        digest = _resume_digest(resume)
         contexts.append(
             {
                 "candidate_id": candidate_id,
@@ -270,7 +322,8 @@ async def _load_resume_context(resume_refs: Iterable[ResumeReference]) -> List[D
                 "resume_name": resume.get("name"),
                 "resume_type": resume.get("type"),
                 "resume_summary": resume.get("summary"),
-                "resume_preview": resume.get("preview"),
+                "resume_preview": digest["preview"],
+                "resume_sections": digest["sections"],
                 "resume_skills": resume.get("skills", []),
                 "candidate_skills": (candidate_profile or {}).get("skills", []),
                 "resume_updated_at": resume.get("last_updated"),
@@ -283,7 +336,41 @@ async def _load_resume_context(resume_refs: Iterable[ResumeReference]) -> List[D
     return contexts
 
 
-def _render_context(job_metadata: JobMetadata, job_description: str, resume_contexts: List[Dict[str, Optional[str]]]) -> str:
+def _resume_digest(resume: Dict[str, Any]) -> Dict[str, Any]:
+    """Stored preview and section digest, computed from the text for resumes ingested before they existed."""
+    if resume.get("preview") or not resume.get("content"):
+        return {"preview": resume.get("preview"), "sections": resume.get("sections") or {}}
+    return summarise_resume(
+        resume["content"],
+        preview_chars=settings.RESUME_PREVIEW_MAX_CHARS,
+        section_chars=settings.RESUME_SECTION_MAX_CHARS,
+    )
+
+
+def _drop_empty(value: Any) -> Any:
+    if isinstance(value, dict):
+        cleaned = {key: _drop_empty(item) for key, item in value.items()}
+        return {key: item for key, item in cleaned.items() if item not in (None, "", [], {})}
+    if isinstance(value, list):
+        return [_drop_empty(item) for item in value]
+    return value
+
+
+def _context_budget(orchestrator: LLMOrchestrator, step_configs: Dict[str, LLMProviderConfig]) -> ContextBudget:
+    """The shared context must fit every step's model, leaving room for that step's instructions."""
+    limits = {}
+    for config in step_configs.values():
+        limit = orchestrator.prompt_limit(config)
+        limits[limit] = replace(limit, tokens=limit.tokens - settings.LLM_INSTRUCTION_RESERVE_TOKENS)
+    return ContextBudget(list(limits.values()))
+
+
+def _render_context(
+    job_metadata: JobMetadata,
+    job_description: str,
+    resume_contexts: List[Dict[str, Optional[str]]],
+    budget: ContextBudget,
+) -> Tuple[str, FitReport]:
     payload = {
         "job": {
             "title": job_metadata.title,
@@ -295,55 +382,73 @@ def _render_context(job_metadata: JobMetadata, job_description: str, resume_cont
         },
         "candidates": resume_contexts,
     }
-    return json.dumps(payload, ensure_ascii=False, indent=2)
+    # Compact separators and no empty fields: this JSON is repeated in every step's prompt.
+    context, report = budget.fit(
+        _drop_empty(payload),
+        items_key="candidates",
+        trims=_CONTEXT_TRIMS,
+        text_path=("job", "description"),
+        omitted_key="omitted_candidates",
+    )
+    if report.trimmed:
+        logger.warning(
+            "Workflow context trimmed to fit: fields %s, %s resumes dropped, job description truncated: %s",
+            report.trims,
+            report.dropped_items,
+            report.truncated_text,
+        )
+    logger.info("Workflow context: %s resumes, %s chars, ~%s tokens", len(resume_contexts), len(context), report.tokens)
+    return context, report
 
 
 def _resolve_step_configs(
     payload: RecruiterWorkflowRequest,
     workflow_settings: LLMWorkflowSettings,
+    *,
+    authenticated: bool = False,
 ) -> Dict[str, LLMProviderConfig]:
     configs: Dict[str, LLMProviderConfig] = {}
     for step in _STEP_ORDER:
         override = payload.step_overrides.get(step)
         if override:
-            configs[step] = override
+            configs[step] = override if authenticated else _restrict_override(override)
             continue
         step_config = workflow_settings.steps.get(step) if step in workflow_settings.steps else None
-        config = step_config or workflow_settings.default
-        
-        # DeepSeek doesn't handle JSON format properly, force text format
-        if config.provider == "deepseek":
-            config = config.copy()
-            # Remove any response_format override to use default text format
-            if hasattr(config, 'extra_payload') and config.extra_payload:
-                config.extra_payload = {k: v for k, v in config.extra_payload.items() if k != 'response_format'}
-        
-        configs[step] = config
+        configs[step] = step_config or workflow_settings.default
     return configs
 
 
-async def _get_prompt_content(prompt_name: str, fallback_content: str) -> str:
-    """Get prompt content from database, fallback to provided content if not found."""
+def _restrict_override(config: LLMProviderConfig) -> LLMProviderConfig:
+    """Anonymous overrides may pick a provider and model, but not write to the shared cache or choose the endpoint."""
+    return config.copy(update={"base_url": None, "cache_enabled": False})
+
+
+async def _get_prompt(prompt_name: str, fallback_content: str) -> Tuple[str, str]:
+    """Get prompt content and a version label from the database, falling back to the built-in content."""
     try:
         prompt = await get_prompt_by_name(prompt_name)
         if prompt and prompt.get("content"):
-            return prompt["content"]
+            return prompt["content"], f"{prompt_name}@v{prompt.get('version', 1)}"
     except Exception as e:
         logger.warning(f"Failed to load prompt '{prompt_name}': {e}")
-    return fallback_content
+    return fallback_content, f"{prompt_name}@builtin"
 
 
 async def _invoke_core_skills(
     orchestrator: LLMOrchestrator,
     config: LLMProviderConfig,
     context_json: str,
+    options: Optional[LLMCallOptions] = None,
 ) -> List[CoreSkill]:
-    instruction = await _get_prompt_content(
+    options = options or LLMCallOptions()
+    instruction, prompt_version = await _get_prompt(
         "core_skills_analysis",
         "Identify the three most critical must-have skills that determine candidate success. "
         "Return JSON with key 'core_skills' containing exactly three objects with fields 'name' and 'reason'."
     )
-    data = await _invoke_json(orchestrator, config, instruction, context_json)
+    data = await _invoke_json(
+        orchestrator, config, instruction, context_json, replace(options, step="core_skills", prompt_version=prompt_version)
+    )
     core_skills = data.get("core_skills", [])
     return [CoreSkill(name=item.get("name", ""), reason=item.get("reason", "")) for item in core_skills]
 
@@ -352,8 +457,10 @@ async def _invoke_ai_analysis(
     orchestrator: LLMOrchestrator,
     config: LLMProviderConfig,
     context_json: str,
+    options: Optional[LLMCallOptions] = None,
 ) -> Dict[str, object]:
-    instruction = await _get_prompt_content(
+    options = options or LLMCallOptions()
+    instruction, prompt_version = await _get_prompt(
         "candidate_analysis",
         "For each candidate, score the fit versus the job. Provide match_score (0-100), bias_free_score (0-100), "
         "a recruiter summary (<= 400 characters), up to three highlights, and a skill_alignment array with fields "
@@ -361,7 +468,9 @@ async def _invoke_ai_analysis(
         "return it as 'ai_analysis_markdown'. Respond with JSON containing keys 'ai_analysis_markdown' and "
         "'candidate_analysis'."
     )
-    data = await _invoke_json(orchestrator, config, instruction, context_json)
+    data = await _invoke_json(
+        orchestrator, config, instruction, context_json, replace(options, step="ai_analysis", prompt_version=prompt_version)
+    )
     markdown = data.get("ai_analysis_markdown", "")
     candidates_payload = data.get("candidate_analysis", [])
     if isinstance(candidates_payload, str):
@@ -409,14 +518,18 @@ async def _invoke_ranked_shortlist(
     orchestrator: LLMOrchestrator,
     config: LLMProviderConfig,
     context_json: str,
+    options: Optional[LLMCallOptions] = None,
 ) -> List[RankedCandidateItem]:
-    instruction = await _get_prompt_content(
+    options = options or LLMCallOptions()
+    instruction, prompt_version = await _get_prompt(
         "ranked_shortlist",
         "Generate a ranked shortlist of candidates. "
         "Return JSON with key 'ranked_shortlist' where each item includes 'candidate_id', 'rank' (1-based), "
         "'priority' (Hot/Warm/Pipeline), 'status', 'availability', and 'notes'."
     )
-    data = await _invoke_json(orchestrator, config, instruction, context_json)
+    data = await _invoke_json(
+        orchestrator, config, instruction, context_json, replace(options, step="ranked_shortlist", prompt_version=prompt_version)
+    )
     shortlist_payload = data.get("ranked_shortlist", [])
     if isinstance(shortlist_payload, str):
         # Some LLM responses double-encode JSON arrays; attempt to decode before proceeding.
@@ -448,14 +561,18 @@ async def _invoke_detailed_readout(
     orchestrator: LLMOrchestrator,
     config: LLMProviderConfig,
     context_json: str,
+    options: Optional[LLMCallOptions] = None,
 ) -> List[CandidateReadout]:
-    instruction = await _get_prompt_content(
+    options = options or LLMCallOptions()
+    instruction, prompt_version = await _get_prompt(
         "detailed_readout",
         "Create a detailed readout for each candidate. "
         "Return JSON with key 'detailed_readout' of objects that include 'candidate_id', "
         "'strengths' (list of strings), 'risks' (list of strings), and 'recommended_actions' (list of strings)."
     )
-    data = await _invoke_json(orchestrator, config, instruction, context_json)
+    data = await _invoke_json(
+        orchestrator, config, instruction, context_json, replace(options, step="detailed_readout", prompt_version=prompt_version)
+    )
     readout_payload = data.get("detailed_readout", [])
     if isinstance(readout_payload, str):
         # Some LLM responses double-encode JSON arrays; attempt to decode before proceeding.
@@ -484,13 +601,17 @@ async def _invoke_engagement_plan(
     orchestrator: LLMOrchestrator,
     config: LLMProviderConfig,
     context_json: str,
+    options: Optional[LLMCallOptions] = None,
 ) -> List[InsightItem]:
-    instruction = await _get_prompt_content(
+    options = options or LLMCallOptions()
+    instruction, prompt_version = await _get_prompt(
         "engagement_plan",
         "Propose an engagement plan for stakeholders. "
         "Return JSON with key 'engagement_plan' where every item has 'label', 'value', and optional 'helper'."
     )
-    data = await _invoke_json(orchestrator, config, instruction, context_json)
+    data = await _invoke_json(
+        orchestrator, config, instruction, context_json, replace(options, step="engagement_plan", prompt_version=prompt_version)
+    )
     
     plan_payload = data.get("engagement_plan", [])
     
@@ -515,13 +636,17 @@ async def _invoke_fairness_guidance(
     orchestrator: LLMOrchestrator,
     config: LLMProviderConfig,
     context_json: str,
+    options: Optional[LLMCallOptions] = None,
 ) -> List[InsightItem]:
-    instruction = await _get_prompt_content(
+    options = options or LLMCallOptions()
+    instruction, prompt_version = await _get_prompt(
         "fairness_guidance",
         "Highlight fairness, bias mitigation, and panel guidance actions. "
         "Return JSON with key 'fairness_guidance' where each item includes 'label', 'value', and optional 'helper'."
     )
-    data = await _invoke_json(orchestrator, config, instruction, context_json)
+    data = await _invoke_json(
+        orchestrator, config, instruction, context_json, replace(options, step="fairness_guidance", prompt_version=prompt_version)
+    )
     
     # Debug logging
     logger.info(f"FAIRNESS_GUIDANCE - data type: {type(data)}, data: {data}")
@@ -549,13 +674,17 @@ async def _invoke_interview_pack(
     orchestrator: LLMOrchestrator,
     config: LLMProviderConfig,
     context_json: str,
+    options: Optional[LLMCallOptions] = None,
 ) -> List[InterviewQuestion]:
-    instruction = await _get_prompt_content(
+    options = options or LLMCallOptions()
+    instruction, prompt_version = await _get_prompt(
         "interview_preparation",
         "Generate interview preparation pack questions focused on validating must-have skills and risks. "
         "Return JSON with key 'interview_preparation' where each item has 'question' and 'rationale'."
     )
-    data = await _invoke_json(orchestrator, config, instruction, context_json)
+    data = await _invoke_json(
+        orchestrator, config, instruction, context_json, replace(options, step="interview_preparation", prompt_version=prompt_version)
+    )
     questions_payload = data.get("interview_preparation", [])
     
     # Handle case where LLM returns stringified JSON
@@ -579,6 +708,7 @@ async def _invoke_json(
     config: LLMProviderConfig,
     instruction: str,
     context_json: str,
+    options: LLMCallOptions,
 ) -> Dict[str, object]:
     messages = [
         LLMMessage(role="system", content=_SYSTEM_PROMPT),
@@ -590,14 +720,9 @@ async def _invoke_json(
             ),
         ),
     ]
-    
-    # For DeepSeek, use text format instead of JSON format since it doesn't handle JSON properly
-    response_format = "text" if config.provider == "deepseek" else "json"
-    
-    print(f"_invoke_json: calling orchestrator.generate with config.provider={config.provider}, response_format={response_format}")
-    raw = await orchestrator.generate(messages, config, response_format=response_format)
-    result = _parse_json_response(raw)
-    return result
+    # JSON mode is dropped per model by the provider once it is known to be unsupported (see llm_providers.capabilities).
+    raw = await orchestrator.generate(messages, config, response_format="json", options=options)
+    return _parse_json_response(raw)
 
 
 def _parse_json_response(raw: str) -> Dict[str, object]:
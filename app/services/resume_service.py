@@ -1,54 +1,14 @@
 from __future__ import annotations
 
-import io
 from datetime import datetime
 from typing import Any, Dict, List, Optional
 
 from bson import ObjectId
-from PyPDF2 import PdfReader
-import docx
+from pymongo import ReturnDocument
 
+from app.core.config import settings
 from app.core.database import db
-
-
-def _extract_text_from_pdf(file_bytes: bytes) -> str:
-    """Extract text content from PDF file."""
-    try:
-        pdf_reader = PdfReader(io.BytesIO(file_bytes))
-        text = ""
-        for page in pdf_reader.pages:
-            text += page.extract_text() + "\n"
-        return text.strip()
-    except Exception:
-        return ""
-
-
-def _extract_text_from_docx(file_bytes: bytes) -> str:
-    """Extract text content from DOCX file."""
-    try:
-        doc = docx.Document(io.BytesIO(file_bytes))
-        text = ""
-        for paragraph in doc.paragraphs:
-            text += paragraph.text + "\n"
-        return text.strip()
-    except Exception:
-        return ""
-
-
-def _extract_text_from_file(file_bytes: bytes, content_type: str, filename: str) -> str:
-    """Extract text content from uploaded file based on type."""
-    filename_lower = filename.lower()
-
-    if content_type == "application/pdf" or filename_lower.endswith(".pdf"):
-        return _extract_text_from_pdf(file_bytes)
-    elif content_type == "application/vnd.openxmlformats-officedocument.wordprocessingml.document" or filename_lower.endswith((".docx", ".doc")):
-        return _extract_text_from_docx(file_bytes)
-    else:
-        # For other file types, try to decode as text
-        try:
-            return file_bytes.decode('utf-8')
-        except UnicodeDecodeError:
-            return ""
+from app.services.documents import ExtractionResult, extract_cached, summarise_resume
 
 
 def _serialise_resume(document: Dict[str, Any]) -> Dict[str, Any]:
@@ -83,20 +43,14 @@ def _serialise_resume(document: Dict[str, Any]) -> Dict[str, Any]:
         metadata = resume.get("metadata", {})
         resume["skills"] = metadata.get("skills", [])
 
-    # Remove sensitive fields
+    # Remove sensitive fields; legacy documents may still carry an inline blob
     resume.pop("file_blob", None)
     return resume
 
 
 async def get_resumes(user_id: str) -> List[Dict[str, Any]]:
     """Get all resumes for a user."""
-    cursor = db.resumes.find({
-        "candidate_id": user_id,
-        "$or": [
-            {"is_active": True},
-            {"is_active": {"$exists": False}}
-        ]
-    }).sort("last_updated", -1)
+    cursor = db.resumes.find({"candidate_id": user_id, "is_active": True}).sort("last_updated", -1)
     documents = await cursor.to_list(length=100)
     return [_serialise_resume(document) for document in documents]
 
@@ -112,7 +66,7 @@ async def get_resume(resume_id: str) -> Optional[Dict[str, Any]]:
     if not document:
         return None
 
-    # For uploaded resumes, check is_active; for seeded resumes (no is_active field), consider them active
+    # Documents predating the is_active backfill migration are treated as active
     is_active = document.get("is_active", True)
     if not is_active:
         return None
@@ -120,40 +74,67 @@ async def get_resume(resume_id: str) -> Optional[Dict[str, Any]]:
     return _serialise_resume(document)
 
 
-async def upload_resume(
+async def next_resume_version(candidate_id: str, resume_type: str = "general") -> int:
+    """Return the version number the next active resume of this type should get."""
+    latest_resume = await db.resumes.find_one(
+        {"candidate_id": candidate_id, "resume_type": resume_type, "is_active": True},
+        sort=[("version", -1)]
+    )
+    return (latest_resume.get("version", 0) if latest_resume else 0) + 1
+
+
+async def reserve_resume_versions(candidate_id: str, resume_type: str = "general", count: int = 1) -> int:
+    """Atomically reserve ``count`` consecutive versions and return the first.
+
+    A counter per candidate and resume type in ``resume_versions`` hands the numbers out, so concurrent uploads never
+    get the same version. It never falls below the newest active resume, which covers resumes stored before it existed.
+    """
+    floor = await next_resume_version(candidate_id, resume_type) - 1
+    document = await db.resume_versions.find_one_and_update(
+        {"_id": f"{candidate_id}:{resume_type}"},
+        [{"$set": {"last": {"$add": [{"$max": [{"$ifNull": ["$last", 0]}, floor]}, count]}}}],
+        upsert=True,
+        return_document=ReturnDocument.AFTER,
+    )
+    return document["last"] - count + 1
+
+
+async def build_resume_document(
     *,
-    user_id: str,
+    candidate_id: str,
     name: str,
-    file_bytes: bytes,
+    extraction: ExtractionResult,
     content_type: str,
     original_filename: str,
     resume_type: str = "general",
     version: Optional[int] = None,
     summary: Optional[str] = None,
     skills: Optional[List[str]] = None,
-) -> str:
-    """Upload a resume and extract its text content."""
-
-    # Extract text content from the file
-    content = _extract_text_from_file(file_bytes, content_type, original_filename)
+    file_ref: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    """Build the resume document for an extracted upload without inserting it."""
 
     # Determine version number
     if version is None:
-        # Get the latest version for this user and resume type
-        latest_resume = await db.resumes.find_one(
-            {"user_id": user_id, "resume_type": resume_type, "is_active": True},
-            sort=[("version", -1)]
-        )
-        version = (latest_resume.get("version", 0) if latest_resume else 0) + 1
+        version = await reserve_resume_versions(candidate_id, resume_type)
 
-    document: Dict[str, Any] = {
-        "user_id": user_id,
+    digest = summarise_resume(
+        extraction.text,
+        preview_chars=settings.RESUME_PREVIEW_MAX_CHARS,
+        section_chars=settings.RESUME_SECTION_MAX_CHARS,
+    )
+    return {
+        "candidate_id": candidate_id,
         "name": name,
-        "content": content,
+        "content": extraction.text,
+        "preview": digest["preview"],
+        "sections": digest["sections"],
         "version": version,
         "resume_type": resume_type,
         "filename": original_filename,
         "content_type": content_type,
+        "file": file_ref,
+        "extraction": extraction.stats(),
         "uploaded_at": datetime.utcnow(),
         "is_active": True,
         "metadata": {
@@ -162,10 +143,61 @@ async def upload_resume(
         },
     }
 
+
+async def upload_resume(
+    *,
+    candidate_id: str,
+    name: str,
+    content_type: str,
+    original_filename: str,
+    file_bytes: Optional[bytes] = None,
+    extraction: Optional[ExtractionResult] = None,
+    resume_type: str = "general",
+    version: Optional[int] = None,
+    summary: Optional[str] = None,
+    skills: Optional[List[str]] = None,
+    file_ref: Optional[Dict[str, Any]] = None,
+) -> str:
+    """Upload a resume and extract its text content.
+
+    Pass ``extraction`` when the file was already extracted (e.g. by the ingestion pipeline);
+    otherwise ``file_bytes`` is extracted here. ``file_ref`` points at the original file in GridFS
+    (see ``file_storage_service``); only the reference is kept on the resume document so it stays small.
+    """
+    if extraction is None:
+        if file_bytes is None:
+            raise ValueError("Either file_bytes or extraction is required")
+        extraction = await extract_cached(
+            file_bytes,
+            content_type,
+            original_filename,
+            sha256=file_ref.get("sha256") if file_ref else None,
+        )
+
+    document = await build_resume_document(
+        candidate_id=candidate_id,
+        name=name,
+        extraction=extraction,
+        content_type=content_type,
+        original_filename=original_filename,
+        resume_type=resume_type,
+        version=version,
+        summary=summary,
+        skills=skills,
+        file_ref=file_ref,
+    )
     result = await db.resumes.insert_one(document)
     return str(result.inserted_id)
 
 
+async def insert_resumes(documents: List[Dict[str, Any]]) -> List[str]:
+    """Insert prepared resume documents in one round trip and return their ids in order."""
+    if not documents:
+        return []
+    result = await db.resumes.insert_many(documents)
+    return [str(inserted_id) for inserted_id in result.inserted_ids]
+
+
 async def update_resume(resume_id: str, updates: Dict[str, Any]) -> bool:
     """Update resume metadata."""
     try:
@@ -195,14 +227,8 @@ async def delete_resume(resume_id: str) -> bool:
 
 async def get_resume_versions(user_id: str, resume_type: str = "general") -> List[Dict[str, Any]]:
     """Get all versions of a specific resume type for a user."""
-    # For uploaded resumes, check is_active; for seeded resumes, include them
-    cursor = db.resumes.find({
-        "user_id": user_id,
-        "resume_type": resume_type,
-        "$or": [
-            {"is_active": True},
-            {"is_active": {"$exists": False}}
-        ]
-    }).sort("version", -1)
+    cursor = db.resumes.find(
+        {"candidate_id": user_id, "resume_type": resume_type, "is_active": True}
+    ).sort("version", -1)
     documents = await cursor.to_list(length=50)
     return [_serialise_resume(document) for document in documents]
\ No newline at end of file
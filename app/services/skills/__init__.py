@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import Iterable, List, Optional
+
+from app.services.skills.matcher import SkillMatcher, tokenize
+from app.services.skills.taxonomy import Skill, SkillTaxonomy, load_taxonomy, parse_taxonomy
+
+
+@lru_cache(maxsize=1)
+def default_matcher() -> SkillMatcher:
+    """Matcher for the bundled taxonomy, built once per process (including pool workers)."""
+    return SkillMatcher(load_taxonomy().terms())
+
+
+def taxonomy_version() -> int:
+    return load_taxonomy().version
+
+
+def extract_skills(text: str) -> List[str]:
+    """Canonical skill names mentioned in ``text``, in order of first mention."""
+    return default_matcher().find(text)
+
+
+def merge_skills(*groups: Optional[Iterable[str]]) -> List[str]:
+    """Concatenate skill lists, dropping blanks and case-insensitive duplicates (first spelling wins)."""
+    merged: List[str] = []
+    seen: set[str] = set()
+    for group in groups:
+        for skill in group or ():
+            key = skill.strip().lower()
+            if key and key not in seen:
+                seen.add(key)
+                merged.append(skill.strip())
+    return merged
+
+
+__all__ = [
+    "Skill",
+    "SkillMatcher",
+    "SkillTaxonomy",
+    "default_matcher",
+    "extract_skills",
+    "load_taxonomy",
+    "merge_skills",
+    "parse_taxonomy",
+    "taxonomy_version",
+    "tokenize",
+]
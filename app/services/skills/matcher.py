@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import re
+from collections import deque
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+# Tokens keep the punctuation that is part of skill names ("c++", "c#", "node.js", ".net") but not
+# trailing sentence punctuation, so "Python." and "python" produce the same token.
+_TOKEN_RE = re.compile(r"[a-z0-9+#]+(?:\.[a-z0-9+#]+)*|\.[a-z]+")
+
+
+def tokenize(text: str) -> List[str]:
+    return _TOKEN_RE.findall(text.lower())
+
+
+class SkillMatcher:
+    """Aho-Corasick automaton over token sequences.
+
+    Matching on tokens rather than characters gives word boundaries for free ("java" never matches
+    inside "javascript") and keeps the scan to one dictionary lookup per word. The automaton is
+    built once from ``(phrase, skill)`` pairs; :meth:`find` scans text in a single pass.
+    """
+
+    def __init__(self, terms: Iterable[Tuple[str, str]]) -> None:
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._outputs: List[Tuple[str, ...]] = [()]
+        pending: List[List[str]] = [[]]
+
+        for phrase, skill in terms:
+            tokens = tokenize(phrase)
+            if not tokens:
+                continue
+            state = 0
+            for token in tokens:
+                next_state = self._goto[state].get(token)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto[state][token] = next_state
+                    self._goto.append({})
+                    self._fail.append(0)
+                    pending.append([])
+                state = next_state
+            if skill not in pending[state]:
+                pending[state].append(skill)
+
+        # Breadth-first pass: each state's failure link points at its longest proper suffix that is
+        # also a prefix in the trie, and inherits that state's outputs.
+        self._outputs = [tuple(outputs) for outputs in pending]
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for token, child in self._goto[state].items():
+                queue.append(child)
+                fallback = self._fail[state]
+                while fallback and token not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                link = self._goto[fallback].get(token, 0)
+                self._fail[child] = link if link != child else 0
+                if self._outputs[self._fail[child]]:
+                    self._outputs[child] = tuple(dict.fromkeys(self._outputs[child] + self._outputs[self._fail[child]]))
+
+    @property
+    def state_count(self) -> int:
+        return len(self._goto)
+
+    def find_tokens(self, tokens: Sequence[str]) -> List[str]:
+        """Return the skills matched in ``tokens``, in order of first occurrence."""
+        goto, fail, outputs = self._goto, self._fail, self._outputs
+        root = goto[0]
+        found: Dict[str, None] = {}
+        state = 0
+        for token in tokens:
+            while state and token not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(token, 0) if state else root.get(token, 0)
+            if outputs[state]:
+                for skill in outputs[state]:
+                    found.setdefault(skill)
+        return list(found)
+
+    def find(self, text: str) -> List[str]:
+        return self.find_tokens(tokenize(text))
@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass, field
+from functools import lru_cache
+from pathlib import Path
+from typing import Iterator, List, Optional, Tuple
+
+_DEFAULT_TAXONOMY = Path(__file__).with_name("taxonomy.json")
+
+
+@dataclass(frozen=True)
+class Skill:
+    name: str
+    category: str = "other"
+    aliases: Tuple[str, ...] = ()
+    # Ambiguous names ("Go", "R") are only matched through their aliases.
+    match_name: bool = True
+
+    def phrases(self) -> Iterator[str]:
+        if self.match_name:
+            yield self.name
+        yield from self.aliases
+
+
+@dataclass(frozen=True)
+class SkillTaxonomy:
+    version: int
+    skills: Tuple[Skill, ...] = field(default_factory=tuple)
+
+    def terms(self) -> Iterator[Tuple[str, str]]:
+        """``(phrase, canonical name)`` pairs for every name and alias."""
+        for skill in self.skills:
+            for phrase in skill.phrases():
+                yield phrase, skill.name
+
+    def names(self) -> List[str]:
+        return [skill.name for skill in self.skills]
+
+
+def parse_taxonomy(data: dict) -> SkillTaxonomy:
+    return SkillTaxonomy(
+        version=int(data.get("version", 1)),
+        skills=tuple(
+            Skill(
+                name=entry["name"],
+                category=entry.get("category", "other"),
+                aliases=tuple(entry.get("aliases", ())),
+                match_name=entry.get("match_name", True),
+            )
+            for entry in data.get("skills", [])
+        ),
+    )
+
+
+@lru_cache(maxsize=4)
+def load_taxonomy(path: Optional[str] = None) -> SkillTaxonomy:
+    """Load a taxonomy JSON file (the bundled ``taxonomy.json`` by default)."""
+    with open(path or _DEFAULT_TAXONOMY, encoding="utf-8") as handle:
+        return parse_taxonomy(json.load(handle))
@@ -0,0 +1,108 @@
+import json
+import threading
+
+import anyio
+import pytest
+
+from app.core.config import settings
+
+from app.services.llm_providers import BedrockProvider, bedrock_provider
+from app.services.llm_providers.base import LLMMessage, LLMRequest
+
+pytestmark = pytest.mark.anyio
+
+
+class _FakeStream:
+    def __init__(self, events):
+        self._events = events
+        self.closed = threading.Event()
+
+    def __iter__(self):
+        for event in self._events:
+            if self.closed.is_set():
+                return
+            yield event
+
+    def close(self):
+        self.closed.set()
+
+
+def _delta(text):
+    body = {"type": "content_block_delta", "index": 0, "delta": {"type": "text_delta", "text": text}}
+    return {"chunk": {"bytes": json.dumps(body).encode("utf-8")}}
+
+
+class _FakeClient:
+    def __init__(self, events):
+        self.stream = _FakeStream(events)
+
+    def invoke_model_with_response_stream(self, **kwargs):
+        return {"body": self.stream}
+
+
+@pytest.fixture
+def fake_boto(monkeypatch):
+    created = []
+
+    def client(service_name, **kwargs):
+        fake = _FakeClient(
+            [{"chunk": {"bytes": b'{"type": "message_start"}'}}, *(_delta(f"t{i} ") for i in range(200))]
+        )
+        created.append((kwargs["region_name"], fake))
+        return fake
+
+    monkeypatch.setattr(bedrock_provider.boto3, "client", client)
+    bedrock_provider._client_cache.clear()
+    yield created
+    bedrock_provider._client_cache.clear()
+
+
+def _request(secret="secret", region="us-east-1"):
+    return LLMRequest(
+        model="anthropic.claude-3-haiku-20240307-v1:0",
+        messages=[LLMMessage(role="user", content="hi")],
+        api_key=secret,
+        extra_payload={"aws_region": region, "aws_access_key_id": "AKIA"},
+    )
+
+
+async def test_clients_are_cached_per_region_and_credentials(fake_boto) -> None:
+    provider = BedrockProvider()
+    first = provider._client(_request())
+    assert provider._client(_request()) is first
+    assert provider._client(_request(secret="other")) is not first
+    assert provider._client(_request(region="eu-west-1")) is not first
+    assert len(fake_boto) == 3
+
+
+async def test_generate_stream_yields_deltas_through_bounded_queue(fake_boto) -> None:
+    chunks = [chunk async for chunk in BedrockProvider().generate_stream(_request())]
+    assert len(chunks) == 200
+    assert "".join(chunks).startswith("t0 t1 t2 ")
+
+
+async def test_leaving_stream_early_closes_event_stream(fake_boto) -> None:
+    stream = BedrockProvider().generate_stream(_request())
+    assert await stream.__anext__() == "t0 "
+    await stream.aclose()
+    (_, client), = fake_boto
+    assert client.stream.closed.is_set()
+
+
+async def test_reader_thread_exits_when_consumer_leaves_a_full_queue(fake_boto, monkeypatch) -> None:
+    # With a single reader thread, a second stream can only run once the first reader has given up.
+    monkeypatch.setattr(settings, "LLM_HTTP_MAX_CONNECTIONS", 1)
+    bedrock_provider.shutdown_stream_readers()
+    provider = BedrockProvider()
+    provider._stream_queue_size = 2
+    try:
+        stream = provider.generate_stream(_request())
+        assert await stream.__anext__() == "t0 "
+        await anyio.sleep(0.05)  # let the reader fill the queue and block
+        await stream.aclose()
+
+        with anyio.fail_after(5):
+            chunks = [chunk async for chunk in provider.generate_stream(_request(region="eu-west-1"))]
+        assert len(chunks) == 200
+    finally:
+        bedrock_provider.shutdown_stream_readers()
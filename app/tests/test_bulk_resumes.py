@@ -0,0 +1,133 @@
+import asyncio
+import io
+import os
+import threading
+import zipfile
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from starlette.datastructures import Headers, UploadFile
+
+from app.services import bulk_resume_service
+from app.services.documents import CorruptDocumentError, ExtractionResult
+
+pytestmark = pytest.mark.anyio
+
+
+def _upload(filename: str, data: bytes, content_type: str) -> UploadFile:
+    return UploadFile(io.BytesIO(data), filename=filename, headers=Headers({"content-type": content_type}))
+
+
+def _zip(members: dict) -> bytes:
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        for name, data in members.items():
+            archive.writestr(name, data)
+    return buffer.getvalue()
+
+
+def test_expand_uploads_flattens_zip_archives():
+    archive = _zip({"cvs/alice.txt": b"Alice", "__MACOSX/._alice.txt": b"", "cvs/.DS_Store": b"x"})
+    files = bulk_resume_service.expand_uploads(
+        [_upload("bob.txt", b"Bob", "text/plain"), _upload("batch.zip", archive, "application/zip")],
+        max_files=10,
+        max_uncompressed_bytes=1024,
+    )
+    assert [(item.filename, item.content_type) for item in files] == [
+        ("bob.txt", "text/plain"),
+        ("alice.txt", "text/plain"),
+    ]
+
+
+def test_expand_uploads_enforces_limits():
+    archive = _zip({f"cv{index}.txt": b"x" * 100 for index in range(3)})
+    with pytest.raises(bulk_resume_service.BulkUploadTooLargeError):
+        bulk_resume_service.expand_uploads([_upload("a.zip", archive, "application/zip")], max_files=2, max_uncompressed_bytes=10_000)
+    with pytest.raises(bulk_resume_service.BulkUploadTooLargeError):
+        bulk_resume_service.expand_uploads([_upload("a.zip", archive, "application/zip")], max_files=10, max_uncompressed_bytes=250)
+    with pytest.raises(bulk_resume_service.BulkUploadError):
+        bulk_resume_service.expand_uploads([_upload("a.zip", b"not a zip", "application/zip")], max_files=10, max_uncompressed_bytes=250)
+
+
+async def test_bulk_upload_batches_inserts_and_reports_failures():
+    async def fake_extract(path, content_type, filename, *, sha256=None):
+        if filename == "broken.txt":
+            raise CorruptDocumentError("Could not read file")
+        with open(path, "rb") as handle:
+            data = handle.read()
+        return ExtractionResult(
+            text=data.decode(),
+            extractor="text",
+            page_count=1,
+            pages_read=1,
+            char_count=len(data),
+            truncated=False,
+            elapsed_ms=1.0,
+        )
+
+    stored = []
+
+    async def fake_store(spooled, *, filename, content_type, kind, owner=None):
+        stored.append(filename)
+        return {"file_id": filename, "sha256": spooled.sha256, "length": spooled.length, "content_type": content_type, "filename": filename}
+
+    files = bulk_resume_service.expand_uploads(
+        [_upload(name, name.encode(), "text/plain") for name in ("a.txt", "b.txt", "broken.txt", "c.txt")]
+        + [_upload("huge.txt", b"x" * 100, "text/plain")],
+        max_files=10,
+        max_uncompressed_bytes=1024,
+    )
+    insert = AsyncMock(side_effect=lambda documents: [f"id-{document['filename']}" for document in documents])
+    with patch.object(bulk_resume_service, "extract_cached", fake_extract), patch.object(
+        bulk_resume_service.file_storage_service, "store_spooled", fake_store
+    ), patch.object(bulk_resume_service.resume_service, "insert_resumes", insert), patch.object(
+        bulk_resume_service.resume_service, "reserve_resume_versions", AsyncMock(side_effect=[3, 4, 5])
+    ):
+        results = [
+            result
+            async for result in bulk_resume_service.bulk_upload_resumes(
+                files, candidate_id="agency-1", concurrency=2, batch_size=2, max_file_bytes=50
+            )
+        ]
+
+    assert results[-1] == {"event": "summary", "total": 5, "created": 3, "failed": 2}
+    by_name = {result["filename"]: result for result in results[:-1]}
+    assert by_name["broken.txt"]["error"]["code"] == "corrupt_document"
+    assert by_name["huge.txt"]["error"]["code"] == "file_too_large"
+    assert by_name["a.txt"]["resume_id"] == "id-a.txt"
+    # One full batch of two documents, then the remainder.
+    assert [len(call.args[0]) for call in insert.await_args_list] == [2, 1]
+    inserted = [document for call in insert.await_args_list for document in call.args[0]]
+    assert sorted(document["version"] for document in inserted) == [3, 4, 5]
+    # Files that fail extraction are never stored.
+    assert sorted(stored) == ["a.txt", "b.txt", "c.txt"]
+
+
+async def test_cancelled_upload_discards_spooled_files(tmp_path, monkeypatch):
+    monkeypatch.setattr(bulk_resume_service.file_storage_service.settings, "UPLOAD_SPOOL_DIR", str(tmp_path))
+    release = threading.Event()
+    real_spool = bulk_resume_service._spool
+
+    def slow_spool(item, max_bytes):
+        release.wait(5)
+        return real_spool(item, max_bytes)
+
+    monkeypatch.setattr(bulk_resume_service, "_spool", slow_spool)
+    files = bulk_resume_service.expand_uploads(
+        [_upload("a.txt", b"Alice", "text/plain")], max_files=10, max_uncompressed_bytes=1024
+    )
+    with patch.object(bulk_resume_service.resume_service, "reserve_resume_versions", AsyncMock(return_value=1)):
+        upload = bulk_resume_service.bulk_upload_resumes(files, candidate_id="agency-1", concurrency=1, batch_size=1)
+        first = asyncio.ensure_future(upload.__anext__())
+        await asyncio.sleep(0.05)
+        # The client disconnects while the file is still being spooled in its thread.
+        first.cancel()
+        await asyncio.gather(first, return_exceptions=True)
+        await upload.aclose()
+
+    release.set()
+    for _ in range(100):
+        await asyncio.sleep(0.01)
+        if not os.listdir(tmp_path):
+            break
+    assert os.listdir(tmp_path) == []
@@ -0,0 +1,159 @@
+import io
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import docx
+import pytest
+from PyPDF2 import PdfWriter
+
+from app.services.documents import (
+    CorruptDocumentError,
+    DocumentExtractor,
+    UnsupportedDocumentError,
+    extract_cached,
+    extract_document,
+    get_extractor,
+    register_extractor,
+    segment_resume,
+    summarise_resume,
+)
+from app.services.documents import cache, registry
+
+
+def _docx_bytes(paragraphs):
+    document = docx.Document()
+    for paragraph in paragraphs:
+        document.add_paragraph(paragraph)
+    buffer = io.BytesIO()
+    document.save(buffer)
+    return buffer.getvalue()
+
+
+def _blank_pdf_bytes(pages):
+    writer = PdfWriter()
+    for _ in range(pages):
+        writer.add_blank_page(width=612, height=792)
+    buffer = io.BytesIO()
+    writer.write(buffer)
+    return buffer.getvalue()
+
+
+def test_docx_paragraphs_are_joined():
+    data = _docx_bytes(["Jane Candidate", "Python engineer"])
+    result = extract_document(data, "", "resume.docx")
+    assert result.extractor == "docx"
+    assert result.text == "Jane Candidate\nPython engineer"
+    assert result.char_count == len(result.text)
+    assert result.truncated is False
+
+
+def test_character_budget_stops_early():
+    data = ("x" * 100 + "\n").encode("utf-8") * 50
+    result = extract_document(data, "text/plain", "notes.txt", max_chars=250)
+    assert result.char_count <= 250
+    assert result.truncated is True
+
+
+def test_pdf_page_cap_is_reported():
+    result = extract_document(_blank_pdf_bytes(5), "application/pdf", "scan.pdf", max_pages=2)
+    assert result.page_count == 5
+    assert result.pages_read == 2
+    assert result.truncated is True
+
+
+def test_corrupt_pdf_raises_structured_error():
+    with pytest.raises(CorruptDocumentError) as exc_info:
+        extract_document(b"%PDF-1.4 not really a pdf", "application/pdf", "broken.pdf")
+    assert exc_info.value.code == "corrupt_document"
+
+
+def test_binary_upload_is_unsupported():
+    with pytest.raises(UnsupportedDocumentError):
+        extract_document(b"\xff\xfe\x00\x81binary", "application/octet-stream", "photo.jpg")
+
+
+def test_registered_extractor_takes_precedence(monkeypatch):
+    class UpperExtractor(DocumentExtractor):
+        name = "upper"
+        extensions = (".upper",)
+
+        def open(self, data, *, max_pages=None):
+            return 1, iter([data.decode("utf-8").upper()])
+
+    monkeypatch.setattr(registry, "_EXTRACTORS", list(registry._EXTRACTORS))
+    register_extractor(UpperExtractor())
+    assert get_extractor("", "cv.upper").name == "upper"
+    assert extract_document(b"hello", "", "cv.upper").text == "HELLO"
+
+
+@pytest.mark.anyio
+async def test_repeat_upload_is_served_from_cache(monkeypatch):
+    collection = MagicMock()
+    collection.find_one_and_update = AsyncMock(return_value=None)
+    collection.update_one = AsyncMock()
+    monkeypatch.setattr(cache, "_collection", lambda: collection)
+    monkeypatch.setattr(cache, "_lru", type(cache._lru)())
+
+    data = b"Senior Python engineer"
+    with patch("app.services.documents.extraction.extract_in_pool", AsyncMock(side_effect=lambda *args: extract_document(*args))) as pool:
+        first = await extract_cached(data, "text/plain", "cv.txt")
+        second = await extract_cached(data, "text/plain", "cv-v2.txt")
+
+    assert pool.await_count == 1
+    assert first.cache_hit is False
+    assert second.cache_hit is True
+    assert second.text == first.text
+    collection.update_one.assert_awaited_once()
+
+
+
+def test_extract_document_from_path(tmp_path):
+    docx_path = tmp_path / "cv.docx"
+    docx_path.write_bytes(_docx_bytes(["Read from disk"]))
+    assert extract_document(str(docx_path), "", "cv.docx").text == "Read from disk"
+
+    pdf_path = tmp_path / "cv.pdf"
+    pdf_path.write_bytes(_blank_pdf_bytes(3))
+    result = extract_document(str(pdf_path), "application/pdf", "cv.pdf", max_pages=2)
+    assert (result.page_count, result.pages_read) == (3, 2)
+
+
+_RESUME_TEXT = """Jane Doe
+jane@example.com | +44 7700 900000
+
+Professional Summary:
+Backend engineer with eight years building payment platforms.
+
+WORK EXPERIENCE
+Senior Engineer, Acme Pay (2019 - present)
+• Led the ledger rewrite in Python and PostgreSQL
+• Cut settlement latency by 40%
+
+Skills & Tools
+Python, Go, PostgreSQL, Kafka
+
+Education
+BSc Computer Science, University of Leeds
+"""
+
+
+def test_segment_resume_recognises_common_headings():
+    sections = segment_resume(_RESUME_TEXT)
+    assert set(sections) == {"header", "summary", "experience", "skills", "education"}
+    assert sections["skills"] == "Python, Go, PostgreSQL, Kafka"
+    assert sections["experience"].startswith("Senior Engineer, Acme Pay")
+
+
+def test_summarise_resume_is_bounded_and_omits_contact_details():
+    long_resume = _RESUME_TEXT.replace("• Cut settlement latency by 40%", "• Cut settlement latency by 40%\n" * 50)
+    digest = summarise_resume(long_resume, preview_chars=80, section_chars=120)
+    assert digest["preview"] == "Backend engineer with eight years building payment platforms."
+    assert set(digest["sections"]) == {"experience", "skills", "education"}
+    assert all(len(section) <= 121 for section in digest["sections"].values())
+    assert digest["sections"]["experience"].startswith("Senior Engineer, Acme Pay (2019 - present); Led the ledger")
+    assert "jane@example.com" not in str(digest)
+
+
+def test_summarise_resume_without_headings_uses_leading_text():
+    digest = summarise_resume("word " * 200, preview_chars=50, section_chars=50)
+    assert len(digest["preview"]) <= 51 and digest["preview"].endswith("…")
+    assert digest["sections"] == {}
@@ -0,0 +1,76 @@
+import asyncio
+import os
+import time
+
+import pytest
+
+from app.services.extraction_pool import (
+    ExtractionPool,
+    ExtractionPoolBusyError,
+    ExtractionTimeoutError,
+    ExtractionWorkerCrashedError,
+)
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_pool_runs_jobs_and_reports_metrics():
+    pool = ExtractionPool(max_workers=1, max_queue=4, timeout=10, memory_limit_mb=0)
+    try:
+        assert await pool.run(sum, [1, 2, 3]) == 6
+        metrics = pool.metrics()
+        assert metrics["completed"] == 1
+        assert metrics["queue_depth"] == 0
+        assert metrics["running"] == 0
+    finally:
+        pool.shutdown()
+
+
+async def test_pool_times_out_slow_jobs():
+    pool = ExtractionPool(max_workers=1, max_queue=4, timeout=0.2, memory_limit_mb=0)
+    try:
+        with pytest.raises(ExtractionTimeoutError):
+            await pool.run(time.sleep, 2)
+        assert pool.metrics()["timed_out"] == 1
+    finally:
+        pool.shutdown()
+
+
+async def test_pool_rejects_when_queue_full():
+    pool = ExtractionPool(max_workers=1, max_queue=0, timeout=5, memory_limit_mb=0)
+    try:
+        busy = asyncio.create_task(pool.run(time.sleep, 0.5))
+        await asyncio.sleep(0.05)
+        with pytest.raises(ExtractionPoolBusyError):
+            await pool.run(sum, [1])
+        await busy
+        assert pool.metrics()["rejected"] == 1
+        assert await pool.run(sum, [1]) == 1
+    finally:
+        pool.shutdown()
+
+
+async def test_pool_recovers_after_worker_crash():
+    pool = ExtractionPool(max_workers=1, max_queue=4, timeout=10, memory_limit_mb=0)
+    try:
+        with pytest.raises(ExtractionWorkerCrashedError):
+            await pool.run(os._exit, 1)
+        for _ in range(3):
+            assert await pool.run(sum, [1, 2]) == 3
+        assert pool.metrics()["recycled"] == 2
+    finally:
+        pool.shutdown()
+
+
+async def test_timed_out_job_does_not_block_later_jobs():
+    pool = ExtractionPool(max_workers=1, max_queue=4, timeout=0.5, memory_limit_mb=0)
+    try:
+        with pytest.raises(ExtractionTimeoutError):
+            await pool.run(time.sleep, 6)
+        started = time.perf_counter()
+        for _ in range(3):
+            assert await pool.run(sum, [1]) == 1
+        assert time.perf_counter() - started < 5
+        assert pool.metrics()["timed_out"] == 1
+    finally:
+        pool.shutdown()
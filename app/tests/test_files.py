@@ -0,0 +1,93 @@
+import pytest
+from httpx import AsyncClient
+
+from app.api import dependencies
+from app.api.routes.files import _content_disposition, _parse_range
+from app.services.file_storage_service import can_access
+
+pytestmark = pytest.mark.anyio
+
+
+def test_parse_range_variants():
+    assert _parse_range("bytes=0-99", 1000) == (0, 99)
+    assert _parse_range("bytes=900-", 1000) == (900, 999)
+    assert _parse_range("bytes=-100", 1000) == (900, 999)
+    assert _parse_range("bytes=950-5000", 1000) == (950, 999)
+
+
+@pytest.mark.parametrize("header", ["bytes=1000-", "bytes=5-2", "items=0-1", "bytes=0-1,4-5"])
+def test_parse_range_rejects_unsatisfiable(header: str):
+    with pytest.raises(ValueError):
+        _parse_range(header, 1000)
+
+
+async def test_download_missing_file(async_client: AsyncClient, monkeypatch):
+    monkeypatch.setattr(dependencies, "verify_jwt", lambda token: {"sub": "user-1"})
+    response = await async_client.get("/files/000000000000000000000000", headers={"Authorization": "Bearer token"})
+    assert response.status_code == 404
+
+
+async def test_download_requires_authentication(async_client: AsyncClient):
+    response = await async_client.get("/files/000000000000000000000000")
+    assert response.status_code == 401
+
+
+def test_content_disposition_escapes_filename():
+    header = _content_disposition('cv"\r\nX-Injected: 1 – Zoë.pdf')
+    assert "\r" not in header and "\n" not in header
+    assert header.startswith('attachment; filename="cv___X-Injected: 1 _ Zo_.pdf"; ')
+    assert header.endswith("filename*=UTF-8''cv%22%0D%0AX-Injected%3A%201%20%E2%80%93%20Zo%C3%AB.pdf")
+
+
+def test_file_access_is_limited_to_owners_orgs_and_admins():
+    stored = {"owners": ["recruiter-1"], "org_ids": ["acme"]}
+    assert can_access(stored, {"sub": "recruiter-1", "roles": []})
+    assert can_access(stored, {"sub": "recruiter-2", "org_id": "acme", "roles": []})
+    assert can_access(stored, {"sub": "someone", "roles": ["admin"]})
+    assert not can_access(stored, {"sub": "recruiter-3", "org_id": "other", "roles": ["recruiter"]})
+    assert not can_access({"owners": [], "org_ids": []}, {"sub": "recruiter-1", "org_id": None, "roles": []})
+
+
+def test_spool_stream_hashes_and_enforces_limit():
+    import hashlib
+    import io
+    import os
+
+    from app.services.file_storage_service import UploadTooLargeError, spool_stream
+
+    spooled = spool_stream(io.BytesIO(b"resume" * 1000), max_bytes=10_000)
+    try:
+        assert spooled.length == 6000
+        assert spooled.sha256 == hashlib.sha256(b"resume" * 1000).hexdigest()
+    finally:
+        spooled.discard()
+    assert not os.path.exists(spooled.path)
+
+    with pytest.raises(UploadTooLargeError):
+        spool_stream(io.BytesIO(b"x" * 10_001), max_bytes=10_000)
+
+
+async def test_store_upload_goes_through_the_spool(tmp_path, monkeypatch):
+    import hashlib
+    import io
+
+    from fastapi import UploadFile
+
+    from app.services import file_storage_service
+
+    monkeypatch.setattr(file_storage_service.settings, "UPLOAD_SPOOL_DIR", str(tmp_path))
+    seen = []
+
+    async def fake_store_spooled(spooled, **kwargs):
+        seen.append((spooled.sha256, kwargs))
+        return {"sha256": spooled.sha256}
+
+    monkeypatch.setattr(file_storage_service, "store_spooled", fake_store_spooled)
+    upload = UploadFile(io.BytesIO(b"resume"), filename="cv.pdf")
+
+    result = await file_storage_service.store_upload(upload, kind="resume", owner="user-1")
+
+    assert result == {"sha256": hashlib.sha256(b"resume").hexdigest()}
+    assert seen[0][1]["filename"] == "cv.pdf" and seen[0][1]["owner"] == "user-1"
+    assert list(tmp_path.iterdir()) == []
+    assert await upload.read() == b"resume"
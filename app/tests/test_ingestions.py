@@ -0,0 +1,166 @@
+import asyncio
+from datetime import datetime
+
+import pytest
+from bson import ObjectId
+from httpx import AsyncClient
+
+from app.api import dependencies
+from app.services import ingestion_service
+from app.services.documents import DocumentExtractionError, ExtractionResult
+from app.services.extraction_pool import ExtractionPoolBusyError
+
+pytestmark = pytest.mark.anyio
+
+EXTRACTION = ExtractionResult(
+    text="Python developer", extractor="text", page_count=1, pages_read=1, char_count=16, truncated=False, elapsed_ms=1.0
+)
+
+
+@pytest.fixture
+def enqueued(monkeypatch):
+    """Keep ingestions out of the background workers so each test drives ``_process`` itself."""
+    ids = []
+    monkeypatch.setattr(ingestion_service, "_enqueue", ids.append)
+    return ids
+
+
+AUTH = {"Authorization": "Bearer token"}
+
+
+@pytest.fixture
+def signed_in(monkeypatch):
+    """Authenticate every request as ``claims``; tests may change them."""
+    claims = {"sub": "candidate-ingest"}
+    monkeypatch.setattr(dependencies, "verify_jwt", lambda token: claims)
+    return claims
+
+
+async def _ingestion(**params) -> str:
+    return await ingestion_service.create_ingestion(
+        kind="resume",
+        file_ref={"file_id": "000000000000000000000000", "sha256": None},
+        params={"candidate_id": "candidate-ingest", "name": "CV", "filename": "cv.txt", **params},
+        owner="candidate-ingest",
+    )
+
+
+async def test_get_missing_ingestion(async_client: AsyncClient, signed_in):
+    response = await async_client.get("/ingestions/000000000000000000000000", headers=AUTH)
+    assert response.status_code == 404
+
+
+async def test_ingestions_require_authentication(async_client: AsyncClient):
+    assert (await async_client.get("/ingestions/000000000000000000000000")).status_code == 401
+    assert (await async_client.get("/ingestions/000000000000000000000000/events")).status_code == 401
+
+
+async def test_ingestions_are_hidden_from_other_users(async_client: AsyncClient, enqueued, signed_in):
+    ingestion_id = await _ingestion()
+    signed_in["sub"] = "someone-else"
+
+    assert (await async_client.get(f"/ingestions/{ingestion_id}", headers=AUTH)).status_code == 404
+    assert (await async_client.get(f"/ingestions/{ingestion_id}/events", headers=AUTH)).status_code == 404
+
+    signed_in["roles"] = ["admin"]
+    assert (await async_client.get(f"/ingestions/{ingestion_id}", headers=AUTH)).status_code == 200
+
+
+async def test_resume_upload_is_accepted_for_background_processing(async_client: AsyncClient, enqueued, signed_in):
+    response = await async_client.post(
+        "/resumes/",
+        data={"user_id": "candidate-ingest", "name": "CV"},
+        files={"file": ("cv.txt", b"Python developer", "text/plain")},
+    )
+
+    assert response.status_code == 202
+    body = response.json()
+    assert body["status"] == "queued"
+    assert body["status_url"] == f"/ingestions/{body['ingestion_id']}"
+    assert enqueued == [body["ingestion_id"]]
+    status = (await async_client.get(body["status_url"], headers=AUTH)).json()
+    assert (status["status"], status["stage"]) == ("queued", "stored")
+
+
+async def test_worker_completes_ingestion(enqueued, monkeypatch):
+    async def extract(file_ref, params):
+        return EXTRACTION
+
+    async def index(kind, params, file_ref, extraction, skills):
+        return {"resume_id": "resume-1"}
+
+    monkeypatch.setattr(ingestion_service, "_extract_stored", extract)
+    monkeypatch.setattr(ingestion_service, "_index", index)
+    ingestion_id = await _ingestion()
+
+    await ingestion_service._process(ingestion_id)
+
+    ingestion = await ingestion_service.get_ingestion(ingestion_id)
+    assert (ingestion["status"], ingestion["stage"]) == ("completed", "done")
+    assert ingestion["result"] == {"resume_id": "resume-1"}
+    assert set(ingestion["timings_ms"]) == {"parsing", "skills", "indexing"}
+
+
+async def test_worker_fails_ingestion_on_extraction_error(enqueued, monkeypatch):
+    async def extract(file_ref, params):
+        raise DocumentExtractionError("Could not read file")
+
+    monkeypatch.setattr(ingestion_service, "_extract_stored", extract)
+    ingestion_id = await _ingestion()
+
+    await ingestion_service._process(ingestion_id)
+
+    ingestion = await ingestion_service.get_ingestion(ingestion_id)
+    assert ingestion["status"] == "failed"
+    assert ingestion["error"] == {"code": "extraction_failed", "message": "Could not read file"}
+
+
+async def test_busy_pool_requeues_ingestion(enqueued, monkeypatch):
+    async def extract(file_ref, params):
+        raise ExtractionPoolBusyError("Document extraction queue is full; retry shortly")
+
+    monkeypatch.setattr(ingestion_service, "_extract_stored", extract)
+    monkeypatch.setattr(ingestion_service, "_BUSY_RETRY_DELAY_SECONDS", 0)
+    ingestion_id = await _ingestion()
+
+    await ingestion_service._process(ingestion_id)
+
+    ingestion = await ingestion_service.get_ingestion(ingestion_id)
+    assert (ingestion["status"], ingestion["stage"]) == ("queued", "stored")
+    assert enqueued == [ingestion_id, ingestion_id]
+
+
+async def test_waiting_on_unknown_ingestions_leaves_nothing_behind():
+    await asyncio.gather(*(ingestion_service.wait_for_update("unknown-ingestion", timeout=0.01) for _ in range(3)))
+    assert "unknown-ingestion" not in ingestion_service._updates
+
+
+async def test_abandoned_claim_is_reclaimed_after_its_lease(enqueued, monkeypatch):
+    async def extract(file_ref, params):
+        return EXTRACTION
+
+    async def index(kind, params, file_ref, extraction, skills):
+        return {"resume_id": "resume-1"}
+
+    monkeypatch.setattr(ingestion_service, "_extract_stored", extract)
+    monkeypatch.setattr(ingestion_service, "_index", index)
+    ingestion_id = await _ingestion()
+    # A worker claimed it and died without updating it for longer than the lease.
+    await ingestion_service._collection().update_one(
+        {"_id": ObjectId(ingestion_id)},
+        {"$set": {"status": "processing", "updated_at": datetime.utcnow() - 2 * ingestion_service._PROCESSING_LEASE}},
+    )
+
+    await ingestion_service._process(ingestion_id)
+
+    ingestion = await ingestion_service.get_ingestion(ingestion_id)
+    assert ingestion["status"] == "completed"
+
+
+def test_ingestion_access_follows_owner_org_and_admin():
+    document = {"owner": "recruiter-1", "org_id": "acme"}
+    assert ingestion_service.can_access(document, {"sub": "recruiter-1"})
+    assert ingestion_service.can_access(document, {"sub": "recruiter-2", "org_id": "acme"})
+    assert ingestion_service.can_access(document, {"sub": "someone", "roles": ["admin"]})
+    assert not ingestion_service.can_access(document, {"sub": "recruiter-3", "org_id": "other"})
+    assert not ingestion_service.can_access({"owner": None, "org_id": None}, {"sub": "recruiter-1"})
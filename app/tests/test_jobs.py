@@ -96,8 +96,20 @@ async def test_job_upload_and_retrieval():
     test_content = b"Test job description content"
     test_filename = "test_job.pdf"
 
-    # Mock the file extraction
-    with patch("app.services.job_service._extract_text_from_file", return_value="Extracted job description text"):
+    from app.services.documents import ExtractionResult
+
+    extraction = ExtractionResult(
+        text="Extracted job description text",
+        extractor="pdf",
+        page_count=1,
+        pages_read=1,
+        char_count=30,
+        truncated=False,
+        elapsed_ms=1.0,
+    )
+
+    # Mock the file extraction (normally offloaded to the extraction process pool)
+    with patch("app.services.job_service.extract_cached", AsyncMock(return_value=extraction)):
         job_id = await upload_job_description(
             recruiter_id="test_recruiter",
             title="Test Uploaded Job",
@@ -0,0 +1,114 @@
+import pytest
+
+from app.models.llm_model import LLMProviderConfig
+from app.main import app
+from app.services import llm_cache, llm_orchestrator
+from app.services.llm_orchestrator import LLMCallOptions, LLMOrchestrator
+from app.services.llm_providers.base import LLMMessage, LLMProvider, LLMRequest
+
+pytestmark = pytest.mark.anyio
+
+
+class _CountingProvider(LLMProvider):
+    name = "openai"
+
+    def __init__(self) -> None:
+        self.calls = 0
+
+    async def generate(self, request: LLMRequest) -> str:
+        self.calls += 1
+        return f'{{"call": {self.calls}}}'
+
+
+class _MissingCollection:
+    """Mongo tier stand-in that never has an entry, so these tests exercise the in-process LRU."""
+
+    async def find_one_and_update(self, *args, **kwargs):
+        return None
+
+    async def update_one(self, *args, **kwargs):
+        return None
+
+
+@pytest.fixture
+def orchestrator(monkeypatch):
+    monkeypatch.setattr(llm_cache, "_collection", _MissingCollection)
+    llm_cache._lru.clear()
+    instance = LLMOrchestrator()
+    instance._providers["openai"] = _CountingProvider()
+    return instance
+
+
+MESSAGES = [LLMMessage(role="system", content="Return JSON."), LLMMessage(role="user", content="Rank these resumes.")]
+
+
+def _config(**overrides) -> LLMProviderConfig:
+    return LLMProviderConfig(**{"provider": "openai", "model": "gpt-4o-mini", "api_key": "sk-test", "temperature": 0.2, **overrides})
+
+
+async def test_cache_is_opt_in(orchestrator) -> None:
+    await orchestrator.generate(MESSAGES, _config())
+    await orchestrator.generate(MESSAGES, _config())
+    assert orchestrator._providers["openai"].calls == 2
+
+
+async def test_repeated_call_is_served_from_cache(orchestrator) -> None:
+    before = llm_cache.get_metrics()
+    config = _config(cache_enabled=True)
+    options = LLMCallOptions(step="core_skills", prompt_version="core_skills_analysis@v1")
+
+    first = await orchestrator.generate(MESSAGES, config, options=options)
+    second = await orchestrator.generate(MESSAGES, config, options=options)
+
+    assert first == second == '{"call": 1}'
+    assert orchestrator._providers["openai"].calls == 1
+    after = llm_cache.get_metrics()
+    assert after["memory_hits"] == before["memory_hits"] + 1
+    assert after["tokens_saved"] > before["tokens_saved"]
+
+
+async def test_key_covers_prompt_version_and_sampling(orchestrator) -> None:
+    config = _config(cache_enabled=True)
+    await orchestrator.generate(MESSAGES, config, options=LLMCallOptions(prompt_version="a@v1"))
+    await orchestrator.generate(MESSAGES, config, options=LLMCallOptions(prompt_version="a@v2"))
+    await orchestrator.generate(MESSAGES, _config(cache_enabled=True, temperature=0.7), options=LLMCallOptions(prompt_version="a@v2"))
+    await orchestrator.generate(MESSAGES, config, "text", options=LLMCallOptions(prompt_version="a@v2"))
+    assert orchestrator._providers["openai"].calls == 4
+
+
+async def test_key_is_scoped_to_org_endpoint_and_credential(orchestrator) -> None:
+    config = _config(cache_enabled=True)
+    await orchestrator.generate(MESSAGES, config, options=LLMCallOptions(org_id="org-a"))
+    await orchestrator.generate(MESSAGES, config, options=LLMCallOptions(org_id="org-b"))
+    await orchestrator.generate(MESSAGES, _config(cache_enabled=True, base_url="https://attacker.test/v1"))
+    await orchestrator.generate(MESSAGES, _config(cache_enabled=True, api_key="sk-other"))
+    await orchestrator.generate(MESSAGES, _config(cache_enabled=True, extra_payload={"seed": 7}))
+    assert orchestrator._providers["openai"].calls == 5
+
+    assert await orchestrator.generate(MESSAGES, config, options=LLMCallOptions(org_id="org-a")) == '{"call": 1}'
+
+
+async def test_bypass_skips_lookup_but_refreshes_entry(orchestrator) -> None:
+    config = _config(cache_enabled=True)
+    await orchestrator.generate(MESSAGES, config)
+    refreshed = await orchestrator.generate(MESSAGES, config, options=LLMCallOptions(bypass_cache=True))
+    assert refreshed == '{"call": 2}'
+    assert await orchestrator.generate(MESSAGES, config) == '{"call": 2}'
+    assert orchestrator._providers["openai"].calls == 2
+
+
+async def test_hydrated_configs_are_memoized(orchestrator, monkeypatch) -> None:
+    lookups = []
+    env_config = llm_orchestrator.env_config_for_provider
+    monkeypatch.setattr(
+        llm_orchestrator, "env_config_for_provider", lambda provider: lookups.append(provider) or env_config(provider)
+    )
+
+    first = orchestrator._hydrate_config(_config())
+    assert orchestrator._hydrate_config(_config()) is first
+    assert orchestrator._hydrate_config(_config(temperature=0.7)) is not first
+    assert lookups == ["openai"]
+
+
+async def test_app_shares_one_orchestrator() -> None:
+    assert isinstance(app.state.llm_orchestrator, LLMOrchestrator)
@@ -0,0 +1,144 @@
+import json
+
+import pytest
+
+from app.core.config import settings
+from app.models.llm_model import LLMProviderConfig
+from app.services import llm_metrics, llm_resilience, llm_tokens
+from app.services.llm_context_budget import ContextBudget, PromptLimit
+from app.services.llm_orchestrator import LLMOrchestrator
+from app.services.llm_providers.base import LLMMessage, LLMProvider, LLMRequest
+from app.services.llm_tokens import ContextWindowExceededError
+
+pytestmark = pytest.mark.anyio
+
+
+def _payload(candidates: int) -> dict:
+    return {
+        "job": {"title": "Backend Engineer", "description": "Build and run Python services. " * 20},
+        "candidates": [
+            {
+                "candidate_name": f"Candidate {index}",
+                "resume_summary": "Senior engineer with a decade of Python, FastAPI and MongoDB experience. " * 5,
+                "resume_sections": {"experience": "Led platform teams and shipped APIs. " * 30},
+                "resume_updated_at": "2024-05-01T00:00:00Z",
+            }
+            for index in range(candidates)
+        ],
+    }
+
+
+TRIMS = [("resume_updated_at", None), ("resume_sections", 100), ("resume_sections", None)]
+
+
+def _fit(budget: ContextBudget, payload: dict):
+    return budget.fit(
+        payload, items_key="candidates", trims=TRIMS, text_path=("job", "description"), omitted_key="omitted_candidates"
+    )
+
+
+def test_estimates_differ_by_family_and_scale_with_length() -> None:
+    text = json.dumps(_payload(2))
+    openai = llm_tokens.estimate_tokens(text, "openai")
+    assert 0 < openai < len(text)
+    assert llm_tokens.estimate_tokens(text, "anthropic") > openai
+    assert llm_tokens.estimate_tokens(text, "bedrock", "anthropic.claude-3-haiku") == llm_tokens.estimate_tokens(text, "anthropic")
+    assert llm_tokens.estimate_tokens(text * 2, "openai") >= 2 * openai - 1
+
+
+def test_context_windows_use_prefixes_and_overrides(monkeypatch) -> None:
+    assert llm_tokens.context_window("openai", "gpt-4o-mini") == 128_000
+    assert llm_tokens.context_window("openai", "gpt-4") == 8_192
+    monkeypatch.setattr(settings, "LLM_CONTEXT_WINDOWS", '{"openai:gpt-4o-mini": 16000}')
+    assert llm_tokens.context_window("openai", "gpt-4o-mini") == 16_000
+    assert llm_tokens.prompt_budget("openai", "gpt-4o-mini", 1000) == 15_000
+
+
+def test_context_that_fits_is_untouched() -> None:
+    payload = _payload(2)
+    text, report = _fit(ContextBudget([PromptLimit("openai", "gpt-4o", 100_000)]), payload)
+    assert json.loads(text) == payload
+    assert not report.trimmed
+
+
+def test_fields_are_trimmed_before_candidates_are_dropped() -> None:
+    payload = _payload(3)
+    full = llm_tokens.estimate_tokens(json.dumps(payload, separators=(",", ":")), "openai")
+    text, report = _fit(ContextBudget([PromptLimit("openai", "gpt-4o", int(full * 0.6))]), payload)
+
+    fitted = json.loads(text)
+    assert len(fitted["candidates"]) == 3
+    assert report.trims[0] == "resume_updated_at"
+    assert report.dropped_items == 0
+    assert "resume_sections" in payload["candidates"][0]  # the caller's payload is not modified
+
+
+def test_lowest_priority_candidates_are_dropped_and_counted() -> None:
+    payload = _payload(30)
+    text, report = _fit(ContextBudget([PromptLimit("openai", "gpt-4", 2_000), PromptLimit("anthropic", "claude", 50_000)]), payload)
+
+    fitted = json.loads(text)
+    assert report.dropped_items > 0
+    assert fitted["omitted_candidates"] == report.dropped_items
+    assert fitted["candidates"][0]["candidate_name"] == "Candidate 0"
+    assert report.tokens["openai:gpt-4"] <= 2_000
+
+
+def test_impossible_budget_raises() -> None:
+    with pytest.raises(ContextWindowExceededError):
+        _fit(ContextBudget([PromptLimit("openai", "gpt-4", 5)]), _payload(1))
+
+
+class _UsageProvider(LLMProvider):
+    name = "openai"
+
+    def __init__(self, usage: dict) -> None:
+        self.usage = usage
+        self.requests = []
+
+    async def generate(self, request: LLMRequest) -> str:
+        self.requests.append(request)
+        request.usage = dict(self.usage)
+        return '{"ok": true}'
+
+
+@pytest.fixture
+def orchestrator():
+    llm_resilience.reset()
+    llm_metrics.reset()
+    instance = LLMOrchestrator()
+    instance._providers["openai"] = _UsageProvider({})
+    yield instance
+    llm_metrics.reset()
+
+
+MESSAGES = [LLMMessage(role="user", content="Rank these resumes. " * 200)]
+
+
+async def test_max_tokens_is_reduced_to_fit_the_window(orchestrator, monkeypatch) -> None:
+    monkeypatch.setattr(settings, "LLM_CONTEXT_WINDOWS", '{"openai": 2000}')
+    config = LLMProviderConfig(provider="openai", model="gpt-4o-mini", api_key="sk-test", max_tokens=4000)
+
+    await orchestrator.generate(MESSAGES, config)
+
+    request = orchestrator._providers["openai"].requests[0]
+    assert request.max_tokens + llm_tokens.count_messages(MESSAGES, "openai") == 2000
+
+
+async def test_prompt_without_room_for_a_response_is_rejected(orchestrator, monkeypatch) -> None:
+    monkeypatch.setattr(settings, "LLM_CONTEXT_WINDOWS", '{"openai": 500}')
+    config = LLMProviderConfig(provider="openai", model="gpt-4o-mini", api_key="sk-test")
+    with pytest.raises(ContextWindowExceededError):
+        await orchestrator.generate(MESSAGES, config)
+
+
+async def test_token_usage_is_reported_per_call(orchestrator) -> None:
+    config = LLMProviderConfig(provider="openai", model="gpt-4o-mini", api_key="sk-test")
+    await orchestrator.generate(MESSAGES, config)
+    orchestrator._providers["openai"] = _UsageProvider({"prompt_tokens": 321, "completion_tokens": 7})
+    await orchestrator.generate(MESSAGES, config)
+
+    (totals,) = llm_metrics.get_metrics()["tokens"]
+    assert totals["calls"] == 2
+    assert totals["estimated_calls"] == 1
+    assert totals["prompt_tokens"] == 321 + llm_tokens.count_messages(MESSAGES, "openai", "gpt-4o-mini")
@@ -0,0 +1,141 @@
+import asyncio
+
+import pytest
+
+from app.models.llm_model import LLMFallbackTarget, LLMProviderConfig
+from app.services import llm_metrics, llm_resilience
+from app.services.llm_orchestrator import LLMCallOptions, LLMOrchestrator
+from app.services.llm_providers.base import LLMMessage, LLMProvider, LLMRequest
+
+pytestmark = pytest.mark.anyio
+
+
+class _StubProvider(LLMProvider):
+    def __init__(self, name: str, *, delay: float = 0.0, error: Exception | None = None) -> None:
+        self.name = name
+        self.delay = delay
+        self.error = error
+        self.calls = 0
+        self.cancelled = 0
+
+    async def generate(self, request: LLMRequest) -> str:
+        self.calls += 1
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        if self.error is not None:
+            raise self.error
+        return f'{{"provider": "{self.name}"}}'
+
+    async def generate_stream(self, request: LLMRequest):
+        self.calls += 1
+        if self.error is not None:
+            raise self.error
+        for token in ("{", f'"provider": "{self.name}"', "}"):
+            yield token
+
+
+@pytest.fixture(autouse=True)
+def _clean_state():
+    llm_resilience.reset()
+    llm_metrics.reset()
+    yield
+    llm_resilience.reset()
+    llm_metrics.reset()
+
+
+def _orchestrator(primary: _StubProvider, fallback: _StubProvider) -> LLMOrchestrator:
+    instance = LLMOrchestrator()
+    instance._providers["openai"] = primary
+    instance._providers["anthropic"] = fallback
+    return instance
+
+
+MESSAGES = [LLMMessage(role="user", content="Rank these resumes.")]
+FALLBACK_CREDENTIALS = (LLMProviderConfig(provider="anthropic", model="claude-test", api_key="sk-ant"),)
+
+
+def _config(**overrides) -> LLMProviderConfig:
+    return LLMProviderConfig(
+        **{
+            "provider": "openai",
+            "model": "gpt-4o-mini",
+            "api_key": "sk-test",
+            "fallbacks": [LLMFallbackTarget(provider="anthropic")],
+            **overrides,
+        }
+    )
+
+
+async def test_slow_primary_is_hedged_and_cancelled() -> None:
+    primary, fallback = _StubProvider("openai", delay=5), _StubProvider("anthropic")
+    orchestrator = _orchestrator(primary, fallback)
+
+    result = await orchestrator.generate(
+        MESSAGES, _config(hedge_after_ms=20), options=LLMCallOptions(credentials=FALLBACK_CREDENTIALS)
+    )
+
+    assert result == '{"provider": "anthropic"}'
+    assert primary.cancelled == 1
+    events = {(item["event"], item["provider"]) for item in llm_metrics.get_metrics()["events"]}
+    assert {("hedges", "anthropic"), ("fallback_wins", "anthropic")} <= events
+
+
+async def test_fast_primary_does_not_hedge() -> None:
+    primary, fallback = _StubProvider("openai"), _StubProvider("anthropic")
+    orchestrator = _orchestrator(primary, fallback)
+
+    result = await orchestrator.generate(
+        MESSAGES, _config(hedge_after_ms=1000), options=LLMCallOptions(credentials=FALLBACK_CREDENTIALS)
+    )
+
+    assert result == '{"provider": "openai"}'
+    assert fallback.calls == 0
+
+
+async def test_hard_failure_fails_over_without_waiting_for_hedge() -> None:
+    primary = _StubProvider("openai", error=ValueError("bad request"))
+    fallback = _StubProvider("anthropic")
+    orchestrator = _orchestrator(primary, fallback)
+
+    result = await asyncio.wait_for(
+        orchestrator.generate(MESSAGES, _config(), options=LLMCallOptions(credentials=FALLBACK_CREDENTIALS)),
+        timeout=1,
+    )
+
+    assert result == '{"provider": "anthropic"}'
+
+
+async def test_last_error_is_raised_when_every_candidate_fails() -> None:
+    primary = _StubProvider("openai", error=ValueError("primary down"))
+    fallback = _StubProvider("anthropic", error=ValueError("fallback down"))
+    orchestrator = _orchestrator(primary, fallback)
+
+    with pytest.raises(ValueError, match="primary down"):
+        await orchestrator.generate(MESSAGES, _config(), options=LLMCallOptions(credentials=FALLBACK_CREDENTIALS))
+
+
+async def test_fallback_without_credentials_is_skipped() -> None:
+    primary = _StubProvider("openai", error=ValueError("primary down"))
+    orchestrator = _orchestrator(primary, _StubProvider("anthropic"))
+    config = _config(fallbacks=[LLMFallbackTarget(provider="google", model="gemini-test")])
+
+    with pytest.raises(ValueError, match="primary down"):
+        await orchestrator.generate(MESSAGES, config)
+
+
+async def test_stream_fails_over_before_first_chunk() -> None:
+    primary = _StubProvider("openai", error=ValueError("bad request"))
+    fallback = _StubProvider("anthropic")
+    orchestrator = _orchestrator(primary, fallback)
+
+    chunks = [
+        chunk
+        async for chunk in orchestrator.generate_stream(
+            MESSAGES, _config(), options=LLMCallOptions(credentials=FALLBACK_CREDENTIALS)
+        )
+    ]
+
+    assert "".join(chunks) == '{"provider": "anthropic"}'
@@ -0,0 +1,133 @@
+import json
+import time
+
+import httpx
+import pytest
+
+from app.core.config import settings
+from app.models.llm_model import LLMProviderConfig
+from app.services import llm_resilience, recruiter_workflow_service
+from app.services.llm_orchestrator import LLMOrchestrator
+from app.services.llm_providers.base import LLMMessage, LLMProvider, LLMRequest, ProviderNotConfiguredError
+
+pytestmark = pytest.mark.anyio
+
+CONTEXT = json.dumps(
+    {
+        "job": {"title": "Backend Engineer", "description": "Python services"},
+        "candidates": [
+            {"candidate_id": "cand-1", "candidate_name": "Ada"},
+            {"candidate_id": "cand-2", "candidate_name": "Grace"},
+        ],
+    },
+    separators=(",", ":"),
+)
+
+
+class _RecordedUpstream(LLMProvider):
+    name = "openai"
+
+    def __init__(self) -> None:
+        self.calls = 0
+
+    async def generate(self, request: LLMRequest) -> str:
+        self.calls += 1
+        assert "fake_mode" not in request.extra_payload
+        assert request.base_url is None
+        return '{"core_skills": [{"name": "Recorded", "reason": "from upstream"}]}'
+
+
+@pytest.fixture(autouse=True)
+def fake_enabled(monkeypatch):
+    monkeypatch.setattr(settings, "LLM_FAKE_ENABLED", True)
+
+
+@pytest.fixture
+def orchestrator():
+    llm_resilience.reset()
+    return LLMOrchestrator()
+
+
+def _config(**extra_payload) -> LLMProviderConfig:
+    return LLMProviderConfig(provider="fake", model="", extra_payload=extra_payload)
+
+
+async def test_fake_provider_is_disabled_by_default(orchestrator, monkeypatch) -> None:
+    monkeypatch.setattr(settings, "LLM_FAKE_ENABLED", False)
+    messages = [LLMMessage(role="user", content="Return JSON.")]
+    with pytest.raises(ProviderNotConfiguredError, match="LLM_FAKE_ENABLED"):
+        await orchestrator.generate(messages, _config(fake_mode="record", fake_upstream="openai"))
+
+
+async def test_requested_delays_are_capped(orchestrator, monkeypatch) -> None:
+    monkeypatch.setattr(settings, "LLM_FAKE_MAX_LATENCY_MS", 10)
+    monkeypatch.setattr(settings, "LLM_FAKE_MIN_TOKENS_PER_SECOND", 5000.0)
+    messages = [LLMMessage(role="user", content="Summarise the candidates as markdown.\n" + CONTEXT)]
+    started = time.perf_counter()
+    await orchestrator.generate(
+        messages, _config(fake_latency_ms=600000, fake_tokens_per_second=0.001), response_format="text"
+    )
+    assert time.perf_counter() - started < 1
+
+
+async def test_every_workflow_step_parses_synthetic_json(orchestrator) -> None:
+    config = _config()
+    core = await recruiter_workflow_service._invoke_core_skills(orchestrator, config, CONTEXT)
+    analysis = await recruiter_workflow_service._invoke_ai_analysis(orchestrator, config, CONTEXT)
+    shortlist = await recruiter_workflow_service._invoke_ranked_shortlist(orchestrator, config, CONTEXT)
+    readout = await recruiter_workflow_service._invoke_detailed_readout(orchestrator, config, CONTEXT)
+    engagement = await recruiter_workflow_service._invoke_engagement_plan(orchestrator, config, CONTEXT)
+    fairness = await recruiter_workflow_service._invoke_fairness_guidance(orchestrator, config, CONTEXT)
+    interview = await recruiter_workflow_service._invoke_interview_pack(orchestrator, config, CONTEXT)
+
+    assert len(core) == 3 and core[0].name
+    assert [item.candidate_id for item in analysis["candidates"]] == ["cand-1", "cand-2"]
+    assert analysis["markdown"].startswith("## ")
+    assert [item.rank for item in shortlist] == [1, 2]
+    assert {item.candidate_id for item in readout} == {"cand-1", "cand-2"}
+    assert engagement and fairness and interview
+
+
+async def test_stream_is_paced_by_tokens_per_second(orchestrator) -> None:
+    messages = [LLMMessage(role="user", content="Summarise the candidates as markdown.\n" + CONTEXT)]
+    started = time.perf_counter()
+    chunks = [
+        chunk
+        async for chunk in orchestrator.generate_stream(
+            messages, _config(fake_tokens_per_second=2000, fake_latency_ms=20), response_format="text"
+        )
+    ]
+    elapsed = time.perf_counter() - started
+
+    assert len(chunks) > 10
+    assert elapsed >= 0.02 + len(chunks) / 2000
+    assert "Ada" in "".join(chunks)
+
+
+async def test_injected_errors_surface_as_provider_errors(orchestrator) -> None:
+    messages = [LLMMessage(role="user", content="Return JSON.")]
+    with pytest.raises(httpx.HTTPStatusError) as error:
+        await orchestrator.generate(messages, _config(fake_error_rate=1, fake_error_status=400))
+    assert error.value.response.status_code == 400
+
+
+async def test_record_then_replay_cassette(orchestrator, monkeypatch, tmp_path) -> None:
+    monkeypatch.setattr(settings, "LLM_FAKE_CASSETTE_DIR", str(tmp_path))
+    upstream = orchestrator._providers["openai"] = _RecordedUpstream()
+    messages = [LLMMessage(role="user", content="Identify core_skills.\n" + CONTEXT)]
+
+    recorded = await orchestrator.generate(
+        messages,
+        _config(fake_mode="record", fake_upstream="openai", fake_cassette="workflow").copy(
+            update={"base_url": "https://attacker.test/v1"}
+        ),
+    )
+    replayed = await orchestrator.generate(messages, _config(fake_mode="replay", fake_cassette="workflow"))
+
+    assert recorded == replayed
+    assert upstream.calls == 1
+    assert (tmp_path / "workflow.json").exists()
+    with pytest.raises(RuntimeError, match="No recorded response"):
+        await orchestrator.generate(
+            [LLMMessage(role="user", content="Something else")], _config(fake_mode="replay", fake_cassette="workflow")
+        )
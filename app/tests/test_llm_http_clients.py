@@ -0,0 +1,176 @@
+import json
+from datetime import datetime, timedelta
+
+import httpx
+import pytest
+
+from app.core.config import settings
+from app.services.llm_providers import DeepSeekProvider, OpenAIProvider, capabilities, http_clients
+from app.services.llm_providers.base import LLMMessage, LLMRequest, ProviderNotConfiguredError
+
+pytestmark = pytest.mark.anyio
+
+
+def _openai_handler(calls):
+    def handler(request: httpx.Request) -> httpx.Response:
+        payload = json.loads(request.content)
+        calls.append(payload)
+        if "response_format" in payload:
+            return httpx.Response(400, json={"error": "response_format unsupported"})
+        if payload.get("stream"):
+            body = 'data: {"choices": [{"delta": {"content": "{\\"ok\\": true}"}}]}\n\ndata: [DONE]\n\n'
+            return httpx.Response(200, text=body, headers={"Content-Type": "text/event-stream"})
+        return httpx.Response(200, json={"choices": [{"message": {"content": '{"ok": true}'}}]})
+
+    return handler
+
+
+@pytest.fixture(autouse=True)
+def reset_capabilities():
+    # Learned JSON-mode support is module state; keep it from leaking between tests.
+    capabilities.reset()
+    yield
+    capabilities.reset()
+
+
+@pytest.fixture
+async def mock_openai():
+    # Pooled clients are module state: close them so every test builds its client on the mock transport.
+    calls = []
+    await http_clients.aclose()
+    http_clients.set_transport_factory(lambda: httpx.MockTransport(_openai_handler(calls)))
+    yield calls
+    http_clients.set_transport_factory(None)
+    await http_clients.aclose()
+
+
+async def test_clients_are_shared_per_provider_and_origin() -> None:
+    clients = http_clients.LLMHTTPClients(
+        connect_timeout=1.0,
+        read_timeout=5.0,
+        max_connections=4,
+        max_keepalive_connections=2,
+        keepalive_expiry=10.0,
+        http2=False,
+    )
+    first = clients.get("openai", "https://api.openai.com/v1/chat/completions")
+    assert clients.get("openai", "https://API.openai.com/v1/models") is first
+    assert clients.get("deepseek", "https://api.openai.com/v1/chat/completions") is not first
+    assert first.timeout.connect == 1.0 and first.timeout.read == 5.0
+
+    await clients.aclose()
+    assert first.is_closed
+    assert clients.get("openai", "https://api.openai.com/v1") is not first
+    await clients.aclose()
+
+
+async def test_provider_reuses_pooled_client_for_json_fallback(mock_openai) -> None:
+    request = LLMRequest(
+        model="gpt-4o-mini",
+        messages=[LLMMessage(role="user", content="hi")],
+        api_key="test-key",
+        base_url="https://llm.example.test/v1",
+    )
+
+    assert await OpenAIProvider().generate(request) == '{"ok": true}'
+    assert len(mock_openai) == 2
+
+    metrics = http_clients.get_metrics()
+    (client,) = [entry for entry in metrics["clients"] if entry["origin"] == "https://llm.example.test"]
+    assert client["provider"] == "openai"
+    assert client["requests"] == 2
+    assert client["open"] is True
+
+
+async def test_json_mode_fallback_is_learned_per_model_and_base_url(mock_openai) -> None:
+    def request(base_url: str) -> LLMRequest:
+        return LLMRequest(
+            model="gpt-4o-mini", messages=[LLMMessage(role="user", content="hi")], api_key="test-key", base_url=base_url
+        )
+
+    provider = OpenAIProvider()
+    await provider.generate(request("https://llm.example.test/v1"))
+    await provider.generate(request("https://llm.example.test/v1"))
+    assert ["response_format" in payload for payload in mock_openai] == [True, False, False]
+    assert capabilities.json_mode("openai", "gpt-4o-mini", "https://llm.example.test/v1") is False
+
+    await provider.generate(request("https://other.example.test/v1"))
+    assert ["response_format" in payload for payload in mock_openai[3:]] == [True, False]
+
+    assert capabilities.reset("openai") == 2
+    await provider.generate(request("https://llm.example.test/v1"))
+    assert "response_format" in mock_openai[5]
+
+
+async def test_stream_falls_back_to_text_mode_and_learns_it(mock_openai) -> None:
+    request = LLMRequest(
+        model="gpt-4o-mini",
+        messages=[LLMMessage(role="user", content="hi")],
+        api_key="test-key",
+        base_url="https://llm.example.test/v1",
+    )
+    provider = OpenAIProvider()
+
+    assert "".join([chunk async for chunk in provider.generate_stream(request)]) == '{"ok": true}'
+    assert ["response_format" in payload for payload in mock_openai] == [True, False]
+    assert capabilities.json_mode("openai", "gpt-4o-mini", "https://llm.example.test/v1") is False
+
+    assert "".join([chunk async for chunk in provider.generate_stream(request)]) == '{"ok": true}'
+    assert "response_format" not in mock_openai[2]
+
+
+async def test_deepseek_shares_the_openai_compatible_client() -> None:
+    urls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        urls.append(str(request.url))
+        return httpx.Response(401, json={"error": "bad key"})
+
+    await http_clients.aclose()
+    http_clients.set_transport_factory(lambda: httpx.MockTransport(handler))
+    try:
+        request = LLMRequest(model="deepseek-chat", messages=[LLMMessage(role="user", content="hi")], api_key="test-key")
+        with pytest.raises(ProviderNotConfiguredError, match="Invalid DeepSeek API key"):
+            await DeepSeekProvider().generate(request)
+    finally:
+        http_clients.set_transport_factory(None)
+        await http_clients.aclose()
+    assert urls == ["https://api.deepseek.com/chat/completions"]
+
+
+@pytest.mark.parametrize(
+    "error",
+    [
+        "'messages' must contain the word 'json' in some form, to use 'response_format' of type 'json_object'.",
+        "Invalid value for 'temperature'.",
+    ],
+)
+async def test_unrelated_400_is_retried_but_not_learned(error) -> None:
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        payload = json.loads(request.content)
+        calls.append(payload)
+        if "response_format" in payload:
+            return httpx.Response(400, json={"error": {"message": error}})
+        return httpx.Response(200, json={"choices": [{"message": {"content": '{"ok": true}'}}]})
+
+    await http_clients.aclose()
+    http_clients.set_transport_factory(lambda: httpx.MockTransport(handler))
+    try:
+        request = LLMRequest(model="gpt-4o-mini", messages=[LLMMessage(role="user", content="hi")], api_key="test-key")
+        assert await OpenAIProvider().generate(request) == '{"ok": true}'
+    finally:
+        http_clients.set_transport_factory(None)
+        await http_clients.aclose()
+    assert len(calls) == 2
+    assert capabilities.json_mode("openai", "gpt-4o-mini", "https://api.openai.com/v1") is None
+
+
+async def test_learned_negative_expires() -> None:
+    capabilities.record_json_mode("openai", "gpt-4o-mini", "https://llm.example.test/v1", False)
+    assert capabilities.json_mode("openai", "gpt-4o-mini", "https://llm.example.test/v1") is False
+
+    entry = capabilities._json_mode[("openai", "gpt-4o-mini", "https://llm.example.test/v1")]
+    entry["learned_at"] = datetime.utcnow() - timedelta(seconds=settings.LLM_JSON_MODE_NEGATIVE_TTL_SECONDS + 1)
+    assert capabilities.json_mode("openai", "gpt-4o-mini", "https://llm.example.test/v1") is None
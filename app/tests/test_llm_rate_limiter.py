@@ -0,0 +1,96 @@
+import asyncio
+
+import httpx
+import pytest
+
+from app.models.llm_model import LLMProviderConfig
+from app.services import llm_rate_limiter
+from app.services.llm_orchestrator import LLMOrchestrator
+from app.services.llm_providers.base import LLMMessage, LLMProvider, LLMRequest
+from app.services.llm_rate_limiter import ProviderLimits, RateLimitTimeoutError, _KeyLimiter
+
+pytestmark = pytest.mark.anyio
+
+
+def _limits(**overrides) -> ProviderLimits:
+    values = {"concurrency": 1, "requests_per_minute": 0, "tokens_per_minute": 0, "queue_timeout": 5.0}
+    return ProviderLimits(**{**values, **overrides})
+
+
+async def test_waiters_are_admitted_in_arrival_order() -> None:
+    limiter = _KeyLimiter(_limits())
+    order = []
+
+    async def call(index: int) -> None:
+        async with limiter.slot(tokens=1):
+            order.append(index)
+            await asyncio.sleep(0.01)
+
+    tasks = []
+    for index in range(5):
+        tasks.append(asyncio.create_task(call(index)))
+        await asyncio.sleep(0)
+    assert limiter.snapshot()["queue_depth"] == 4
+    await asyncio.gather(*tasks)
+
+    assert order == [0, 1, 2, 3, 4]
+    snapshot = limiter.snapshot()
+    assert snapshot["admitted"] == 5 and snapshot["queue_depth"] == 0 and snapshot["in_flight"] == 0
+    assert snapshot["max_wait_ms"] > 0
+
+
+async def test_queue_timeout_raises() -> None:
+    limiter = _KeyLimiter(_limits(queue_timeout=0.05))
+    async with limiter.slot(tokens=1):
+        with pytest.raises(RateLimitTimeoutError):
+            async with limiter.slot(tokens=1):
+                pass
+    assert limiter.snapshot()["timeouts"] == 1
+    async with limiter.slot(tokens=1):  # the slot was not leaked by the timed-out waiter
+        pass
+
+
+async def test_token_budget_delays_admission() -> None:
+    limiter = _KeyLimiter(_limits(concurrency=4, tokens_per_minute=6000))  # refills 100 tokens/sec
+    async with limiter.slot(tokens=6000):
+        pass
+    started = asyncio.get_running_loop().time()
+    async with limiter.slot(tokens=10):
+        pass
+    assert asyncio.get_running_loop().time() - started >= 0.08
+
+
+def test_parse_retry_after() -> None:
+    assert llm_rate_limiter.parse_retry_after("3", default=1.0) == 3.0
+    assert llm_rate_limiter.parse_retry_after(None, default=1.0) == 1.0
+    assert llm_rate_limiter.parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT", default=1.0) == 0.0
+    assert llm_rate_limiter.parse_retry_after("soon", default=1.5) == 1.5
+
+
+class _ThrottledOnceProvider(LLMProvider):
+    name = "openai"
+
+    def __init__(self) -> None:
+        self.calls = 0
+
+    async def generate(self, request: LLMRequest) -> str:
+        self.calls += 1
+        if self.calls == 1:
+            response = httpx.Response(429, headers={"Retry-After": "0.1"}, request=httpx.Request("POST", "https://x"))
+            raise httpx.HTTPStatusError("rate limited", request=response.request, response=response)
+        return "{}"
+
+
+async def test_orchestrator_waits_out_retry_after() -> None:
+    llm_rate_limiter.reset()
+    orchestrator = LLMOrchestrator()
+    provider = orchestrator._providers["openai"] = _ThrottledOnceProvider()
+    config = LLMProviderConfig(provider="openai", model="gpt-4o-mini", api_key="sk-test")
+
+    started = asyncio.get_running_loop().time()
+    assert await orchestrator.generate([LLMMessage(role="user", content="hi")], config) == "{}"
+
+    assert provider.calls == 2
+    assert asyncio.get_running_loop().time() - started >= 0.09
+    (entry,) = llm_rate_limiter.get_metrics()["limiters"]
+    assert (entry["provider"], entry["throttled"], entry["admitted"]) == ("openai", 1, 2)
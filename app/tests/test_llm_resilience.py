@@ -0,0 +1,108 @@
+import httpx
+import pytest
+
+from app.core.config import settings
+from app.models.llm_model import LLMProviderConfig
+from app.services import llm_resilience
+from app.services.llm_orchestrator import LLMOrchestrator
+from app.services.llm_providers.base import LLMMessage, LLMProvider, LLMRequest
+from app.services.llm_resilience import CircuitBreaker, CircuitOpenError, RetryBudget
+
+pytestmark = pytest.mark.anyio
+
+MESSAGES = [LLMMessage(role="user", content="hi")]
+CONFIG = LLMProviderConfig(provider="openai", model="gpt-4o-mini", api_key="sk-test")
+
+
+def _status_error(status_code: int) -> httpx.HTTPStatusError:
+    request = httpx.Request("POST", "https://api.openai.com/v1/chat/completions")
+    response = httpx.Response(status_code, request=request)
+    return httpx.HTTPStatusError(f"HTTP {status_code}", request=request, response=response)
+
+
+class _ScriptedProvider(LLMProvider):
+    """Raises the scripted exceptions in order, then answers."""
+
+    name = "openai"
+
+    def __init__(self, *failures: Exception) -> None:
+        self.failures = list(failures)
+        self.calls = 0
+
+    async def generate(self, request: LLMRequest) -> str:
+        self.calls += 1
+        if self.failures:
+            raise self.failures.pop(0)
+        return "{}"
+
+
+@pytest.fixture(autouse=True)
+def fast_retries(monkeypatch):
+    monkeypatch.setattr(settings, "LLM_RETRY_BASE_DELAY_SECONDS", 0.001)
+    monkeypatch.setattr(settings, "LLM_RETRY_MAX_DELAY_SECONDS", 0.002)
+    llm_resilience.reset()
+    yield
+    llm_resilience.reset()
+
+
+def _orchestrator(provider: LLMProvider) -> LLMOrchestrator:
+    orchestrator = LLMOrchestrator()
+    orchestrator._providers["openai"] = provider
+    return orchestrator
+
+
+async def test_transient_failures_are_retried() -> None:
+    provider = _ScriptedProvider(_status_error(503), httpx.ConnectError("reset"))
+    assert await _orchestrator(provider).generate(MESSAGES, CONFIG) == "{}"
+    assert provider.calls == 3
+    assert llm_resilience.breaker("openai").snapshot()["state"] == "closed"
+
+
+async def test_client_errors_are_not_retried() -> None:
+    provider = _ScriptedProvider(_status_error(400))
+    with pytest.raises(httpx.HTTPStatusError):
+        await _orchestrator(provider).generate(MESSAGES, CONFIG)
+    assert provider.calls == 1
+    assert llm_resilience.breaker("openai").consecutive_failures == 0
+
+
+async def test_breaker_opens_and_fails_fast(monkeypatch) -> None:
+    monkeypatch.setattr(settings, "LLM_CIRCUIT_FAILURE_THRESHOLD", 2)
+    provider = _ScriptedProvider(*[_status_error(502) for _ in range(10)])
+    orchestrator = _orchestrator(provider)
+
+    with pytest.raises(httpx.HTTPStatusError):
+        await orchestrator.generate(MESSAGES, CONFIG)
+    assert provider.calls == 2  # the second failure opened the circuit, so no third attempt
+
+    with pytest.raises(CircuitOpenError):
+        await orchestrator.generate(MESSAGES, CONFIG)
+    assert provider.calls == 2
+
+    (entry,) = llm_resilience.get_metrics()["providers"]
+    assert entry["circuit"]["state"] == "open" and entry["circuit"]["rejected"] == 1
+
+
+def test_half_open_probe_closes_or_reopens_circuit() -> None:
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.0)
+    breaker.record_failure(RuntimeError("down"))
+    assert breaker.state == "open"
+
+    breaker.before_call("openai")
+    assert breaker.state == "half_open"
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call("openai")  # only one probe at a time
+    breaker.record_failure(RuntimeError("still down"))
+    assert breaker.state == "open" and breaker.times_opened == 2
+
+    breaker.before_call("openai")
+    breaker.record_success()
+    assert breaker.state == "closed"
+
+
+def test_retry_budget_caps_retries_relative_to_traffic() -> None:
+    budget = RetryBudget(ratio=0.5, min_retries=1)
+    for _ in range(4):
+        budget.record_call()
+    assert [budget.try_spend() for _ in range(4)] == [True, True, True, False]
+    assert budget.snapshot()["exhausted"] == 1
@@ -0,0 +1,134 @@
+import asyncio
+from dataclasses import replace
+
+import pytest
+
+from app.models.llm_model import LLMProviderConfig
+from app.services import llm_resilience, llm_singleflight
+from app.services.llm_orchestrator import LLMCallOptions, LLMOrchestrator
+from app.services.llm_providers.base import LLMMessage, LLMProvider, LLMRequest
+
+pytestmark = pytest.mark.anyio
+
+
+class _GatedProvider(LLMProvider):
+    """Holds every call until ``release`` is set so tests can pile up concurrent callers."""
+
+    name = "openai"
+
+    def __init__(self, *, error: Exception | None = None) -> None:
+        self.release = asyncio.Event()
+        self.error = error
+        self.calls = 0
+
+    async def generate(self, request: LLMRequest) -> str:
+        self.calls += 1
+        await self.release.wait()
+        if self.error is not None:
+            raise self.error
+        return '{"ok": true}'
+
+    async def generate_stream(self, request: LLMRequest):
+        self.calls += 1
+        yield "{"
+        await self.release.wait()
+        yield '"ok": true'
+        yield "}"
+
+
+@pytest.fixture
+def provider():
+    llm_resilience.reset()
+    return _GatedProvider()
+
+
+@pytest.fixture
+def orchestrator(provider):
+    instance = LLMOrchestrator()
+    instance._providers["openai"] = provider
+    return instance
+
+
+MESSAGES = [LLMMessage(role="user", content="Rank these resumes.")]
+CONFIG = LLMProviderConfig(provider="openai", model="gpt-4o-mini", api_key="sk-test")
+
+
+async def _settle() -> None:
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+async def test_concurrent_identical_calls_share_one_request(orchestrator, provider) -> None:
+    callers = [asyncio.create_task(orchestrator.generate(MESSAGES, CONFIG)) for _ in range(3)]
+    await _settle()
+    provider.release.set()
+
+    assert await asyncio.gather(*callers) == ['{"ok": true}'] * 3
+    assert provider.calls == 1
+
+
+async def test_different_orgs_are_not_coalesced(orchestrator, provider) -> None:
+    callers = [
+        asyncio.create_task(orchestrator.generate(MESSAGES, CONFIG, options=LLMCallOptions(org_id=org)))
+        for org in ("org-a", "org-b")
+    ]
+    await _settle()
+    provider.release.set()
+    await asyncio.gather(*callers)
+    assert provider.calls == 2
+
+
+async def test_different_credentials_are_not_coalesced(orchestrator, provider) -> None:
+    callers = [
+        asyncio.create_task(orchestrator.generate(MESSAGES, CONFIG.copy(update={"api_key": key})))
+        for key in ("sk-first", "sk-second")
+    ]
+    await _settle()
+    provider.release.set()
+    await asyncio.gather(*callers)
+    assert provider.calls == 2
+
+
+async def test_flight_key_does_not_expose_the_credential() -> None:
+    request = LLMRequest(model="gpt-4o-mini", messages=MESSAGES, api_key="sk-secret")
+    key = llm_singleflight.flight_key("openai", request, None, "org-a")
+    assert "sk-secret" not in key
+    assert key != llm_singleflight.flight_key("openai", replace(request, api_key="sk-other"), None, "org-a")
+
+
+async def test_error_reaches_every_caller(orchestrator) -> None:
+    orchestrator._providers["openai"] = failing = _GatedProvider(error=ValueError("bad request"))
+    callers = [asyncio.create_task(orchestrator.generate(MESSAGES, CONFIG)) for _ in range(2)]
+    await _settle()
+    failing.release.set()
+
+    results = await asyncio.gather(*callers, return_exceptions=True)
+    assert all(isinstance(result, ValueError) for result in results)
+    assert failing.calls == 1
+
+
+async def test_cancelled_caller_does_not_cancel_the_shared_call(orchestrator, provider) -> None:
+    leader = asyncio.create_task(orchestrator.generate(MESSAGES, CONFIG))
+    follower = asyncio.create_task(orchestrator.generate(MESSAGES, CONFIG))
+    await _settle()
+    leader.cancel()
+    await _settle()
+    provider.release.set()
+
+    assert await follower == '{"ok": true}'
+    assert leader.cancelled()
+
+
+async def test_streams_fan_out_from_one_provider_stream(orchestrator, provider) -> None:
+    async def consume() -> str:
+        return "".join([chunk async for chunk in orchestrator.generate_stream(MESSAGES, CONFIG)])
+
+    first = asyncio.create_task(consume())
+    await _settle()
+    second = asyncio.create_task(consume())
+    await _settle()
+    provider.release.set()
+
+    assert await first == await second == '{"ok": true}'
+    assert provider.calls == 1
+    assert llm_singleflight.get_metrics()["streams_in_flight"] == 0
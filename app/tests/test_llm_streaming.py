@@ -0,0 +1,124 @@
+"""Streaming contract tests: each provider talks to an in-process mock of its vendor API."""
+
+import json
+
+import httpx
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+from app.models.llm_model import LLMProviderConfig
+from app.services import llm_metrics
+from app.services.llm_orchestrator import LLMOrchestrator
+from app.services.llm_providers import http_clients
+from app.services.llm_providers.base import LLMMessage
+
+pytestmark = pytest.mark.anyio
+
+mock_vendor = FastAPI()
+received = []
+
+
+def _sse(events):
+    async def body():
+        for name, data in events:
+            if name:
+                yield f"event: {name}\n"
+            yield f"data: {data if isinstance(data, str) else json.dumps(data)}\n\n"
+
+    return StreamingResponse(body(), media_type="text/event-stream")
+
+
+@mock_vendor.post("/v1/messages")
+async def anthropic_messages(request: Request):
+    payload = await request.json()
+    received.append(("anthropic", dict(request.headers), payload))
+    if request.headers.get("x-api-key") != "anthropic-key":
+        return JSONResponse({"type": "error"}, status_code=401)
+    return _sse(
+        [
+            ("message_start", {"type": "message_start", "message": {"id": "msg_1"}}),
+            ("content_block_start", {"type": "content_block_start", "index": 0}),
+            ("ping", {"type": "ping"}),
+            ("content_block_delta", {"type": "content_block_delta", "delta": {"type": "text_delta", "text": "Hel"}}),
+            ("content_block_delta", {"type": "content_block_delta", "delta": {"type": "text_delta", "text": "lo"}}),
+            ("content_block_stop", {"type": "content_block_stop", "index": 0}),
+            ("message_stop", {"type": "message_stop"}),
+        ]
+    )
+
+
+@mock_vendor.post("/v1beta/models/{model_action}")
+async def gemini_stream(model_action: str, request: Request):
+    payload = await request.json()
+    received.append(("google", dict(request.query_params), payload))
+    assert model_action == "gemini-1.5-flash:streamGenerateContent"
+    assert request.query_params.get("alt") == "sse"
+    chunks = [{"candidates": [{"content": {"role": "model", "parts": [{"text": text}]}}]} for text in ("Gem", "ini")]
+    return _sse([(None, chunk) for chunk in chunks])
+
+
+@mock_vendor.post("/chat/completions")
+async def deepseek_chat(request: Request):
+    payload = await request.json()
+    received.append(("deepseek", dict(request.headers), payload))
+    if "response_format" in payload:
+        return JSONResponse({"error": {"message": "response_format is not supported"}}, status_code=400)
+    chunks = [{"choices": [{"delta": {"content": text}}]} for text in ("Deep", "Seek")]
+    return _sse([*((None, chunk) for chunk in chunks), (None, "[DONE]")])
+
+
+@pytest.fixture(autouse=True)
+async def route_providers_to_mock():
+    received.clear()
+    llm_metrics.reset()
+    http_clients.set_transport_factory(lambda: httpx.ASGITransport(app=mock_vendor))
+    await http_clients.aclose()
+    yield
+    http_clients.set_transport_factory(None)
+    await http_clients.aclose()
+
+
+async def _stream(config: LLMProviderConfig, response_format: str = "text"):
+    messages = [LLMMessage(role="system", content="Be brief."), LLMMessage(role="user", content="Say hello")]
+    return [chunk async for chunk in LLMOrchestrator().generate_stream(messages, config, response_format=response_format)]
+
+
+async def test_anthropic_streams_text_deltas() -> None:
+    config = LLMProviderConfig(provider="anthropic", model="claude-3-haiku-20240307", api_key="anthropic-key")
+    assert await _stream(config) == ["Hel", "lo"]
+
+    (_, headers, payload), = received
+    assert payload["stream"] is True
+    assert payload["system"] == "Be brief."
+    assert headers["anthropic-version"]
+
+
+async def test_anthropic_stream_rejects_bad_key() -> None:
+    config = LLMProviderConfig(provider="anthropic", model="claude-3-haiku-20240307", api_key="wrong")
+    with pytest.raises(RuntimeError, match="Invalid Anthropic API key"):
+        await _stream(config)
+
+
+async def test_gemini_streams_sse_parts() -> None:
+    config = LLMProviderConfig(provider="google", model="gemini-1.5-flash", api_key="google-key")
+    assert await _stream(config) == ["Gem", "ini"]
+    (_, params, _), = received
+    assert params["key"] == "google-key"
+
+
+async def test_deepseek_streams_and_falls_back_from_json_mode() -> None:
+    config = LLMProviderConfig(
+        provider="deepseek", model="deepseek-chat", api_key="deepseek-key", base_url="https://api.deepseek.com"
+    )
+    assert await _stream(config, response_format="json") == ["Deep", "Seek"]
+    assert ["response_format" in payload for _, _, payload in received] == [True, False]
+
+
+async def test_streaming_records_time_to_first_token() -> None:
+    config = LLMProviderConfig(provider="google", model="gemini-1.5-flash", api_key="google-key")
+    await _stream(config)
+
+    (ttft,) = llm_metrics.get_metrics()["ttft_ms"]
+    assert (ttft["provider"], ttft["model"], ttft["count"]) == ("google", "gemini-1.5-flash", 1)
+    assert llm_metrics.percentile("ttft_ms", "google", "gemini-1.5-flash", 0.95) is not None
@@ -0,0 +1,114 @@
+from datetime import datetime
+
+import httpx
+import pytest
+from pymongo.errors import PyMongoError
+
+from app.models.llm_model import LLMProviderConfig
+from app.services import llm_resilience, llm_telemetry
+from app.services.llm_orchestrator import LLMOrchestrator
+from app.services.llm_providers.base import LLMMessage, LLMProvider, LLMRequest
+
+pytestmark = pytest.mark.anyio
+
+
+class _Provider(LLMProvider):
+    name = "openai"
+
+    def __init__(self, error: Exception | None = None) -> None:
+        self.error = error
+
+    async def generate(self, request: LLMRequest) -> str:
+        if self.error is not None:
+            raise self.error
+        request.usage = {"prompt_tokens": 1000, "completion_tokens": 200}
+        return '{"ok": true}'
+
+
+class _UnavailableCollection:
+    async def bulk_write(self, *args, **kwargs):
+        raise PyMongoError("connection refused")
+
+
+@pytest.fixture(autouse=True)
+def _empty_buffer():
+    llm_resilience.reset()
+    llm_telemetry._buffer.clear()
+    yield
+    llm_telemetry._buffer.clear()
+
+
+def _apply(documents: dict, query: dict, update: dict) -> None:
+    """Just enough of Mongo's upsert semantics for the bucket updates."""
+    document = documents.setdefault(tuple(sorted(query.items())), dict(query))
+    for path, amount in update["$inc"].items():
+        target = document
+        *parents, leaf = path.split(".")
+        for parent in parents:
+            target = target.setdefault(parent, {})
+        target[leaf] = target.get(leaf, 0) + amount
+    for name, spec in update["$push"].items():
+        document[name] = (document.get(name, []) + spec["$each"])[spec["$slice"]:]
+
+
+CONFIG = LLMProviderConfig(provider="openai", model="gpt-4o-mini", api_key="sk-test")
+MESSAGES = [LLMMessage(role="user", content="Rank these resumes.")]
+
+
+async def test_calls_are_recorded_with_usage_cost_and_errors() -> None:
+    orchestrator = LLMOrchestrator()
+    orchestrator._providers["openai"] = _Provider()
+    await orchestrator.generate(MESSAGES, CONFIG)
+    request = httpx.Request("POST", "https://api.openai.com/v1/chat/completions")
+    orchestrator._providers["openai"] = _Provider(httpx.HTTPStatusError("bad", request=request, response=httpx.Response(400, request=request)))
+    with pytest.raises(httpx.HTTPStatusError):
+        await orchestrator.generate(MESSAGES, CONFIG)
+
+    ok, failed = llm_telemetry._buffer
+    assert (ok["prompt_tokens"], ok["completion_tokens"], ok["error"]) == (1000, 200, None)
+    assert ok["cost_usd"] == pytest.approx((1000 * 0.15 + 200 * 0.60) / 1_000_000)
+    assert failed["error"] == "HTTPStatusError(400)"
+
+
+def test_buckets_aggregate_by_dimension() -> None:
+    at = datetime(2025, 3, 1, 10, 15)
+    batch = [
+        {"at": at, "provider": "openai", "model": "gpt-4o-mini", "step": "core_skills", "org_id": None,
+         "latency_ms": latency, "ttfb_ms": None, "prompt_tokens": 100, "completion_tokens": 10,
+         "cost_usd": 0.001, "cache_hit": False, "error": None}
+        for latency in range(100, 1100, 100)
+    ]
+    batch.append({**batch[0], "step": "ai_analysis", "latency_ms": 5.0, "cache_hit": True, "cost_usd": 0.0})
+    batch.append({**batch[0], "model": "gpt-4o", "error": "ReadTimeout", "cost_usd": 0.0})
+
+    documents: dict = {}
+    for query, update in llm_telemetry._bucket_updates(batch):
+        assert query["bucket"] == datetime(2025, 3, 1, 10, 0)
+        _apply(documents, query, update)
+
+    by_model = {row["model"]: row for row in llm_telemetry.summarise(documents.values(), ["provider", "model"])}
+    mini = by_model["gpt-4o-mini"]
+    assert mini["calls"] == 11
+    assert mini["cache_hit_rate"] == pytest.approx(1 / 11, abs=1e-4)
+    assert (mini["latency_p50_ms"], mini["latency_p95_ms"]) == (600, 1000)  # the cache hit is not a latency sample
+    assert mini["cost_usd"] == pytest.approx(0.01)
+    assert by_model["gpt-4o"]["error_classes"] == {"ReadTimeout": 1}
+
+    by_step = {row["step"] for row in llm_telemetry.summarise(documents.values(), ["step"])}
+    assert by_step == {"core_skills", "ai_analysis"}
+
+
+async def test_failed_flush_drops_the_batch_without_raising(monkeypatch) -> None:
+    monkeypatch.setattr(llm_telemetry, "_collection", _UnavailableCollection)
+    before = llm_telemetry.get_metrics()
+    llm_telemetry.record(provider="openai", model="gpt-4o-mini", step=None, org_id=None, latency_ms=12.0)
+
+    assert await llm_telemetry.flush() == 0
+    after = llm_telemetry.get_metrics()
+    assert after["dropped"] == before["dropped"] + 1
+    assert after["buffered"] == 0
+
+
+async def test_unknown_dimension_is_rejected() -> None:
+    with pytest.raises(ValueError):
+        await llm_telemetry.aggregate(group_by=["region"], since=datetime.utcnow())
@@ -0,0 +1,70 @@
+from datetime import datetime, timedelta
+from typing import Any, Dict, List
+
+import pytest
+
+from app.core import database
+from app.migrations import Migration, MigrationLockTimeoutError, run_migrations
+
+pytestmark = pytest.mark.anyio
+
+
+class _FlagMigration(Migration):
+    version = 9001
+    name = "test_flag_documents"
+    collection = "test_migration_documents"
+    batch_size = 2
+
+    def pending_filter(self) -> Dict[str, Any]:
+        return {"flag": {"$exists": False}}
+
+    async def migrate_batch(self, collection, documents: List[Dict[str, Any]]) -> int:
+        result = await collection.update_many(
+            {"_id": {"$in": [document["_id"] for document in documents]}},
+            {"$set": {"flag": True}},
+        )
+        return result.modified_count
+
+
+async def test_migration_runs_in_batches_and_is_idempotent():
+    db = database.db
+    await db.test_migration_documents.delete_many({})
+    await db.schema_migrations.delete_one({"_id": _FlagMigration.version})
+    await db.test_migration_documents.insert_many([{"index": index} for index in range(5)])
+
+    dry_run = await run_migrations(db, [_FlagMigration()], dry_run=True)
+    assert dry_run == [{"version": 9001, "name": "test_flag_documents", "status": "pending", "pending": 5}]
+
+    reports = await run_migrations(db, [_FlagMigration()])
+    assert reports[0]["processed"] == 5
+    assert reports[0]["modified"] == 5
+    assert await db.test_migration_documents.count_documents({"flag": True}) == 5
+
+    # Completed migrations are skipped on the next run
+    assert await run_migrations(db, [_FlagMigration()]) == []
+
+    await db.test_migration_documents.drop()
+    await db.schema_migrations.delete_one({"_id": _FlagMigration.version})
+
+
+async def test_migrations_wait_for_the_lock_held_by_another_instance():
+    db = database.db
+    await db.schema_migrations.delete_one({"_id": _FlagMigration.version})
+    await db.migrations_lock.replace_one(
+        {"_id": "migrations"},
+        {"owner": "other-instance", "expires_at": datetime.utcnow() + timedelta(minutes=5)},
+        upsert=True,
+    )
+    try:
+        with pytest.raises(MigrationLockTimeoutError):
+            await run_migrations(db, [_FlagMigration()], lock_timeout=0)
+        assert await db.schema_migrations.find_one({"_id": _FlagMigration.version}) is None
+
+        # A lock left behind by a crashed instance expires and is taken over.
+        await db.migrations_lock.update_one({"_id": "migrations"}, {"$set": {"expires_at": datetime.utcnow()}})
+        assert [report["version"] for report in await run_migrations(db, [_FlagMigration()], lock_timeout=0)] == [9001]
+        assert await db.migrations_lock.find_one({"_id": "migrations"}) is None
+    finally:
+        await db.migrations_lock.delete_many({})
+        await db.test_migration_documents.drop()
+        await db.schema_migrations.delete_one({"_id": _FlagMigration.version})
@@ -0,0 +1,68 @@
+import pytest
+from httpx import AsyncClient
+
+from app.api import dependencies
+from app.models.llm_model import LLMProviderConfig, LLMWorkflowSettings
+from app.models.recruiter_workflow import RecruiterWorkflowRequest
+from app.services import recruiter_workflow_service
+
+pytestmark = pytest.mark.anyio
+
+PAYLOAD = {"job_description": "Backend engineer", "resumes": []}
+
+
+@pytest.fixture
+def captured(monkeypatch):
+    calls = []
+
+    async def fake_generate_workflow(payload, **kwargs):
+        calls.append(kwargs)
+        raise ValueError("stop here")
+
+    monkeypatch.setattr(recruiter_workflow_service, "generate_workflow", fake_generate_workflow)
+    return calls
+
+
+async def test_anonymous_caller_cannot_choose_an_org(async_client: AsyncClient, captured) -> None:
+    response = await async_client.post("/recruiter-workflow/generate?org_id=acme", json=PAYLOAD)
+
+    assert response.status_code == 400
+    assert captured[0]["org_id"] is None
+    assert captured[0]["authenticated"] is False
+
+
+async def test_org_comes_from_the_token(async_client: AsyncClient, captured, monkeypatch) -> None:
+    monkeypatch.setattr(dependencies, "verify_jwt", lambda token: {"sub": "user-1", "org_id": "acme"})
+
+    response = await async_client.post(
+        "/recruiter-workflow/generate?org_id=other", json=PAYLOAD, headers={"Authorization": "Bearer token"}
+    )
+
+    assert response.status_code == 400
+    assert captured[0]["org_id"] == "acme"
+    assert captured[0]["authenticated"] is True
+
+
+async def test_invalid_token_is_rejected(async_client: AsyncClient, captured) -> None:
+    response = await async_client.post(
+        "/recruiter-workflow/generate", json=PAYLOAD, headers={"Authorization": "Bearer not-a-jwt"}
+    )
+
+    assert response.status_code == 401
+    assert captured == []
+
+
+async def test_anonymous_overrides_cannot_cache_or_change_the_endpoint() -> None:
+    override = LLMProviderConfig(
+        provider="openai", model="gpt-4o-mini", base_url="https://attacker.test/v1", cache_enabled=True
+    )
+    payload = RecruiterWorkflowRequest(**PAYLOAD, step_overrides={"core_skills": override})
+    settings = LLMWorkflowSettings(default=LLMProviderConfig(provider="openai", model="gpt-4o"))
+
+    anonymous = recruiter_workflow_service._resolve_step_configs(payload, settings)
+    assert anonymous["core_skills"].model == "gpt-4o-mini"
+    assert anonymous["core_skills"].base_url is None
+    assert anonymous["core_skills"].cache_enabled is False
+
+    trusted = recruiter_workflow_service._resolve_step_configs(payload, settings, authenticated=True)
+    assert trusted["core_skills"] == override
@@ -0,0 +1,44 @@
+import json
+from pathlib import Path
+
+from app.services.skills import SkillMatcher, extract_skills, merge_skills, parse_taxonomy
+
+FIXTURES = Path(__file__).parent / "fixtures" / "skill_extraction.json"
+
+
+def test_matcher_respects_word_boundaries_and_synonyms():
+    matcher = SkillMatcher([("java", "Java"), ("javascript", "JavaScript"), ("js", "JavaScript"), ("node.js", "Node.js")])
+    assert matcher.find("JavaScript and Node.js") == ["JavaScript", "Node.js"]
+    assert matcher.find("Java, then more java.") == ["Java"]
+    assert matcher.find("JS") == ["JavaScript"]
+
+
+def test_matcher_reports_overlapping_phrases():
+    matcher = SkillMatcher([("machine learning", "Machine Learning"), ("learning", "Learning"), ("deep learning", "Deep Learning")])
+    assert matcher.find("deep\nlearning; machine-learning") == ["Deep Learning", "Learning", "Machine Learning"]
+
+
+def test_taxonomy_names_can_be_alias_only():
+    taxonomy = parse_taxonomy({"version": 3, "skills": [{"name": "Go", "aliases": ["golang"], "match_name": False}]})
+    matcher = SkillMatcher(taxonomy.terms())
+    assert matcher.find("Let's go with Golang") == ["Go"]
+
+
+def test_merge_skills_dedupes_case_insensitively():
+    assert merge_skills([" Python ", "FastAPI"], ["python", "AWS", ""], None) == ["Python", "FastAPI", "AWS"]
+
+
+def test_bundled_taxonomy_precision_and_recall():
+    cases = json.loads(FIXTURES.read_text())
+    true_positives = false_positives = false_negatives = 0
+    for case in cases:
+        found = set(extract_skills(case["text"]))
+        expected = set(case["expected"])
+        true_positives += len(found & expected)
+        false_positives += len(found - expected)
+        false_negatives += len(expected - found)
+
+    precision = true_positives / (true_positives + false_positives)
+    recall = true_positives / (true_positives + false_negatives)
+    assert precision >= 0.95, precision
+    assert recall >= 0.95, recall
@@ -0,0 +1,354 @@
+"""Extraction benchmark: generate a local document corpus and measure extractors against it.
+
+    python -m scripts.benchmark_extraction generate              # writes .benchmarks/extraction_corpus
+    python -m scripts.benchmark_extraction run --configs inline,1,2,4
+
+``run`` reports docs/sec, p50/p99 latency and peak RSS per corpus category and pool configuration.
+"""
+
+import argparse
+import asyncio
+import io
+import json
+import random
+import statistics
+import struct
+import time
+import zlib
+from collections import defaultdict
+from pathlib import Path
+
+import docx
+from docx.shared import Inches
+
+from app.services.documents import DocumentExtractionError, extract_document
+from app.services.extraction_pool import ExtractionPool, ExtractionTimeoutError
+
+DEFAULT_CORPUS = Path(".benchmarks/extraction_corpus")
+PDF = "application/pdf"
+DOCX = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+
+_WORDS = (
+    "python kafka postgresql aws docker kubernetes react typescript led delivered migrated designed platform "
+    "latency reliability customers revenue stakeholders roadmap mentoring hiring payments ledger analytics "
+    "pipeline airflow snowflake terraform incident reduced improved owned built scaled the and with for across"
+).split()
+
+
+# --- corpus generation -------------------------------------------------------------------------
+
+
+def _lines(rng, count, words_per_line=12):
+    return [" ".join(rng.choice(_WORDS) for _ in range(words_per_line)) for _ in range(count)]
+
+
+def _pdf_escape(text):
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def _pdf(rng, pages, lines_per_page, images_per_page=0, image_side=0):
+    """Build a PDF by hand: Helvetica text pages, optionally with incompressible RGB images."""
+    objects = []
+
+    def add(body):
+        objects.append(body)
+        return len(objects)
+
+    font = add(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+    pages_id = add(b"")
+    kids = []
+    for _ in range(pages):
+        operations = ["BT /F1 10 Tf 50 770 Td 12 TL"]
+        operations += [f"({_pdf_escape(line)}) Tj T*" for line in _lines(rng, lines_per_page)]
+        operations.append("ET")
+        xobjects = []
+        for index in range(images_per_page):
+            pixels = zlib.compress(rng.randbytes(image_side * image_side * 3), 1)
+            header = (
+                f"<< /Type /XObject /Subtype /Image /Width {image_side} /Height {image_side} /ColorSpace /DeviceRGB "
+                f"/BitsPerComponent 8 /Filter /FlateDecode /Length {len(pixels)} >>\nstream\n"
+            ).encode()
+            xobjects.append((f"Im{index}", add(header + pixels + b"\nendstream")))
+            operations.append(f"q 200 0 0 200 {60 + index * 20} {60 + index * 20} cm /Im{index} Do Q")
+        content = "\n".join(operations).encode("latin-1")
+        contents = add(b"<< /Length %d >>\nstream\n" % len(content) + content + b"\nendstream")
+        xobject_dict = " ".join(f"/{name} {ref} 0 R" for name, ref in xobjects)
+        resources = f"<< /Font << /F1 {font} 0 R >> /XObject << {xobject_dict} >> >>"
+        kids.append(
+            add(
+                f"<< /Type /Page /Parent {pages_id} 0 R /MediaBox [0 0 612 792] "
+                f"/Resources {resources} /Contents {contents} 0 R >>".encode()
+            )
+        )
+    objects[pages_id - 1] = (
+        f"<< /Type /Pages /Kids [{' '.join(f'{kid} 0 R' for kid in kids)}] /Count {len(kids)} >>".encode()
+    )
+    catalog = add(f"<< /Type /Catalog /Pages {pages_id} 0 R >>".encode())
+
+    output = io.BytesIO()
+    output.write(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(output.tell())
+        output.write(b"%d 0 obj\n" % number + body + b"\nendobj\n")
+    xref = output.tell()
+    output.write(b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1))
+    output.writelines(b"%010d 00000 n \n" % offset for offset in offsets)
+    output.write(b"trailer\n<< /Size %d /Root %d 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, catalog, xref))
+    return output.getvalue()
+
+
+def _png(rng, side):
+    def chunk(tag, data):
+        return struct.pack(">I", len(data)) + tag + data + struct.pack(">I", zlib.crc32(tag + data) & 0xFFFFFFFF)
+
+    rows = b"".join(b"\x00" + rng.randbytes(side * 3) for _ in range(side))
+    return (
+        b"\x89PNG\r\n\x1a\n"
+        + chunk(b"IHDR", struct.pack(">IIBBBBB", side, side, 8, 2, 0, 0, 0))
+        + chunk(b"IDAT", zlib.compress(rows, 1))
+        + chunk(b"IEND", b"")
+    )
+
+
+def _docx(rng, paragraphs, images=0, image_side=0):
+    document = docx.Document()
+    document.add_heading("Experience", level=1)
+    for line in _lines(rng, paragraphs):
+        document.add_paragraph(line)
+    for _ in range(images):
+        document.add_picture(io.BytesIO(_png(rng, image_side)), width=Inches(2))
+    buffer = io.BytesIO()
+    document.save(buffer)
+    return buffer.getvalue()
+
+
+def _malformed_pdfs(rng):
+    valid = _pdf(rng, 3, 40)
+    yield valid[: len(valid) // 2]  # truncated mid-object
+    yield b"%PDF-1.4\n" + rng.randbytes(50_000)  # header followed by noise
+    yield valid.replace(b"xref", b"xrfe").replace(b"startxref", b"startxrfe")  # broken cross-reference table
+    yield b""  # empty upload
+
+
+def _malformed_docx(rng):
+    valid = _docx(rng, 50)
+    yield valid[: len(valid) // 2]  # truncated zip
+    yield b"PK\x03\x04" + rng.randbytes(20_000)  # zip signature followed by noise
+
+
+# category -> (extension, content type, count, builder)
+CATEGORIES = {
+    "small_pdf": ("pdf", PDF, 40, lambda rng: _pdf(rng, 2, 45)),
+    "many_page_pdf": ("pdf", PDF, 3, lambda rng: _pdf(rng, 400, 5)),
+    "huge_pdf": ("pdf", PDF, 3, lambda rng: _pdf(rng, 120, 60)),
+    "image_pdf": ("pdf", PDF, 3, lambda rng: _pdf(rng, 4, 20, images_per_page=2, image_side=600)),
+    "small_docx": ("docx", DOCX, 40, lambda rng: _docx(rng, 60)),
+    "huge_docx": ("docx", DOCX, 3, lambda rng: _docx(rng, 20_000)),
+    "image_docx": ("docx", DOCX, 3, lambda rng: _docx(rng, 40, images=6, image_side=600)),
+}
+MALFORMED = {"malformed_pdf": ("pdf", PDF, _malformed_pdfs), "malformed_docx": ("docx", DOCX, _malformed_docx)}
+
+
+def generate(corpus, scale, seed):
+    rng = random.Random(seed)
+    corpus.mkdir(parents=True, exist_ok=True)
+    manifest = []
+
+    def write(category, index, extension, content_type, data):
+        path = corpus / f"{category}-{index:03d}.{extension}"
+        path.write_bytes(data)
+        manifest.append({"path": path.name, "category": category, "content_type": content_type, "bytes": len(data)})
+
+    for category, (extension, content_type, count, build) in CATEGORIES.items():
+        for index in range(max(1, round(count * scale))):
+            write(category, index, extension, content_type, build(rng))
+    for category, (extension, content_type, build_all) in MALFORMED.items():
+        for index, data in enumerate(build_all(rng)):
+            write(category, index, extension, content_type, data)
+
+    (corpus / "manifest.json").write_text(json.dumps(manifest, indent=2))
+    total_mb = sum(entry["bytes"] for entry in manifest) / 1e6
+    print(f"Wrote {len(manifest)} documents ({total_mb:.1f} MB) to {corpus}")
+
+
+# --- harness -------------------------------------------------------------------------------------
+
+
+def _peak_rss_mb(pid="self"):
+    """Peak resident set size (VmHWM) of a process in MB, or None where /proc is unavailable."""
+    try:
+        with open(f"/proc/{pid}/status") as handle:
+            for line in handle:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        return None
+    return None
+
+
+def _reset_peak_rss():
+    try:
+        with open("/proc/self/clear_refs", "w") as handle:
+            handle.write("5")
+    except OSError:
+        pass
+
+
+def _percentile(values, percentile):
+    if not values:
+        return 0.0
+    if len(values) == 1:
+        return values[0]
+    return statistics.quantiles(values, n=100, method="inclusive")[percentile - 1]
+
+
+def _extract_one(entry, corpus, max_pages, max_chars):
+    return extract_document(str(corpus / entry["path"]), entry["content_type"], entry["path"], max_pages, max_chars)
+
+
+async def _run_pool(entries, corpus, workers, args):
+    pool = ExtractionPool(
+        max_workers=workers,
+        max_queue=len(entries),
+        timeout=args.timeout,
+        memory_limit_mb=args.memory_limit_mb,
+    )
+    # Keep at most one job per worker in flight so latency measures service time, not queueing.
+    slots = asyncio.Semaphore(workers)
+
+    async def measure(entry):
+        async with slots:
+            started = time.perf_counter()
+            try:
+                await pool.run(
+                    extract_document,
+                    str(corpus / entry["path"]),
+                    entry["content_type"],
+                    entry["path"],
+                    args.max_pages,
+                    args.max_chars,
+                )
+                status = "ok"
+            except (DocumentExtractionError, ExtractionTimeoutError) as exc:
+                status = type(exc).__name__
+            return entry, status, (time.perf_counter() - started) * 1000
+
+    try:
+        # Warm up: spawn every worker before timing.
+        warm = [entry for entry in entries if entry["category"] == "small_pdf"][:1] * workers
+        await asyncio.gather(*(measure(entry) for entry in warm))
+        started = time.perf_counter()
+        results = await asyncio.gather(*(measure(entry) for entry in entries))
+        elapsed = time.perf_counter() - started
+        worker_peaks = [_peak_rss_mb(pid) for pid in pool.worker_pids()]
+    finally:
+        pool.shutdown()
+    return results, elapsed, max((peak for peak in worker_peaks if peak is not None), default=None)
+
+
+def _run_inline(entries, corpus, args):
+    results = []
+    started = time.perf_counter()
+    for entry in entries:
+        call_started = time.perf_counter()
+        try:
+            _extract_one(entry, corpus, args.max_pages, args.max_chars)
+            status = "ok"
+        except DocumentExtractionError as exc:
+            status = type(exc).__name__
+        results.append((entry, status, (time.perf_counter() - call_started) * 1000))
+    return results, time.perf_counter() - started, None
+
+
+def _report(config, results, elapsed, parent_peak, worker_peak):
+    rss = f"peak RSS parent {parent_peak:.0f} MB" if parent_peak is not None else "peak RSS n/a"
+    if worker_peak is not None:
+        rss += f", worker {worker_peak:.0f} MB"
+    print(f"\n[{config}] {len(results)} docs in {elapsed:.2f}s = {len(results) / elapsed:.1f} docs/sec; {rss}")
+    print(f"  {'category':<16}{'docs':>6}{'errors':>8}{'docs/s':>9}{'p50 ms':>10}{'p99 ms':>10}")
+    by_category = defaultdict(list)
+    for entry, status, latency in results:
+        by_category[entry["category"]].append((status, latency))
+    rows = []
+    for category, items in sorted(by_category.items()):
+        latencies = [latency for _, latency in items]
+        errors = sum(1 for status, _ in items if status != "ok")
+        row = {
+            "config": config,
+            "category": category,
+            "docs": len(items),
+            "errors": errors,
+            "docs_per_sec": round(len(items) / (sum(latencies) / 1000), 2) if sum(latencies) else 0.0,
+            "p50_ms": round(_percentile(latencies, 50), 2),
+            "p99_ms": round(_percentile(latencies, 99), 2),
+        }
+        rows.append(row)
+        print(
+            f"  {category:<16}{row['docs']:>6}{errors:>8}{row['docs_per_sec']:>9.1f}"
+            f"{row['p50_ms']:>10.1f}{row['p99_ms']:>10.1f}"
+        )
+    return {
+        "config": config,
+        "docs": len(results),
+        "elapsed_s": round(elapsed, 3),
+        "docs_per_sec": round(len(results) / elapsed, 2),
+        "peak_rss_mb": parent_peak,
+        "worker_peak_rss_mb": worker_peak,
+        "categories": rows,
+    }
+
+
+def run(args):
+    corpus = args.corpus
+    manifest_path = corpus / "manifest.json"
+    if not manifest_path.exists():
+        raise SystemExit(f"No corpus at {corpus}; run `python -m scripts.benchmark_extraction generate` first")
+    entries = json.loads(manifest_path.read_text())
+    if args.category:
+        entries = [entry for entry in entries if entry["category"] in args.category]
+
+    reports = []
+    for config in args.configs.split(","):
+        for _ in range(args.repeat):
+            _reset_peak_rss()
+            if config == "inline":
+                results, elapsed, worker_peak = _run_inline(entries, corpus, args)
+            else:
+                results, elapsed, worker_peak = asyncio.run(_run_pool(entries, corpus, int(config), args))
+            reports.append(_report(config, results, elapsed, _peak_rss_mb(), worker_peak))
+
+    if args.json:
+        Path(args.json).write_text(json.dumps(reports, indent=2))
+        print(f"\nWrote {args.json}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark document extraction.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    generate_parser = subparsers.add_parser("generate", help="Build the benchmark corpus")
+    generate_parser.add_argument("--corpus", type=Path, default=DEFAULT_CORPUS)
+    generate_parser.add_argument("--scale", type=float, default=1.0, help="Multiply the per-category document counts")
+    generate_parser.add_argument("--seed", type=int, default=7)
+
+    run_parser = subparsers.add_parser("run", help="Measure extraction over the corpus")
+    run_parser.add_argument("--corpus", type=Path, default=DEFAULT_CORPUS)
+    run_parser.add_argument("--configs", default="inline,1,2,4", help="Comma-separated: 'inline' or pool worker counts")
+    run_parser.add_argument("--category", action="append", help="Only run these categories (repeatable)")
+    run_parser.add_argument("--repeat", type=int, default=1)
+    run_parser.add_argument("--max-pages", type=int, default=50)
+    run_parser.add_argument("--max-chars", type=int, default=200_000)
+    run_parser.add_argument("--timeout", type=float, default=30.0)
+    run_parser.add_argument("--memory-limit-mb", type=int, default=256)
+    run_parser.add_argument("--json", help="Also write the results to this JSON file")
+
+    args = parser.parse_args()
+    if args.command == "generate":
+        generate(args.corpus, args.scale, args.seed)
+    else:
+        run(args)
+
+
+if __name__ == "__main__":
+    main()
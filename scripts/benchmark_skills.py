@@ -0,0 +1,75 @@
+import argparse
+import json
+import random
+import time
+from pathlib import Path
+
+from app.services.skills import SkillMatcher, default_matcher, load_taxonomy
+
+FIXTURES = Path(__file__).resolve().parent.parent / "app" / "tests" / "fixtures" / "skill_extraction.json"
+
+_FILLER = (
+    "led delivered team customers improved reduced latency platform designed owned roadmap built migrated "
+    "stakeholders quarterly revenue production services reliability mentoring hiring growth analysis the and "
+    "with for across into from over using our their weekly launch incident reporting"
+).split()
+
+
+def _synthetic_documents(count, words, seed):
+    """Resume-sized documents: filler prose with taxonomy phrases sprinkled in (~3% of words)."""
+    rng = random.Random(seed)
+    phrases = [phrase for phrase, _ in load_taxonomy().terms()]
+    documents = []
+    for _ in range(count):
+        tokens = [rng.choice(phrases) if rng.random() < 0.03 else rng.choice(_FILLER) for _ in range(words)]
+        documents.append(" ".join(tokens))
+    return documents
+
+
+def _evaluate(matcher):
+    cases = json.loads(FIXTURES.read_text())
+    true_positives = false_positives = false_negatives = 0
+    for case in cases:
+        found = set(matcher.find(case["text"]))
+        expected = set(case["expected"])
+        true_positives += len(found & expected)
+        false_positives += len(found - expected)
+        false_negatives += len(expected - found)
+        for skill in sorted(found - expected):
+            print(f"  false positive in {case['id']}: {skill}")
+        for skill in sorted(expected - found):
+            print(f"  missed in {case['id']}: {skill}")
+    precision = true_positives / max(true_positives + false_positives, 1)
+    recall = true_positives / max(true_positives + false_negatives, 1)
+    print(f"Fixtures: {len(cases)} documents, precision {precision:.3f}, recall {recall:.3f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the taxonomy skill extractor.")
+    parser.add_argument("--documents", type=int, default=2000, help="Synthetic documents to scan")
+    parser.add_argument("--words", type=int, default=800, help="Words per synthetic document")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    SkillMatcher(load_taxonomy().terms())
+    build_ms = (time.perf_counter() - started) * 1000
+    matcher = default_matcher()
+    print(f"Taxonomy v{load_taxonomy().version}: {len(load_taxonomy().skills)} skills, {matcher.state_count} states, built in {build_ms:.1f}ms")
+
+    documents = _synthetic_documents(args.documents, args.words, args.seed)
+    characters = sum(len(document) for document in documents)
+    started = time.perf_counter()
+    matched = sum(len(matcher.find(document)) for document in documents)
+    elapsed = time.perf_counter() - started
+    print(
+        f"Scanned {len(documents)} documents ({characters / len(documents):.0f} chars avg) in {elapsed:.2f}s: "
+        f"{len(documents) / elapsed:.0f} docs/sec, {characters / elapsed / 1e6:.1f}M chars/sec, "
+        f"{matched / len(documents):.1f} skills/doc"
+    )
+
+    _evaluate(matcher)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,2 +1,234 @@
-def parse_resumes():
-    print("Parsing resumes...")
\ No newline at end of file
+"""Re-run extraction, skill detection and preview generation over stored resumes and job descriptions.
+
+    python -m scripts.parse_resume --dry-run                 # report what would change
+    python -m scripts.parse_resume --kind resumes --workers 4
+
+Run it after improving an extractor or the skill taxonomy. Documents are processed in ``_id`` order
+and the last processed ``_id`` is checkpointed after every batch, so an interrupted run continues
+where it stopped; a completed run starts over on the next invocation (or pass ``--restart``).
+"""
+
+import argparse
+import asyncio
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from pymongo import UpdateOne
+
+from app.core import database
+from app.core.config import settings
+from app.core.utils import configure_logging
+from app.services import file_storage_service
+from app.services.documents import DocumentExtractionError, extract_document, summarise_resume
+from app.services.documents import cache as extraction_cache
+from app.services.extraction_pool import ExtractionPool, ExtractionTimeoutError
+from app.services.skills import extract_skills, merge_skills
+
+_CHECKPOINTS = "reextraction_checkpoints"
+
+
+@dataclass(frozen=True)
+class Target:
+    name: str
+    collection: str
+    query: Dict[str, Any]
+    file_field: str
+    text_field: str
+    stats_field: str
+    skills_field: str
+    with_preview: bool
+
+
+TARGETS = {
+    "resumes": Target(
+        name="resumes",
+        collection="resumes",
+        query={"$or": [{"file": {"$type": "object"}}, {"content": {"$type": "string"}}]},
+        file_field="file",
+        text_field="content",
+        stats_field="extraction",
+        skills_field="metadata.skills",
+        with_preview=True,
+    ),
+    "jobs": Target(
+        name="jobs",
+        collection="jobs",
+        query={"$or": [{"jd_file": {"$type": "object"}}, {"jd_content": {"$type": "string"}}]},
+        file_field="jd_file",
+        text_field="jd_content",
+        stats_field="jd_extraction",
+        skills_field="skills",
+        with_preview=False,
+    ),
+}
+
+
+def _get_path(document: Dict[str, Any], dotted: str) -> Any:
+    value: Any = document
+    for key in dotted.split("."):
+        value = (value or {}).get(key)
+    return value
+
+
+async def _reextract(target: Target, document: Dict[str, Any], pool: ExtractionPool, dry_run: bool) -> Dict[str, Any]:
+    """Return the fields of ``document`` that changed after re-processing it."""
+    file_ref = document.get(target.file_field)
+    text = document.get(target.text_field) or ""
+    updates: Dict[str, Any] = {}
+
+    if file_ref:
+        filename = file_ref.get("filename") or ""
+        spooled = await file_storage_service.download_to_disk(file_ref["file_id"])
+        try:
+            result = await pool.run(
+                extract_document,
+                spooled.path,
+                file_ref.get("content_type") or "application/octet-stream",
+                filename,
+                settings.EXTRACTION_MAX_PAGES,
+                settings.EXTRACTION_MAX_CHARS,
+            )
+        finally:
+            spooled.discard()
+        if not dry_run:
+            await extraction_cache.put(spooled.sha256, result)
+        text = result.text
+        detected = result.skills
+        updates[target.text_field] = text
+        updates[target.stats_field] = result.stats()
+    else:
+        # Legacy documents without a stored file: refresh the derived fields from the stored text.
+        detected = extract_skills(text)
+
+    updates[target.skills_field] = merge_skills(_get_path(document, target.skills_field), detected)
+    if target.with_preview:
+        digest = summarise_resume(
+            text,
+            preview_chars=settings.RESUME_PREVIEW_MAX_CHARS,
+            section_chars=settings.RESUME_SECTION_MAX_CHARS,
+        )
+        updates["preview"] = digest["preview"]
+        updates["sections"] = digest["sections"]
+
+    changes = {
+        field: value
+        for field, value in updates.items()
+        if field != target.stats_field and _get_path(document, field) != value
+    }
+    # Stats carry timings that differ on every run, so they are only rewritten alongside new text.
+    if target.stats_field in updates and (target.text_field in changes or not document.get(target.stats_field)):
+        changes[target.stats_field] = updates[target.stats_field]
+    return changes
+
+
+async def _run_target(target: Target, pool: ExtractionPool, args: argparse.Namespace) -> Dict[str, int]:
+    db = database.db
+    collection = db[target.collection]
+    checkpoints = db[_CHECKPOINTS]
+
+    checkpoint = await checkpoints.find_one({"_id": target.name}) or {}
+    resuming = bool(checkpoint) and not args.restart and not checkpoint.get("completed")
+    counts = {key: checkpoint.get(key, 0) if resuming else 0 for key in ("processed", "changed", "failed")}
+    last_id = checkpoint.get("last_id") if resuming else None
+    if resuming and last_id is not None:
+        print(f"[{target.name}] resuming after {last_id} ({counts['processed']} already processed)")
+    elif not args.dry_run:
+        await checkpoints.replace_one(
+            {"_id": target.name},
+            {"started_at": datetime.utcnow(), "completed": False, **counts},
+            upsert=True,
+        )
+
+    slots = asyncio.Semaphore(max(args.workers * 2, 1))
+
+    async def process(document: Dict[str, Any]) -> Optional[UpdateOne]:
+        async with slots:
+            try:
+                changes = await _reextract(target, document, pool, args.dry_run)
+            except (DocumentExtractionError, ExtractionTimeoutError) as exc:
+                print(f"[{target.name}] {document['_id']}: {type(exc).__name__}: {exc}")
+                counts["failed"] += 1
+                return None
+            except Exception as exc:  # noqa: BLE001 - e.g. a missing GridFS file; keep the batch going
+                print(f"[{target.name}] {document['_id']}: unexpected {type(exc).__name__}: {exc}")
+                counts["failed"] += 1
+                return None
+        return UpdateOne({"_id": document["_id"]}, {"$set": changes}) if changes else None
+
+    started = time.perf_counter()
+    run_processed = 0
+    while args.limit is None or run_processed < args.limit:
+        query = dict(target.query)
+        if last_id is not None:
+            query["_id"] = {"$gt": last_id}
+        batch_size = args.batch_size if args.limit is None else min(args.batch_size, args.limit - run_processed)
+        documents: List[Dict[str, Any]] = await collection.find(query).sort("_id", 1).limit(batch_size).to_list(
+            length=batch_size
+        )
+        if not documents:
+            break
+
+        operations = [operation for operation in await asyncio.gather(*map(process, documents)) if operation]
+        if operations and not args.dry_run:
+            await collection.bulk_write(operations, ordered=False)
+        counts["processed"] += len(documents)
+        counts["changed"] += len(operations)
+        run_processed += len(documents)
+        last_id = documents[-1]["_id"]
+
+        if not args.dry_run:
+            await checkpoints.update_one(
+                {"_id": target.name},
+                {"$set": {"last_id": last_id, "updated_at": datetime.utcnow(), **counts}},
+            )
+        rate = run_processed / max(time.perf_counter() - started, 1e-6)
+        print(
+            f"[{target.name}] {counts['processed']} processed, {counts['changed']} "
+            f"{'would change' if args.dry_run else 'updated'}, {counts['failed']} failed ({rate:.1f} docs/sec)"
+        )
+
+    finished = args.limit is None or run_processed < args.limit
+    if finished and not args.dry_run:
+        await checkpoints.update_one(
+            {"_id": target.name},
+            {"$set": {"completed": True, "completed_at": datetime.utcnow(), **counts}},
+        )
+    return counts
+
+
+async def _main(args: argparse.Namespace) -> None:
+    pool = ExtractionPool(
+        max_workers=args.workers,
+        max_queue=args.workers * 2,
+        timeout=settings.EXTRACTION_TIMEOUT_SECONDS,
+        memory_limit_mb=settings.EXTRACTION_MEMORY_LIMIT_MB,
+    )
+    try:
+        kinds = list(TARGETS) if args.kind == "all" else [args.kind]
+        for kind in kinds:
+            counts = await _run_target(TARGETS[kind], pool, args)
+            verb = "would change" if args.dry_run else "updated"
+            print(f"[{kind}] done: {counts['processed']} processed, {counts['changed']} {verb}, {counts['failed']} failed")
+    finally:
+        pool.shutdown()
+        database.client.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Re-extract stored resumes and job descriptions.")
+    parser.add_argument("--kind", choices=["all", *TARGETS], default="all")
+    parser.add_argument("--workers", type=int, default=settings.EXTRACTION_POOL_WORKERS, help="Extraction processes")
+    parser.add_argument("--batch-size", type=int, default=100, help="Documents per bulk_write and checkpoint")
+    parser.add_argument("--limit", type=int, default=None, help="Stop after this many documents per kind")
+    parser.add_argument("--restart", action="store_true", help="Ignore an unfinished checkpoint and start over")
+    parser.add_argument("--dry-run", action="store_true", help="Report changes without writing anything")
+    args = parser.parse_args()
+
+    configure_logging()
+    asyncio.run(_main(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+import argparse
+import asyncio
+import os
+
+from motor.motor_asyncio import AsyncIOMotorClient
+
+from app.core.utils import configure_logging
+from app.migrations import MIGRATIONS, run_migrations
+
+
+async def _main(target_version, dry_run):
+    mongo_uri = os.getenv("MONGO_URI", "mongodb://localhost:27017/jobhunter-app")
+    mongo_db = os.getenv("MONGO_DB_NAME", "jobhunter-app")
+    client = AsyncIOMotorClient(mongo_uri)
+    try:
+        reports = await run_migrations(
+            client.get_database(mongo_db),
+            MIGRATIONS,
+            target_version=target_version,
+            dry_run=dry_run,
+        )
+    finally:
+        client.close()
+
+    if not reports:
+        print("No pending migrations.")
+    for report in reports:
+        print(report)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Apply pending data migrations.")
+    parser.add_argument("--target", type=int, default=None, help="Stop after this migration version")
+    parser.add_argument("--dry-run", action="store_true", help="Report pending work without writing")
+    args = parser.parse_args()
+
+    configure_logging()
+    asyncio.run(_main(args.target, args.dry_run))
+
+
+if __name__ == "__main__":
+    main()
@@ -284,6 +284,7 @@ def seed_resumes(db) -> Dict[str, ObjectId]:
         payload.update(
             {
                 "candidate_id": CANDIDATE_ID,
+                "is_active": True,
                 "updated_at": datetime.utcnow(),
             }
         )
@@ -360,6 +361,7 @@ def seed_additional_candidates(db, target_candidates: int = TOTAL_CANDIDATES, ta
             "type": template["resume_type"],
             "summary": summary,
             "skills": template["skills"],
+            "is_active": True,
             "preview": (
                 f"{name}\n{template['primary_role']}\n\n"
                 "Professional Summary:\n"
@@ -428,6 +430,7 @@ def seed_additional_candidates(db, target_candidates: int = TOTAL_CANDIDATES, ta
                         "type": template["resume_type"],
                         "summary": template["summary"],
                         "skills": template["skills"],
+                        "is_active": True,
                         "preview": (
                             f"{name}\n{template['primary_role']}\n\n"
                             "Professional Summary:\n"